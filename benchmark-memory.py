@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+#
+# Measures the peak memory used to render and write the global report page
+# of a synthetic log, as a single string and in chunks.
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from ocsgwh import Engine, Options
+from ocsgwh.git.model import GitAuthor, GitCommit, GitDiffBuilder, GitLog
+
+
+def create_log(commits: int, authors: int, files: int, days: int) -> GitLog:
+    rnd = random.Random(0)
+    identities = [GitAuthor(f'author{i}@email.com', f'Author {i}') for i in range(authors)]
+    start = datetime(2018, 1, 1, tzinfo=timezone.utc)
+    ret = []
+    for i in range(commits):
+        b = GitDiffBuilder()
+        for f in rnd.sample(range(files), 3):
+            b.add_entry(f'src/module{f % 50}/file{f}.c', rnd.randint(0, 100), rnd.randint(0, 50), False)
+        ret.append(GitCommit(f'{i:040x}', [f'{i - 1:040x}'] if i else [],
+                             start + timedelta(seconds=rnd.randint(0, days * 86400)),
+                             rnd.choice(identities), b.build()))
+    return GitLog(ret)
+
+
+def measure(engine: Engine, vars: dict, stream: bool) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    for name, content in engine.render_outputs('global_diff.html', 'global_diff.html', vars, stream):
+        engine.write_output(name, content)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+parser = argparse.ArgumentParser(
+    description='Measures the peak memory used to render the global report page.')
+parser.add_argument('--commits', type=int, default=20000)
+parser.add_argument('--authors', type=int, default=50)
+parser.add_argument('--files', type=int, default=5000)
+parser.add_argument('--days', type=int, default=3 * 365)
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    log = create_log(args.commits, args.authors, args.files, args.days)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = Engine(Options(Path('.'), Path(tmp), 'benchmark'))
+        engine.init_basic_template_vars()
+        vars = engine.global_diff_vars(log)
+        # Evaluates the lazy sections, so only the rendering is measured.
+        engine.render_outputs('global_diff.html', 'global_diff.html', vars)
+        for label, stream in (('string', False), ('streaming', True)):
+            peak, elapsed = measure(engine, vars, stream)
+            size = (Path(tmp) / 'global_diff.html').stat().st_size
+            print(f'{label:10} page: {size / 2**20:8.1f} MiB  peak: {peak / 2**20:8.1f} MiB  time: {elapsed:6.2f} s')
@@ -19,7 +19,10 @@ import argparse
 from ocsgwh.versioninfo import VERSION
 import sys
 from pathlib import Path
-from ocsgwh import Engine, Options, EngineError
+from ocsgwh import Engine, Options, EngineError, WatchEngine, ReportServer, AsyncEngine
+from ocsgwh.collaboration import COLLABORATION_WINDOW
+from ocsgwh.git.blame import BLAME_WORKERS
+from ocsgwh.report import REPORT_SECTIONS
 PROGRAM_DESC = \
     '%(prog)s - A Git work history report generator\n' + \
     f'Version: {VERSION}\n' \
@@ -42,11 +45,91 @@ parser.add_argument('output_dir', metavar='<output directory>', type=Path,
 parser.add_argument('-t', metavar='<report title>', type=str,
                     dest='title', default=None,
                     help='Output directory.')
+parser.add_argument('--store', metavar='<database file>', type=Path,
+                    dest='store_file', default=None,
+                    help='SQLite database used to store the parsed commits.')
+parser.add_argument('--save-snapshot', metavar='<snapshot file>', type=Path,
+                    dest='save_snapshot_file', default=None,
+                    help='Saves the parsed log into a snapshot file.')
+parser.add_argument('--load-snapshot', metavar='<snapshot file>', type=Path,
+                    dest='load_snapshot_file', default=None,
+                    help='Loads the log from a snapshot file instead of running git.')
+parser.add_argument('-i', '--incremental', action='store_true',
+                    dest='incremental', default=False,
+                    help='Regenerates only the output files whose inputs have changed.')
+parser.add_argument('--watch', metavar='<seconds>', type=float,
+                    dest='watch', default=None,
+                    help='Keeps running and updates the report when the repository changes.')
+parser.add_argument('--serve', metavar='<port>', type=int,
+                    dest='serve', default=None,
+                    help='Serves the report over HTTP instead of writing it into the output directory.')
+parser.add_argument('--async', action='store_true',
+                    dest='use_async', default=False,
+                    help='Overlaps the execution of git, the rendering and the file writes.')
+parser.add_argument('-j', '--jobs', metavar='<jobs>', type=int,
+                    dest='jobs', default=1,
+                    help='Number of processes used to parse the log (0 uses all CPUs).')
+parser.add_argument('--since', metavar='<date>', type=str,
+                    dest='since', default=None,
+                    help='Includes only the commits more recent than the given date.')
+parser.add_argument('--until', metavar='<date>', type=str,
+                    dest='until', default=None,
+                    help='Includes only the commits older than the given date.')
+parser.add_argument('-r', '--ref', metavar='<revision>', type=str,
+                    dest='refs', action='append', default=None,
+                    help='Includes only the commits reachable from the given revision. It may be used multiple times (default: all references).')
+parser.add_argument('-p', '--path', metavar='<pathspec>', type=str,
+                    dest='paths', action='append', default=None,
+                    help='Includes only the changes to the given paths. It may be used multiple times.')
+parser.add_argument('--include', metavar='<rule>', type=str,
+                    dest='include', action='append', default=None,
+                    help='Includes only the files that match the given glob pattern or directory. It may be used multiple times.')
+parser.add_argument('--exclude', metavar='<rule>', type=str,
+                    dest='exclude', action='append', default=None,
+                    help='Excludes the files that match the given glob pattern or directory. It may be used multiple times.')
+parser.add_argument('--max-lines', metavar='<lines>', type=int,
+                    dest='max_lines', default=None,
+                    help='Excludes the file changes with more than the given number of changed lines.')
+parser.add_argument('-z', '--gzip', action='store_true',
+                    dest='gzip', default=False,
+                    help='Creates a compressed copy (.gz) of each text output file.')
+parser.add_argument('--collaboration-window', metavar='<days>', type=int,
+                    dest='collaboration_window', default=COLLABORATION_WINDOW,
+                    help=f'Size of the time windows used to detect collaboration (0 uses the whole log, default: {COLLABORATION_WINDOW}).')
+parser.add_argument('--dedup', action='store_true',
+                    dest='dedup', default=False,
+                    help='Counts the cherry-picked and rebased copies of a commit only once.')
+parser.add_argument('--blame', metavar='<workers>', type=int, nargs='?',
+                    dest='blame_workers', default=None, const=BLAME_WORKERS,
+                    help=f'Counts the lines of the current version written by each author using the given number of git blame processes (default: {BLAME_WORKERS}).')
+parser.add_argument('--disable', metavar='<section>', type=str,
+                    dest='disabled_sections', action='append', default=None,
+                    choices=REPORT_SECTIONS,
+                    help=f'Removes a section from the reports. It may be used multiple times. Sections: {", ".join(REPORT_SECTIONS)}.')
 
 if __name__ == '__main__':
     args = parser.parse_args()
-    options = Options(args.git_repo, args.output_dir, args.title)
-    engine = Engine(options)
+    options = Options(args.git_repo, args.output_dir, args.title,
+                      store_file=args.store_file,
+                      save_snapshot_file=args.save_snapshot_file,
+                      load_snapshot_file=args.load_snapshot_file,
+                      incremental=args.incremental,
+                      jobs=args.jobs if args.jobs > 0 else None,
+                      since=args.since, until=args.until,
+                      refs=args.refs, paths=args.paths,
+                      include=args.include, exclude=args.exclude,
+                      max_lines=args.max_lines, gzip=args.gzip,
+                      collaboration_window=args.collaboration_window,
+                      dedup=args.dedup, blame_workers=args.blame_workers,
+                      disabled_sections=args.disabled_sections)
+    if args.serve:
+        engine = ReportServer(options, args.serve)
+    elif args.watch:
+        engine = WatchEngine(options, args.watch)
+    elif args.use_async:
+        engine = AsyncEngine(options)
+    else:
+        engine = Engine(options)
     try:
         engine.run()
     except EngineError as err:
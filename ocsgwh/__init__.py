@@ -16,3 +16,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see < https: // www.gnu.org/licenses/>.
 from .engine import Engine, Options, EngineError
+from .watch import WatchEngine
+from .server import ReportServer
+from .async_engine import AsyncEngine
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .engine import Engine, Options, EngineError
+from .filetable import count_shards
+from .git.parser import GitLogParser, git_log_command
+from .git.model import GitLog
+
+from logging import getLogger
+LOGGER = getLogger(__name__)
+
+# Size of the buffer of the output of git log. Longer lines are read in
+# chunks of this size.
+MAX_LINE_SIZE = 1024 * 1024
+
+
+async def read_line(stream: asyncio.StreamReader) -> bytes:
+    """
+    Reads a line from the stream, including the line break. Unlike
+    ``readline()``, lines longer than the limit of the stream are read in
+    chunks instead of raising an error. Returns an empty string at the end
+    of the stream.
+    """
+    chunks = []
+    while True:
+        try:
+            chunks.append(await stream.readuntil(b'\n'))
+            break
+        except asyncio.IncompleteReadError as err:
+            # The last line has no line break.
+            chunks.append(err.partial)
+            break
+        except asyncio.LimitOverrunError as err:
+            chunks.append(await stream.read(err.consumed))
+    return b''.join(chunks)
+
+
+class AsyncEngine(Engine):
+    """
+    This engine overlaps the execution of git, the computation of the
+    reports and the output file writes.
+
+    The output of git log is parsed while it is being generated. The
+    variables of the pages are computed by a pool of threads and the output
+    files are written by a set of writer tasks fed by a bounded queue, thus
+    slow writes do not block the computation of the other pages. The pages
+    are rendered in chunks while they are written (see
+    ``Engine.render_page_chunks()``), thus the templates are rendered by
+    the writer threads and a page is never kept whole in memory.
+    """
+
+    def __init__(self, options: Options, workers: int = None, writers: int = 4,
+                 queue_size: int = 16) -> None:
+        super().__init__(options)
+        self.workers = workers
+        self.writers = writers
+        self.queue_size = queue_size
+
+    def run_core(self):
+        asyncio.run(self.run_async())
+
+    async def parse_git_log_async(self) -> GitLog:
+        """
+        Runs git log and parses its output as it is streamed.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *git_log_command(self.git_log_arguments()), cwd=self.options.repo_dir,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+            limit=MAX_LINE_SIZE)
+        parser = GitLogParser(self.create_commit_parser())
+        parser.reset()
+        while True:
+            line = await read_line(proc.stdout)
+            if not line:
+                break
+            parser.feed(line.decode('utf-8'))
+        parser.finish()
+        return_code = await proc.wait()
+        if return_code != 0:
+            raise EngineError(f'git exited with return code {return_code}.')
+        if not parser.result:
+            raise EngineError(
+                f'Unable to parse the output of git log command.')
+        return parser.build_git_log()
+
+    async def get_git_log_async(self) -> GitLog:
+        if self.options.load_snapshot_file:
+            return self.get_git_log()
+        log = self.deduplicate(await self.parse_git_log_async())
+        self.save_git_log(log)
+        return log
+
+    async def _writer(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            file_name, func, args = await queue.get()
+            try:
+                await loop.run_in_executor(self._io_executor, func, *args)
+            except Exception as err:
+                LOGGER.error(f'Unable to write "{file_name}": {err}')
+                self._errors.append(err)
+            finally:
+                queue.task_done()
+
+    async def _render(self, queue: asyncio.Queue, template_name: str, file_name: str, vars_func):
+        loop = asyncio.get_running_loop()
+        # Limits the number of pages waiting for the queue. The pages are
+        # rendered lazily, by the writers.
+        async with self._pending:
+            outputs = await loop.run_in_executor(
+                self._cpu_executor,
+                lambda: self.render_outputs(template_name, file_name, vars_func(), True))
+            for name, content in outputs:
+                await queue.put((name, self.write_output, (name, content)))
+            await queue.put((file_name, self.remove_file_shards, (file_name, count_shards(outputs))))
+
+    async def run_async(self):
+        log = await self.get_git_log_async()
+        try:
+            await self.generate_report_async(log)
+        finally:
+            log.close()
+
+    async def generate_report_async(self, log: GitLog):
+        self.init_basic_template_vars()
+        self.open_manifest()
+        self.open_compressor()
+        self._errors = []
+        queue = asyncio.Queue(self.queue_size)
+        self._pending = asyncio.Semaphore(self.queue_size)
+        with ThreadPoolExecutor(self.workers) as self._cpu_executor, \
+                ThreadPoolExecutor(self.writers) as self._io_executor:
+            writers = [asyncio.create_task(self._writer(queue))
+                       for i in range(self.writers)]
+            try:
+                await asyncio.gather(*[self._render(queue, *page)
+                                       for page in self.report_pages(log)])
+                for f in self.static_files():
+                    await queue.put((f.name, self.deploy_static_file, (f,)))
+                await queue.join()
+            finally:
+                for w in writers:
+                    w.cancel()
+        try:
+            if self._errors:
+                raise EngineError(f'Unable to write {len(self._errors)} output files.')
+            self.close_manifest()
+        finally:
+            self.close_compressor()
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+from .git.dag import CommitDAG
+from .git.model import GitLog, GitCommit
+
+# Prefixes of the references that are considered branches.
+BRANCH_REF_PREFIXES = ('refs/heads/', 'refs/remotes/')
+
+BRANCHES_FILE_NAME = 'branches.html'
+
+
+def branch_refs(refs: dict) -> dict:
+    """
+    Selects the branches from the references returned by ``run_git_refs()``.
+    Returns a dictionary that maps the short name of each branch into its
+    commit id. Symbolic references like ``origin/HEAD`` are ignored.
+    """
+    ret = {}
+    for name, id in refs.items():
+        for prefix in BRANCH_REF_PREFIXES:
+            if name.startswith(prefix):
+                short_name = name[len(prefix):]
+                if not short_name.endswith('/HEAD'):
+                    ret[short_name] = id
+                break
+    return ret
+
+
+def iter_bits(value: int):
+    """
+    Returns a generator of the indexes of the bits set in the value.
+    """
+    while value:
+        low = value & -value
+        yield low.bit_length() - 1
+        value ^= low
+
+
+def reachability(dag: CommitDAG, tips: list) -> list:
+    """
+    Computes the set of tips that reach each node of the graph. The sets are
+    integers used as bitsets, bit ``i`` is set if the node is reachable from
+    ``tips[i]``. The bits are propagated from the children to the parents in
+    topological order, thus all tips are processed in a single pass.
+    """
+    reach = [0] * len(dag)
+    for i, n in enumerate(tips):
+        reach[n] |= 1 << i
+    offsets = dag.offsets
+    parents = dag.parents
+    for n in dag.topological_order():
+        r = reach[n]
+        if r:
+            for i in range(offsets[n], offsets[n + 1]):
+                reach[parents[i]] |= r
+    return reach
+
+
+class BranchSummary:
+    """
+    This class holds the statistics of a branch. Branches that point to the
+    same commit share a single summary, ``names`` lists all of them. Unique
+    commits are the commits reachable only from this tip. ``authors``,
+    ``added``, ``deleted``, ``first_date`` and ``last_date`` refer to the
+    unique commits.
+    """
+
+    def __init__(self, names: list, tip: GitCommit) -> None:
+        self.names = names
+        self.tip = tip
+        self.commits = 0
+        self.unique_commits = 0
+        self.added = 0
+        self.deleted = 0
+        self.authors = []
+        self.first_date = None
+        self.last_date = None
+
+    @property
+    def name(self) -> str:
+        return ', '.join(self.names)
+
+    @property
+    def changed(self) -> int:
+        return self.added + self.deleted
+
+
+class _CommitGroup:
+    # Statistics of the commits reachable from the same set of branches.
+    __slots__ = ('count', 'added', 'deleted', 'authors', 'first_date', 'last_date')
+
+    def __init__(self, commit: GitCommit) -> None:
+        self.count = 0
+        self.added = 0
+        self.deleted = 0
+        self.authors = set()
+        self.first_date = commit.timestamp
+        self.last_date = commit.timestamp
+
+
+class BranchReport:
+    """
+    This class computes the statistics of all branches from a single log.
+    The commits are grouped by the set of branches that reach them, so the
+    cost of the aggregation depends on the number of distinct sets instead
+    of the number of commits times the number of branches.
+
+    Branches whose tips are not in the log are ignored. Branches that point
+    to the same commit are reported as a single entry, otherwise a fresh
+    clone would split every commit between ``master`` and ``origin/master``.
+    """
+
+    def __init__(self, log: GitLog, refs: dict) -> None:
+        dag = log.dag
+        by_tip = {}
+        for n in sorted(refs):
+            id = refs[n]
+            if id in dag:
+                by_tip.setdefault(dag.node(id), []).append(n)
+        tips = list(by_tip)
+        self.branches = [BranchSummary(by_tip[t], log[t]) for t in tips]
+        reach = reachability(dag, tips)
+
+        author_names = {}
+        for a in log.authors:
+            for identity in a.authors:
+                author_names[identity] = a
+        groups = {}
+        self.unreachable = 0
+        for r, commit in zip(reach, log):
+            if not r:
+                self.unreachable += 1
+                continue
+            g = groups.get(r, None)
+            if g is None:
+                g = _CommitGroup(commit)
+                groups[r] = g
+            g.count += 1
+            g.added += commit.diff.added
+            g.deleted += commit.diff.deleted
+            g.authors.add(author_names[commit.author])
+            if commit.timestamp < g.first_date:
+                g.first_date = commit.timestamp
+            if commit.timestamp > g.last_date:
+                g.last_date = commit.timestamp
+
+        for r, g in groups.items():
+            for i in iter_bits(r):
+                self.branches[i].commits += g.count
+            if r & (r - 1) == 0:
+                b = self.branches[r.bit_length() - 1]
+                b.unique_commits = g.count
+                b.added = g.added
+                b.deleted = g.deleted
+                b.authors = sorted(g.authors)
+                b.first_date = g.first_date
+                b.last_date = g.last_date
+        # Most recently updated branches first.
+        self.branches.sort(key=lambda b: b.tip.timestamp, reverse=True)
+
+    def __len__(self) -> int:
+        return len(self.branches)
+
+    def __iter__(self):
+        return iter(self.branches)
+
+    def __getitem__(self, name: str) -> BranchSummary:
+        for b in self.branches:
+            if name in b.names:
+                return b
+        raise KeyError(name)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import heapq
+import json
+from itertools import combinations
+from xml.etree import ElementTree
+from .git.model import GitLog
+from .ownership import Interner
+
+# Default size of the time windows in days. Two authors collaborate if they
+# change the same file in the same window.
+COLLABORATION_WINDOW = 90
+
+# Maximum number of authors of a file in a time window considered by the
+# pair count. Only the most active authors of the file are considered, so a
+# file changed by hundreds of authors does not produce a quadratic number
+# of pairs.
+MAX_AUTHORS_PER_FILE = 16
+
+COLLABORATION_JSON_FILE_NAME = 'collaboration.json'
+COLLABORATION_GRAPHML_FILE_NAME = 'collaboration.graphml'
+
+GRAPHML_NAMESPACE = 'http://graphml.graphdrawing.org/xmlns'
+
+
+def build_path_index(log: GitLog, authors: Interner, window: int = COLLABORATION_WINDOW) -> dict:
+    """
+    Builds the inverted index ``(path, window index) -> {author id: commit
+    count}`` of the log. The authors are the ``GitAuthorName`` instances of
+    the log, interned by ``authors``. If ``window`` is None or 0, the whole
+    log is a single window. Renames are ignored.
+    """
+    names = {}
+    for a in log.authors:
+        for identity in a.authors:
+            names[identity] = authors.intern(a)
+    index = {}
+    for commit in log:
+        author_id = names[commit.author]
+        w = commit.timestamp.toordinal() // window if window else 0
+        for d in commit.diff:
+            if d.rename:
+                continue
+            entry = index.setdefault((d.file_name, w), {})
+            entry[author_id] = entry.get(author_id, 0) + 1
+    return index
+
+
+class CollaborationGraph:
+    """
+    This class implements the weighted graph of collaboration among the
+    authors. The weight of an edge is the number of files changed by both
+    authors in the same time window.
+    """
+
+    def __init__(self, log: GitLog = None, window: int = COLLABORATION_WINDOW,
+                 max_authors: int = MAX_AUTHORS_PER_FILE) -> None:
+        self.authors = Interner()
+        self.window = window
+        self.max_authors = max_authors
+        # Maps the pairs of author ids (lowest first) into their weights.
+        self.edges = {}
+        if log is not None:
+            self.add_index(build_path_index(log, self.authors, window))
+
+    def add_index(self, index: dict):
+        """
+        Counts the pairs of authors of each entry of the inverted index.
+        """
+        edges = self.edges
+        max_authors = self.max_authors
+        for entry in index.values():
+            if len(entry) < 2:
+                continue
+            if len(entry) > max_authors:
+                ids = heapq.nlargest(max_authors, entry, key=entry.get)
+            else:
+                ids = entry
+            for pair in combinations(sorted(ids), 2):
+                edges[pair] = edges.get(pair, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    def weight(self, a, b) -> int:
+        """
+        Returns the weight of the edge between 2 authors.
+        """
+        a = self.authors.id(a)
+        b = self.authors.id(b)
+        return self.edges.get((a, b) if a < b else (b, a), 0)
+
+    def top_pairs(self, k: int) -> list:
+        """
+        Returns the ``k`` pairs of authors with the largest weights as a list
+        of tuples ``(author, author, weight)``.
+        """
+        values = self.authors.values
+        return [(values[a], values[b], w) for (a, b), w in
+                heapq.nlargest(k, self.edges.items(), key=lambda x: x[1])]
+
+    def degrees(self) -> list:
+        """
+        Returns the number of collaborators of each author as a list of
+        tuples ``(author, degree)`` sorted by degree.
+        """
+        degrees = [0] * len(self.authors)
+        for a, b in self.edges:
+            degrees[a] += 1
+            degrees[b] += 1
+        ret = list(zip(self.authors.values, degrees))
+        ret.sort(key=lambda x: x[1], reverse=True)
+        return ret
+
+    def to_json(self) -> str:
+        """
+        Exports the graph as JSON with the lists ``nodes`` and ``edges``.
+        """
+        return json.dumps({
+            'window': self.window,
+            'nodes': [{'id': a.author_key, 'name': a.name} for a in self.authors.values],
+            'edges': [{'source': self.authors.values[a].author_key,
+                       'target': self.authors.values[b].author_key, 'weight': w}
+                      for (a, b), w in sorted(self.edges.items())]},
+            indent=1)
+
+    def to_graphml(self) -> str:
+        """
+        Exports the graph as GraphML.
+        """
+        root = ElementTree.Element('graphml', xmlns=GRAPHML_NAMESPACE)
+        ElementTree.SubElement(root, 'key', {
+            'id': 'name', 'for': 'node', 'attr.name': 'name', 'attr.type': 'string'})
+        ElementTree.SubElement(root, 'key', {
+            'id': 'weight', 'for': 'edge', 'attr.name': 'weight', 'attr.type': 'int'})
+        graph = ElementTree.SubElement(
+            root, 'graph', id='collaboration', edgedefault='undirected')
+        for a in self.authors.values:
+            node = ElementTree.SubElement(graph, 'node', id=a.author_key)
+            ElementTree.SubElement(node, 'data', key='name').text = a.name
+        values = self.authors.values
+        for (a, b), w in sorted(self.edges.items()):
+            edge = ElementTree.SubElement(graph, 'edge', source=values[a].author_key,
+                                          target=values[b].author_key)
+            ElementTree.SubElement(edge, 'data', key='weight').text = str(w)
+        return '<?xml version="1.0" encoding="UTF-8"?>\n' + \
+            ElementTree.tostring(root, encoding='unicode') + '\n'
+
+    def exports(self) -> list:
+        """
+        Returns the exported files as a list of tuples ``(file name,
+        content)``.
+        """
+        return [(COLLABORATION_JSON_FILE_NAME, self.to_json()),
+                (COLLABORATION_GRAPHML_FILE_NAME, self.to_graphml())]
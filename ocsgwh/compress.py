@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from pathlib import Path
+from shutil import copyfileobj
+from threading import Lock
+
+from logging import getLogger
+LOGGER = getLogger(__name__)
+
+# Name of the file that stores the hashes of the compressed files.
+COMPRESSED_INDEX_FILE_NAME = '.ocsgwh-gzip.json'
+
+# Extensions of the output files that are compressed.
+COMPRESSED_EXTENSIONS = ('.html', '.svg', '.css', '.js', '.json')
+
+GZIP_SUFFIX = '.gz'
+
+# Size of the blocks read from the output files compressed by submit_file().
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+def is_compressible(file_name: str) -> bool:
+    return file_name.endswith(COMPRESSED_EXTENSIONS)
+
+
+class OutputCompressor:
+    """
+    This class creates the ``.gz`` siblings of the output files in a
+    thread pool. The hash of the contents of each compressed file is kept
+    in an index inside the output directory, so files whose contents did not
+    change are not compressed again.
+
+    The compressed files are created with a fixed modification time, thus
+    the same contents always produce the same ``.gz`` file.
+    """
+
+    def __init__(self, output_dir: Path, workers: int = None, level: int = 9) -> None:
+        self.output_dir = output_dir
+        self.level = level
+        self.index_file = output_dir / COMPRESSED_INDEX_FILE_NAME
+        self._index = {}
+        self._lock = Lock()
+        self._futures = []
+        if self.index_file.is_file():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as inp:
+                    self._index = json.load(inp)
+            except ValueError:
+                LOGGER.warning(
+                    f'Ignoring invalid index "{self.index_file}".')
+        self._executor = ThreadPoolExecutor(workers)
+
+    def submit(self, file_name: str, content: bytes):
+        """
+        Schedules the compression of the given output file if its contents
+        changed since it was last compressed. Files with extensions that are
+        not in ``COMPRESSED_EXTENSIONS`` are ignored.
+        """
+        if not is_compressible(file_name):
+            return
+        self._futures.append(self._executor.submit(
+            self._compress, file_name, content))
+
+    def submit_file(self, file_name: str):
+        """
+        Same as ``submit()`` but the contents are read from the output file
+        in blocks, so large files are never loaded into the memory.
+        """
+        if not is_compressible(file_name):
+            return
+        self._futures.append(self._executor.submit(
+            self._compress_file, file_name))
+
+    def _compress_file(self, file_name: str) -> bool:
+        source = self.output_dir / file_name
+        h = sha1()
+        with open(source, 'rb') as inp:
+            for block in iter(lambda: inp.read(READ_BLOCK_SIZE), b''):
+                h.update(block)
+        h = h.hexdigest()
+        target = self.output_dir / (file_name + GZIP_SUFFIX)
+        with self._lock:
+            if self._index.get(file_name, None) == h and target.is_file():
+                return False
+        with open(source, 'rb') as inp, open(target, 'wb') as outp:
+            with gzip.GzipFile(filename='', mode='wb', fileobj=outp,
+                               compresslevel=self.level, mtime=0) as z:
+                copyfileobj(inp, z, READ_BLOCK_SIZE)
+        with self._lock:
+            self._index[file_name] = h
+        return True
+
+    def _compress(self, file_name: str, content: bytes) -> bool:
+        h = sha1(content).hexdigest()
+        target = self.output_dir / (file_name + GZIP_SUFFIX)
+        with self._lock:
+            if self._index.get(file_name, None) == h and target.is_file():
+                return False
+        with open(target, 'wb') as outp:
+            outp.write(gzip.compress(content, self.level, mtime=0))
+        with self._lock:
+            self._index[file_name] = h
+        return True
+
+    def remove(self, file_name: str):
+        """
+        Removes the compressed sibling of the given output file.
+        """
+        (self.output_dir / (file_name + GZIP_SUFFIX)).unlink(missing_ok=True)
+        with self._lock:
+            self._index.pop(file_name, None)
+
+    def close(self) -> int:
+        """
+        Waits for all pending compressions and saves the index. Returns the
+        number of files that were compressed.
+        """
+        count = 0
+        try:
+            for f in self._futures:
+                if f.result():
+                    count += 1
+        finally:
+            self._executor.shutdown()
+            self._futures = []
+            with open(self.index_file, 'w', encoding='utf-8') as outp:
+                json.dump(self._index, outp, indent=1, sort_keys=True)
+        return count
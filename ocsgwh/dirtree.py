@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import heapq
+from .git.model import GitDiff, GitDiffEntry
+
+# Maximum depth of the directory tree displayed in the reports.
+TREE_DEPTH = 3
+# Maximum number of subdirectories of each directory displayed in the reports.
+TREE_CHILDREN = 20
+
+
+class DirectoryNode:
+    """
+    This class holds the aggregated changes of all files inside a directory,
+    including the files of its subdirectories. The root directory has an
+    empty path.
+    """
+    __slots__ = ('name', 'path', 'depth', 'added', 'deleted', 'update_count',
+                 'file_count', 'children')
+
+    def __init__(self, name: str, path: str, depth: int) -> None:
+        self.name = name
+        self.path = path
+        self.depth = depth
+        self.added = 0
+        self.deleted = 0
+        self.update_count = 0
+        self.file_count = 0
+        self.children = {}
+
+    @property
+    def changed(self) -> int:
+        return self.added + self.deleted
+
+    @property
+    def balance(self) -> int:
+        return self.added - self.deleted
+
+    def child(self, name: str):
+        node = self.children.get(name, None)
+        if node is None:
+            path = self.path + '/' + name if self.path else name
+            node = DirectoryNode(name, path, self.depth + 1)
+            self.children[name] = node
+        return node
+
+    def top_children(self, n: int = None) -> list:
+        """
+        Returns the ``n`` subdirectories with most changes. If ``n`` is None,
+        returns all subdirectories sorted by the number of changes.
+        """
+        key = DirectoryTree.sort_key
+        if n is None:
+            return sorted(self.children.values(), key=key, reverse=True)
+        else:
+            return heapq.nlargest(n, self.children.values(), key=key)
+
+
+class DirectoryTree:
+    """
+    This class implements a prefix tree of directories with the aggregated
+    changes of the files inside them. It is built from an aggregated diff in
+    a single pass. Renames are ignored as their paths describe two
+    locations at once.
+    """
+
+    def __init__(self, diff: GitDiff = ()) -> None:
+        self.root = DirectoryNode('', '', 0)
+        for d in diff:
+            self.add_entry(d)
+
+    @staticmethod
+    def sort_key(node: DirectoryNode):
+        return (node.changed, node.update_count)
+
+    def add_entry(self, entry: GitDiffEntry):
+        if entry.rename:
+            return
+        added = entry.added
+        deleted = entry.deleted
+        update_count = entry.update_count
+        node = self.root
+        parts = entry.file_name.split('/')
+        while True:
+            node.added += added
+            node.deleted += deleted
+            node.update_count += update_count
+            node.file_count += 1
+            if len(parts) <= node.depth + 1:
+                break
+            node = node.child(parts[node.depth])
+
+    def __getitem__(self, path: str) -> DirectoryNode:
+        node = self.root
+        if path:
+            for p in path.strip('/').split('/'):
+                node = node.children[p]
+        return node
+
+    def walk(self, max_depth: int = None):
+        """
+        Returns a generator of all directories up to the given depth in
+        pre-order. The root is not included.
+        """
+        stack = list(reversed(self.root.top_children()))
+        while stack:
+            node = stack.pop()
+            yield node
+            if max_depth is None or node.depth < max_depth:
+                stack.extend(reversed(node.top_children()))
+
+    def _nodes(self, max_depth: int = None):
+        # Same as walk() but in no particular order.
+        stack = list(self.root.children.values())
+        while stack:
+            node = stack.pop()
+            yield node
+            if max_depth is None or node.depth < max_depth:
+                stack.extend(node.children.values())
+
+    def top(self, n: int, depth: int = None, key=None) -> list:
+        """
+        Returns the ``n`` directories with most changes at the given depth
+        (1 for the top level directories). If ``depth`` is None, directories
+        of all depths are considered. ``key`` may be used to replace the
+        number of changes by another metric.
+        """
+        if depth is None:
+            nodes = self._nodes()
+        else:
+            nodes = (x for x in self._nodes(depth) if x.depth == depth)
+        return heapq.nlargest(n, nodes, key=key or DirectoryTree.sort_key)
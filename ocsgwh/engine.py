@@ -16,10 +16,23 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see < https: // www.gnu.org/licenses/>.
 from logging import getLogger
+from functools import partial
 from shutil import copyfile
-from .git.parser import GitLogParser, GitExecutionError, LOGGER
+from threading import RLock
+from itertools import chain
+from .git.parser import GitLogParser, GitCommitParser, ParallelGitLogParser, GitExecutionError, git_log_arguments, run_git_refs, LOGGER
+from .git.pathfilter import PathFilter
+from .git.patchid import compute_patch_ids
+from .git.blame import BlameCache, run_git_text_blobs, run_git_tree_blobs, blame_tree, BLAME_CACHE_FILE_NAME
 from .git.model import GitLog
+from .git.store import GitLogStore
+from .git.snapshot import save_snapshot, load_snapshot
 from .git import is_git_repo
+from .manifest import OutputManifest, fingerprint, file_fingerprint
+from .filetable import FileTable, file_table_prefix, file_table_shards, remove_file_shards, count_shards
+from .branches import BranchReport, BRANCHES_FILE_NAME, branch_refs
+from .collaboration import CollaborationGraph, COLLABORATION_WINDOW
+from .compress import OutputCompressor, COMPRESSED_INDEX_FILE_NAME, GZIP_SUFFIX
 from .report import *
 from pathlib import Path
 from datetime import datetime
@@ -40,10 +53,35 @@ class EngineError(Exception):
 
 
 class Options:
-    def __init__(self, repo_dir: Path, output_dir: Path, title: str) -> None:
+    def __init__(self, repo_dir: Path, output_dir: Path, title: str,
+                 store_file: Path = None, save_snapshot_file: Path = None,
+                 load_snapshot_file: Path = None, incremental: bool = False,
+                 jobs: int = 1, since: str = None, until: str = None,
+                 refs: list = None, paths: list = None, include: list = None,
+                 exclude: list = None, max_lines: int = None, gzip: bool = False,
+                 collaboration_window: int = COLLABORATION_WINDOW,
+                 dedup: bool = False, blame_workers: int = None,
+                 disabled_sections: list = None) -> None:
         self.repo_dir = repo_dir
         self.output_dir = output_dir
         self.template_dir = TEMPLATE_DIR
+        self.store_file = store_file
+        self.save_snapshot_file = save_snapshot_file
+        self.load_snapshot_file = load_snapshot_file
+        self.incremental = incremental
+        self.jobs = jobs
+        self.since = since
+        self.until = until
+        self.refs = refs
+        self.paths = paths
+        self.include = include
+        self.exclude = exclude
+        self.max_lines = max_lines
+        self.gzip = gzip
+        self.collaboration_window = collaboration_window
+        self.dedup = dedup
+        self.blame_workers = blame_workers
+        self.disabled_sections = disabled_sections or []
         if title:
             self.title = title
         else:
@@ -59,10 +97,23 @@ class Options:
         if not self.is_output_dir_valid(self.output_dir):
             raise EngineError(
                 f'"{self.output_dir}" is not a valid output directory.')
+        for s in self.disabled_sections:
+            if s not in REPORT_SECTIONS:
+                raise EngineError(f'Unknown report section "{s}".')
+
+    @property
+    def sections(self) -> set:
+        """
+        The sections of the reports that are enabled.
+        """
+        return set(REPORT_SECTIONS).difference(self.disabled_sections)
 
 
 STATIC_EXTENSIONS = ['.css', '.png', '.svg', '.jpg', '.js']
 
+# Size of the buffer used to write the pages rendered in chunks.
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
 
 class Engine:
 
@@ -72,11 +123,66 @@ class Engine:
             loader=FileSystemLoader(self.options.template_dir),
             autoescape=select_autoescape(['html', 'xml'])
         )
+        self.store = None
+        self.manifest = None
+        self.compressor = None
+        # Patch ids by commit id, kept across the updates of the log.
+        self.patch_id_cache = None
+        # Maps the ids of the commits removed by the deduplication into the
+        # ids of the copies that were kept.
+        self.replaced_commits = {}
+        # The blame cache, shared by all logs.
+        self.blame_cache = None
+        # The surviving lines of the last log.
+        self._surviving = None
+        # The blobs blamed for the last log.
+        self._blame_blobs = None
+        # The files at HEAD for the last log.
+        self._head_paths = None
+        self._surviving_lock = RLock()
+        # The file type classifier of the last log.
+        self._classifier = None
+        self.path_filter = PathFilter(
+            options.include, options.exclude, options.max_lines)
 
-    def get_git_log(self) -> GitLog:
-        parser = GitLogParser()
+    def create_commit_parser(self) -> GitCommitParser:
+        return GitCommitParser(self.path_filter)
+
+    def create_parser(self) -> GitLogParser:
+        if self.options.jobs == 1:
+            return GitLogParser(self.create_commit_parser())
+        else:
+            return ParallelGitLogParser(self.options.jobs,
+                                        commit_parser=self.create_commit_parser())
+
+    def get_refs(self) -> dict:
         try:
-            if parser.run_git(self.options.repo_dir):
+            return run_git_refs(self.options.repo_dir)
+        except GitExecutionError as err:
+            raise EngineError(str(err))
+
+    def get_branch_refs(self) -> dict:
+        """
+        Returns the branches of the repository. Branches whose tips were
+        removed by the deduplication point to the copies that were kept.
+        """
+        replaced = self.replaced_commits
+        return {name: replaced.get(id, id)
+                for name, id in branch_refs(self.get_refs()).items()}
+
+    def git_log_arguments(self, refs: list = None) -> list:
+        """
+        Returns the arguments of git log that limit the log to the scope
+        defined by the options. If ``refs`` is given, it replaces the
+        references selected by the options.
+        """
+        return git_log_arguments(refs or self.options.refs, self.options.since,
+                                 self.options.until, self.options.paths)
+
+    def parse_git_log(self) -> GitLog:
+        parser = self.create_parser()
+        try:
+            if parser.run_git(self.options.repo_dir, self.git_log_arguments()):
                 return parser.build_git_log()
             else:
                 raise EngineError(
@@ -85,6 +191,59 @@ class Engine:
             raise EngineError(
                 str(err))
 
+    def get_git_log(self) -> GitLog:
+        if self.options.load_snapshot_file:
+            try:
+                log = load_snapshot(self.options.load_snapshot_file)
+            except (OSError, ValueError) as err:
+                raise EngineError(
+                    f'Unable to load the snapshot: {err}')
+            if log.scope != self.scope_fingerprint():
+                log.close()
+                raise EngineError(
+                    'The snapshot was created with different --since, --until, --ref, --path, '
+                    '--include, --exclude, --max-lines or --dedup options.')
+        else:
+            log = self.parse_git_log()
+        ret = self.deduplicate(log)
+        if ret is not log:
+            # The commits of the deduplicated log do not depend on it.
+            log.close()
+        self.save_git_log(ret)
+        return ret
+
+    def deduplicate(self, log: GitLog) -> GitLog:
+        """
+        Collapses the copies of the same change (cherry-picks and rebased
+        commits) if the deduplication is enabled. The patch ids are cached
+        in the commit store if it is in use.
+        """
+        if not self.options.dedup:
+            return log
+        if self.patch_id_cache is None:
+            self.patch_id_cache = self.store.patch_ids() if self.store is not None else {}
+        try:
+            patch_ids = compute_patch_ids(self.options.repo_dir, log, self.patch_id_cache)
+        except GitExecutionError as err:
+            raise EngineError(str(err))
+        if self.store is not None:
+            self.store.add_patch_ids(self.patch_id_cache)
+        ret, self.replaced_commits = log.deduplicate(patch_ids)
+        LOGGER.info(f'{len(log) - len(ret)} duplicated commits removed.')
+        return ret
+
+    def save_git_log(self, log: GitLog):
+        """
+        Saves the log into the snapshot file and/or the commit store if
+        they are enabled.
+        """
+        if self.options.save_snapshot_file:
+            save_snapshot(log, self.options.save_snapshot_file,
+                          self.scope_fingerprint())
+        if self.store is not None:
+            self.store.add_commits(log)
+            self.store.prune(set(c.id for c in log))
+
     def prepare_output_dir(self):
         dir = self.options.output_dir
         if not dir.is_dir():
@@ -93,46 +252,405 @@ class Engine:
     def get_template(self, template_name: str) -> Template:
         return self.jinja_env.get_template(template_name)
 
+    def scope_fingerprint(self) -> str:
+        """
+        Returns the fingerprint of the options that select the commits and
+        the changes included in the log. The order of the rules does not
+        change the result, thus they are sorted.
+        """
+        return fingerprint(sorted(self.options.include or []),
+                           sorted(self.options.exclude or []),
+                           str(self.options.max_lines),
+                           sorted(self.options.paths or []),
+                           sorted(self.options.refs or []),
+                           str(self.options.since), str(self.options.until),
+                           str(self.options.dedup))
+
+    def open_store(self):
+        if self.options.store_file:
+            self.store = GitLogStore(self.options.store_file)
+            if self.store.set_scope(self.scope_fingerprint()):
+                LOGGER.info('The scope of the log changed, the commit store was reset.')
+
+    def close_store(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        self.manifest = None
+
+    def blame_cache_file(self) -> Path:
+        return self.options.output_dir / BLAME_CACHE_FILE_NAME
+
+    def get_blame_blobs(self, log: GitLog) -> list:
+        """
+        Returns the text files at HEAD in the scope of the report as a list
+        of tuples ``(blob id, path)``. They are listed once for each log.
+        """
+        with self._surviving_lock:
+            if self._blame_blobs is None or self._blame_blobs[0] is not log:
+                try:
+                    blobs = [(id, path) for id, path in run_git_text_blobs(
+                        self.options.repo_dir, paths=self.options.paths)
+                        if self.path_filter.accept_path(path)]
+                except GitExecutionError as err:
+                    raise EngineError(str(err))
+                self._blame_blobs = (log, blobs)
+            return self._blame_blobs[1]
+
+    def get_head_paths(self, log: GitLog) -> set:
+        """
+        Returns the paths of the files at HEAD in the scope of the report.
+        They are listed once for each log. Returns None if HEAD cannot be
+        listed (e.g. a log loaded without the repository).
+        """
+        with self._surviving_lock:
+            if self._head_paths is None or self._head_paths[0] is not log:
+                try:
+                    paths = set(path for id, path in run_git_tree_blobs(self.options.repo_dir)
+                                if self.path_filter.accept_path(path))
+                except GitExecutionError as err:
+                    LOGGER.warning(f'Unable to list the files at HEAD: {err}')
+                    paths = None
+                self._head_paths = (log, paths)
+            return self._head_paths[1]
+
+    def get_surviving_lines(self, log: GitLog) -> SurvivingLines:
+        """
+        Blames the text files at HEAD in the scope of the report if the
+        surviving lines analysis is enabled. Returns None if it is disabled.
+        The result is computed once for each log and the blame cache is kept
+        across the logs, thus only the changed files are blamed again.
+        """
+        if not self.options.blame_workers:
+            return None
+        with self._surviving_lock:
+            if self._surviving is None or self._surviving[0] is not log:
+                blobs = self.get_blame_blobs(log)
+                try:
+                    if self.blame_cache is None:
+                        self.blame_cache = BlameCache(self.blame_cache_file())
+                    blame = blame_tree(self.options.repo_dir, blobs, self.blame_cache,
+                                       self.options.blame_workers)
+                    self.blame_cache.save(blobs)
+                except GitExecutionError as err:
+                    raise EngineError(str(err))
+                except OSError as err:
+                    raise EngineError(f'Unable to save the blame cache: {err}')
+                self._surviving = (log, SurvivingLines(log, blame))
+            return self._surviving[1]
+
+    def surviving_lines_fingerprint(self, log: GitLog):
+        """
+        Returns the inputs of the surviving lines analysis: the blobs that
+        are blamed and the identities they are matched against. Unlike the
+        analysis itself, they are cheap to compute.
+        """
+        if 'surviving_lines' not in self.options.sections or not self.options.blame_workers:
+            return []
+        return chain((BlameCache.key(id, path) for id, path in self.get_blame_blobs(log)),
+                     (str(i) for a in log.authors for i in a.authors))
+
+    def get_file_type_classifier(self, log: GitLog) -> FileTypeClassifier:
+        """
+        Returns the file type classifier of all paths in the log. It is
+        shared by the global and author pages, thus each path has the same
+        type in all of them. It is created once for each log.
+        """
+        classifier = self._classifier
+        if classifier is None or classifier[0] is not log:
+            classifier = (log, FileTypeClassifier(
+                d.file_name for c in log for d in c.diff))
+            self._classifier = classifier
+        return classifier[1]
+
+    def file_types_fingerprint(self, log: GitLog, filtered_log: GitLog):
+        """
+        Returns the types of the files changed by ``filtered_log``. They
+        depend on the files of the whole log, thus they must be part of the
+        fingerprint of the pages of the authors.
+        """
+        if 'file_types' not in self.options.sections:
+            return []
+        classifier = self.get_file_type_classifier(log)
+        paths = sorted(set(d.file_name for c in filtered_log for d in c.diff))
+        return (p + ' ' + classifier(p) for p in paths)
+
+    def surviving_lines_vars(self, log: GitLog, author: GitAuthorName = None) -> dict:
+        if 'surviving_lines' not in self.options.sections:
+            return {}
+        surviving = self.get_surviving_lines(log)
+        if surviving is None:
+            return {}
+        return {'surviving': create_surviving_lines_report(surviving, author)}
+
+    def get_aggregated_diff(self, authors: list = None) -> GitDiff:
+        """
+        Returns the aggregated diff computed by the commit store or None if
+        the store is not in use.
+        """
+        if self.store is not None:
+            return self.store.diff_by_file(authors)
+        else:
+            return None
+
     def run(self) -> int:
         self.options.check_options()
         self.prepare_output_dir()
+        self.open_store()
+        try:
+            self.run_core()
+        finally:
+            self.close_store()
+
+    def run_core(self):
         log = self.get_git_log()
+        try:
+            self.generate_report(log)
+        finally:
+            log.close()
+
+    def init_basic_template_vars(self):
         self.basic_template_vars = {
             'title': self.options.title,
             'repository_dir': str(
                 self.options.repo_dir.absolute()),
             'report_date': datetime.now(),
-            'version': VERSION}
+            'version': VERSION,
+            'sections': self.options.sections}
+
+    def generate_report(self, log: GitLog):
+        self.init_basic_template_vars()
+        self.open_manifest()
+        self.open_compressor()
+        try:
+            for template_name, file_name, vars_func in self.report_pages(log):
+                self.render_template(template_name, file_name, vars_func())
+            self.deploy_static_files(self.options.output_dir)
+            self.close_manifest()
+        finally:
+            self.close_compressor()
 
-        self.generate_global_diff(log)
-        self.deploy_index(log)
+    def report_pages(self, log: GitLog):
+        """
+        Returns a generator of the pages that must be generated. Each page is
+        a tuple with the name of the template, the name of the output file and
+        a function that computes the template variables.
+
+        Pages that are up to date are not returned. The expensive inputs of
+        the fingerprints are ``LazyValue`` instances, thus they are only
+        computed if the manifest is in use and only once for all pages.
+        """
+        surviving = LazyValue(lambda: list(self.surviving_lines_fingerprint(log)))
+        head_paths = LazyValue(lambda: sorted(self.get_head_paths(log) or []))
+        if self.is_output_outdated('global_diff.html', (c.id for c in log),
+                                   surviving, head_paths):
+            yield ('global_diff.html', 'global_diff.html',
+                   partial(self.global_diff_vars, log))
+        if self.is_output_outdated('index.html', log.authors, (c.id for c in log),
+                                   str(self.options.collaboration_window)):
+            yield ('index.html', 'index.html', partial(self.index_vars, log))
+        refs = self.get_branch_refs()
+        if self.is_output_outdated(BRANCHES_FILE_NAME, sorted(refs.items()), (c.id for c in log)):
+            yield ('branches.html', BRANCHES_FILE_NAME, partial(self.branches_vars, log, refs))
         for a in log.authors:
-            self.generate_author_diff(a, log)
-        self.deploy_static_files(self.options.output_dir)
+            filtered_log = log.by_author_name(a)
+            file_name = a.author_key + '.html'
+            if self.is_output_outdated(file_name, a.authors, (c.id for c in filtered_log),
+                                       LazyValue(self.file_types_fingerprint, log, filtered_log),
+                                       surviving):
+                yield ('author_diff.html', file_name,
+                       partial(self.author_diff_vars, a, filtered_log, log))
 
-    def render_template(self, template_name, file_name: str, vars: dict):
+    def open_manifest(self):
+        """
+        Loads the manifest of the output directory if the incremental
+        mode is enabled.
+        """
+        if self.options.incremental:
+            self.manifest = OutputManifest(self.options.output_dir)
+            templates = sorted(
+                f for f in self.options.template_dir.iterdir() if f.is_file())
+            self.template_fingerprint = fingerprint(
+                file_fingerprint(*templates), VERSION,
+                str(self.options.title), self.basic_template_vars['repository_dir'],
+                sorted(self.options.sections), self.scope_fingerprint(),
+                # Pages skipped by the manifest are not compressed.
+                str(self.options.gzip))
+
+    def close_manifest(self):
+        """
+        Removes the output files that were not generated by this run and
+        saves the manifest.
+        """
+        if self.manifest is not None:
+            for f in self.manifest.stale_files():
+                LOGGER.info(f'Removing stale output file "{f}".')
+                (self.options.output_dir / f).unlink(missing_ok=True)
+                if self.compressor is not None:
+                    self.compressor.remove(f)
+                self.remove_file_shards(f)
+                self.manifest.remove(f)
+            self.manifest.save()
+            self.manifest = None
+
+    def open_compressor(self):
+        """
+        Starts the compression of the output files if it is enabled. If it
+        is disabled, the compressed files created by previous runs are
+        removed as they would become outdated.
+        """
+        if self.options.gzip:
+            self.compressor = OutputCompressor(self.options.output_dir)
+        else:
+            index_file = self.options.output_dir / COMPRESSED_INDEX_FILE_NAME
+            if index_file.is_file():
+                for f in self.options.output_dir.glob('*' + GZIP_SUFFIX):
+                    f.unlink()
+                index_file.unlink()
+
+    def close_compressor(self):
+        """
+        Waits for the compression of the output files.
+        """
+        if self.compressor is not None:
+            try:
+                count = self.compressor.close()
+                LOGGER.info(f'{count} output files compressed.')
+            except OSError as err:
+                raise EngineError(f'Unable to compress the output files: {err}')
+            finally:
+                self.compressor = None
+
+    def is_output_outdated(self, file_name: str, *inputs) -> bool:
+        """
+        Verifies if the given output file must be generated again based on
+        the fingerprint of its inputs. It always returns True if the
+        incremental mode is disabled, without evaluating the inputs that
+        are ``LazyValue`` instances.
+        """
+        if self.manifest is None:
+            return True
+        return self.manifest.update(
+            file_name, fingerprint(self.template_fingerprint, *inputs))
+
+    def write_output(self, file_name: str, content):
+        """
+        Writes an output file. ``content`` may be a string, bytes or an
+        iterable of strings (e.g. a page rendered in chunks), which is
+        written through a buffer without being joined in memory. The
+        compressed copy of the file is created in background if the
+        compression is enabled.
+        """
+        out_file = self.options.output_dir / file_name
+        if isinstance(content, (str, bytes)):
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            with open(out_file, 'wb') as outp:
+                outp.write(content)
+            if self.compressor is not None:
+                self.compressor.submit(file_name, content)
+        else:
+            with open(out_file, 'w', encoding='utf-8', newline='',
+                      buffering=OUTPUT_BUFFER_SIZE) as outp:
+                for chunk in content:
+                    outp.write(chunk)
+            if self.compressor is not None:
+                self.compressor.submit_file(file_name)
+
+    def render_page(self, template_name, vars: dict) -> str:
         template = self.get_template(template_name)
         template_vars = {**self.basic_template_vars, **vars}
-        out_file = self.options.output_dir / file_name
-        with open(out_file, 'w', encoding='utf-8') as outp:
-            outp.write(template.render(**template_vars))
+        return template.render(**template_vars)
 
-    def deploy_static_files(self, target_dir: Path):
+    def render_page_chunks(self, template_name, vars: dict):
+        """
+        Returns a generator that renders the page in chunks, thus the whole
+        page is never kept in memory.
+        """
+        template = self.get_template(template_name)
+        template_vars = {**self.basic_template_vars, **vars}
+        return template.generate(**template_vars)
+
+    def render_outputs(self, template_name, file_name: str, vars: dict,
+                       stream: bool = False) -> list:
+        """
+        Renders the page, the shards of its file table and the exports of its
+        collaboration graph. It returns a list of tuples ``(output file name,
+        content)`` with the page first. If ``stream`` is True, the content of
+        the page is a generator of chunks rendered as it is consumed.
+        """
+        shards = []
+        diff = vars.get('diff', None)
+        if diff is not None and 'changes_per_file' in self.options.sections:
+            prefix = file_table_prefix(file_name)
+            shards = file_table_shards(prefix, diff)
+            vars = {**vars, 'file_table': FileTable(prefix, len(shards), len(diff))}
+        graph = vars.get('collaboration', None)
+        if graph is not None:
+            shards = shards + graph.exports()
+        if stream:
+            page = self.render_page_chunks(template_name, vars)
+        else:
+            page = self.render_page(template_name, vars)
+        return [(file_name, page)] + shards
+
+    def remove_file_shards(self, file_name: str, start: int = 0):
+        """
+        Removes the shards of the file table of the given page from the
+        output directory, starting at the given index.
+        """
+        for f in remove_file_shards(self.options.output_dir,
+                                    file_table_prefix(file_name), start):
+            if self.compressor is not None:
+                self.compressor.remove(f)
+
+    def render_template(self, template_name, file_name: str, vars: dict):
+        outputs = self.render_outputs(template_name, file_name, vars, True)
+        for name, content in outputs:
+            self.write_output(name, content)
+        self.remove_file_shards(file_name, count_shards(outputs))
+
+    def static_files(self) -> list:
+        """
+        Returns the list of static files that must be deployed.
+        """
         files = [f for f in TEMPLATE_DIR.iterdir() if f.is_file()]
-        static_files = [f for f in files if f.suffix in STATIC_EXTENSIONS]
-        for f in static_files:
-            copyfile(f, target_dir / f.name)
-
-    def generate_global_diff(self, log: GitLog):
-        self.render_template('global_diff.html',
-                             'global_diff.html', create_global_git_report(log, True))
-
-    def generate_author_diff(self, author: GitAuthorName, log: GitLog):
-        filtered_log = log.by_author_name(author)
-        self.render_template('author_diff.html',
-                             author.author_key + '.html',
-                             {'author': author, **create_global_git_report(filtered_log, False)})
-
-    def deploy_index(self, log: GitLog):
-        self.render_template('index.html', 'index.html',
-                             {'authors': log.authors})
+        return [f for f in files if f.suffix in STATIC_EXTENSIONS and
+                self.is_output_outdated(f.name, f.read_bytes())]
+
+    def deploy_static_file(self, file: Path):
+        self.write_output(file.name, file.read_bytes())
+
+    def deploy_static_files(self, target_dir: Path):
+        for f in self.static_files():
+            if target_dir == self.options.output_dir:
+                self.deploy_static_file(f)
+            else:
+                copyfile(f, target_dir / f.name)
+
+    def global_diff_vars(self, log: GitLog) -> dict:
+        return {**create_global_git_report(log, True, self.get_aggregated_diff(),
+                                           self.get_file_type_classifier(log),
+                                           LazyValue(self.get_head_paths, log)),
+                **self.surviving_lines_vars(log)}
+
+    def author_diff_vars(self, author: GitAuthorName, filtered_log: GitLog, log: GitLog = None) -> dict:
+        """
+        Returns the variables of the page of an author. ``log`` is the whole
+        log, used by the surviving lines analysis and to classify the files.
+        """
+        if log is None:
+            return {'author': author, **create_global_git_report(
+                filtered_log, False, self.get_aggregated_diff(author.authors))}
+        return {'author': author, **create_global_git_report(
+            filtered_log, False, self.get_aggregated_diff(author.authors),
+            self.get_file_type_classifier(log)),
+            **self.surviving_lines_vars(log, author)}
+
+    def branches_vars(self, log: GitLog, refs: dict) -> dict:
+        return {'branches': BranchReport(log, refs)}
+
+    def index_vars(self, log: GitLog) -> dict:
+        return {'authors': log.authors,
+                'collaboration': CollaborationGraph(log, self.options.collaboration_window),
+                'collaboration_count': HOTSPOT_COUNT}
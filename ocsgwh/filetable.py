@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import json
+import re
+from pathlib import Path
+
+# Number of files in each shard of the file table.
+FILE_TABLE_PAGE_SIZE = 2000
+
+# Name of the JavaScript function called by each shard (see filetable.js).
+SHARD_FUNCTION = 'ocsgwhFileShard'
+
+# Pattern of the shard file names: '<page name>.files.<index>.js'.
+SHARD_FILE_RE = re.compile(r'(.+)\.files\.(\d+)\.js')
+
+
+class FileTable:
+    """
+    This class describes the file table of a page for the templates.
+    """
+
+    def __init__(self, prefix: str, shards: int, rows: int) -> None:
+        self.prefix = prefix
+        self.shards = shards
+        self.rows = rows
+
+
+def file_table_prefix(page_file_name: str) -> str:
+    """
+    Returns the prefix of the shards of the given page.
+    """
+    if page_file_name.endswith('.html'):
+        page_file_name = page_file_name[:-len('.html')]
+    return page_file_name + '.files'
+
+
+def shard_file_name(prefix: str, index: int) -> str:
+    return f'{prefix}.{index}.js'
+
+
+def parse_shard_file_name(file_name: str) -> tuple:
+    """
+    Returns the tuple ``(page file name, shard index)`` of the given shard
+    file name or None if it is not a shard.
+    """
+    m = SHARD_FILE_RE.fullmatch(file_name)
+    if m:
+        return (m[1] + '.html', int(m[2]))
+    else:
+        return None
+
+
+def count_shards(outputs: list) -> int:
+    """
+    Returns the number of shards in a list of tuples ``(output file name,
+    content)``.
+    """
+    return sum(1 for name, _ in outputs if parse_shard_file_name(name))
+
+
+def file_table_rows(diff) -> list:
+    """
+    Converts the diff into the rows of the file table. Each row is a list
+    ``[file name, added, deleted, update count, diff class]``.
+    """
+    return [[d.file_name, d.added, d.deleted, d.update_count, d.diff_class.value]
+            for d in diff]
+
+
+def file_table_shards(prefix: str, diff, page_size: int = FILE_TABLE_PAGE_SIZE) -> list:
+    """
+    Splits the file table into shards. Each shard is a tuple ``(file name,
+    content)``, where the content is a script that passes the JSON encoded
+    rows to ``SHARD_FUNCTION``. Scripts are used instead of plain JSON files
+    because browsers do not allow pages opened from the local file system
+    to fetch other files.
+    """
+    rows = file_table_rows(diff)
+    shards = []
+    for i, start in enumerate(range(0, len(rows), page_size)):
+        data = json.dumps(rows[start:start + page_size], separators=(',', ':'))
+        shards.append((shard_file_name(prefix, i),
+                       f'{SHARD_FUNCTION}({json.dumps(prefix)},{i},{data});\n'))
+    return shards
+
+
+def remove_file_shards(output_dir: Path, prefix: str, start: int = 0) -> list:
+    """
+    Removes the shards with the given prefix whose index is equal or
+    larger than ``start``. Returns the names of the removed files.
+    """
+    removed = []
+    for f in output_dir.glob(f'{prefix}.*.js'):
+        m = parse_shard_file_name(f.name)
+        if m and file_table_prefix(m[0]) == prefix and m[1] >= start:
+            f.unlink(missing_ok=True)
+            removed.append(f.name)
+    return removed
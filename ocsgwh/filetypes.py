@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+from functools import lru_cache
+
+# File type of files without extension or with a name that cannot be
+# classified by its extension.
+OTHER_FILE_TYPE = 'Other'
+
+# Maps the lower case file names into their types. It has precedence
+# over the extensions.
+FILE_NAMES = {
+    'makefile': 'Makefile',
+    'gnumakefile': 'Makefile',
+    'cmakelists.txt': 'CMake',
+    'dockerfile': 'Dockerfile',
+    'containerfile': 'Dockerfile',
+    'vagrantfile': 'Ruby',
+    'gemfile': 'Ruby',
+    'rakefile': 'Ruby',
+    'jenkinsfile': 'Groovy',
+    'build.gradle': 'Gradle',
+    'settings.gradle': 'Gradle',
+    'pom.xml': 'Maven',
+    'package.json': 'npm',
+    'package-lock.json': 'Lock file',
+    'yarn.lock': 'Lock file',
+    'cargo.lock': 'Lock file',
+    'poetry.lock': 'Lock file',
+    'go.sum': 'Lock file',
+    'go.mod': 'Go',
+    'requirements.txt': 'Python',
+    'setup.cfg': 'Python',
+    '.gitignore': 'Git',
+    '.gitattributes': 'Git',
+    '.gitmodules': 'Git',
+    'license': 'Text',
+    'copying': 'Text',
+    'authors': 'Text',
+    'readme': 'Text',
+    'changelog': 'Text',
+}
+
+# Maps the file name prefixes (before the first dot) into their types. It
+# covers names like ``Dockerfile.dev`` or ``Makefile.am``.
+FILE_NAME_PREFIXES = {
+    'dockerfile': 'Dockerfile',
+    'makefile': 'Makefile',
+    'readme': 'Text',
+    'license': 'Text',
+}
+
+# Maps the lower case extensions with more than one component into their
+# types. They have precedence over the simple extensions.
+COMPOUND_EXTENSIONS = {
+    'd.ts': 'TypeScript',
+    'min.js': 'JavaScript (minified)',
+    'min.css': 'CSS (minified)',
+    'tar.gz': 'Archive',
+    'tar.bz2': 'Archive',
+    'tar.xz': 'Archive',
+}
+
+# Maps the lower case extensions into their types.
+EXTENSIONS = {
+    'c': 'C',
+    'h': 'C',
+    'cpp': 'C++', 'cc': 'C++', 'cxx': 'C++', 'c++': 'C++',
+    'hpp': 'C++', 'hh': 'C++', 'hxx': 'C++', 'inl': 'C++',
+    'm': 'Objective-C', 'mm': 'Objective-C',
+    'cs': 'C#',
+    'java': 'Java',
+    'kt': 'Kotlin', 'kts': 'Kotlin',
+    'scala': 'Scala',
+    'groovy': 'Groovy',
+    'gradle': 'Gradle',
+    'go': 'Go',
+    'rs': 'Rust',
+    'swift': 'Swift',
+    'py': 'Python', 'pyi': 'Python', 'pyx': 'Python',
+    'rb': 'Ruby',
+    'php': 'PHP',
+    'pl': 'Perl', 'pm': 'Perl',
+    'lua': 'Lua',
+    'r': 'R',
+    'js': 'JavaScript', 'mjs': 'JavaScript', 'cjs': 'JavaScript', 'jsx': 'JavaScript',
+    'ts': 'TypeScript', 'tsx': 'TypeScript',
+    'vue': 'Vue',
+    'html': 'HTML', 'htm': 'HTML',
+    'css': 'CSS', 'scss': 'CSS', 'sass': 'CSS', 'less': 'CSS',
+    'sh': 'Shell', 'bash': 'Shell', 'zsh': 'Shell',
+    'bat': 'Batch', 'cmd': 'Batch',
+    'ps1': 'PowerShell',
+    'sql': 'SQL',
+    'cmake': 'CMake',
+    'mk': 'Makefile',
+    'json': 'JSON',
+    'xml': 'XML', 'xsd': 'XML', 'xsl': 'XML',
+    'yml': 'YAML', 'yaml': 'YAML',
+    'toml': 'TOML',
+    'ini': 'INI', 'cfg': 'INI', 'conf': 'INI', 'properties': 'INI',
+    'md': 'Markdown', 'markdown': 'Markdown',
+    'rst': 'reStructuredText',
+    'txt': 'Text',
+    'csv': 'CSV',
+    'png': 'Image', 'jpg': 'Image', 'jpeg': 'Image', 'gif': 'Image',
+    'svg': 'Image', 'ico': 'Image', 'bmp': 'Image', 'webp': 'Image',
+    'zip': 'Archive', 'jar': 'Archive', 'gz': 'Archive', 'tgz': 'Archive',
+    'pdf': 'Document', 'doc': 'Document', 'docx': 'Document',
+    'lock': 'Lock file',
+}
+
+# Maps the ambiguous extensions into the types they assume when other files
+# with the given extensions are found in the same directory. The first
+# match wins.
+AMBIGUOUS_EXTENSIONS = {
+    'h': (('C++', frozenset(['cpp', 'cc', 'cxx', 'c++', 'hpp', 'hh', 'hxx'])),
+          ('Objective-C', frozenset(['m', 'mm']))),
+    'm': (('MATLAB', frozenset(['mat', 'mlx', 'fig'])),),
+}
+
+
+def split_path(path: str) -> tuple:
+    """
+    Splits the path into a tuple ``(directory, file name)``.
+    """
+    i = path.rfind('/')
+    if i < 0:
+        return ('', path)
+    else:
+        return (path[:i], path[i + 1:])
+
+
+def file_extension(name: str) -> str:
+    """
+    Returns the lower case extension of the given file name. Leading dots
+    of hidden files are not considered extensions.
+    """
+    i = name.rfind('.')
+    if i <= 0:
+        return ''
+    else:
+        return name[i + 1:].lower()
+
+
+@lru_cache(maxsize=None)
+def file_type(path: str) -> str:
+    """
+    Returns the type of the file with the given path according to the
+    tables of this module. The result is memoized per path without a limit,
+    as the number of distinct paths is bounded by the repositories.
+    """
+    name = split_path(path)[1].lower()
+    t = FILE_NAMES.get(name, None)
+    if t is not None:
+        return t
+    parts = name.split('.')
+    if len(parts) > 2:
+        t = COMPOUND_EXTENSIONS.get('.'.join(parts[-2:]), None)
+        if t is not None:
+            return t
+    t = EXTENSIONS.get(file_extension(name), None)
+    if t is not None:
+        return t
+    if parts[0]:
+        return FILE_NAME_PREFIXES.get(parts[0], OTHER_FILE_TYPE)
+    return OTHER_FILE_TYPE
+
+
+class FileTypeClassifier:
+    """
+    This class classifies the files of a set of paths. The ambiguous
+    extensions (see ``AMBIGUOUS_EXTENSIONS``) are resolved using the
+    extensions of the other files in the same directory. For example, a
+    ``.h`` file next to ``.cpp`` files is classified as C++.
+
+    The result of each distinct path is computed only once.
+    """
+
+    def __init__(self, paths=()) -> None:
+        self._extensions = {}
+        self._cache = {}
+        for p in paths:
+            self.add_path(p)
+
+    def add_path(self, path: str):
+        """
+        Adds a path to the context used to solve the ambiguous extensions.
+        """
+        directory, name = split_path(path)
+        ext = file_extension(name)
+        extensions = self._extensions.setdefault(directory, set())
+        if ext not in extensions:
+            extensions.add(ext)
+            self._cache.clear()
+
+    def __call__(self, path: str) -> str:
+        t = self._cache.get(path, None)
+        if t is None:
+            t = self._classify(path)
+            self._cache[path] = t
+        return t
+
+    def _classify(self, path: str) -> str:
+        directory, name = split_path(path)
+        ext = file_extension(name)
+        candidates = AMBIGUOUS_EXTENSIONS.get(ext, None)
+        if candidates and name.lower() not in FILE_NAMES:
+            siblings = self._extensions.get(directory, ())
+            for t, hints in candidates:
+                if not hints.isdisjoint(siblings):
+                    return t
+        return file_type(path)
@@ -20,8 +20,9 @@ from pathlib import Path
 
 def is_git_repo(dir: Path) -> bool:
     """
-    Verifies if the given directory points to a valid git repository.
+    Verifies if the given directory points to a valid git repository. In
+    linked worktrees, ``.git`` is a file that points to the git directory.
     """
     git_dir = dir / '.git'
     git_bare_dir = dir / 'refs' / 'heads'
-    return git_dir.is_dir() or git_bare_dir.is_dir()
+    return git_dir.exists() or git_bare_dir.is_dir()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from .model import GitAuthor
+from .parser import GitExecutionError
+
+from logging import getLogger
+LOGGER = getLogger(__name__)
+
+# Lists the blobs of a tree as '<mode> <type> <object id>\t<path>'.
+GIT_LS_TREE_COMMAND = ['git', 'ls-tree', '-r', '-z']
+
+# Lists the text files of a tree and their number of lines.
+GIT_TEXT_FILES_COMMAND = ['git', 'grep', '-I', '-c', '-z', '']
+
+GIT_BLAME_COMMAND = ['git', 'blame', '--incremental']
+
+# Default number of git blame processes running at the same time.
+BLAME_WORKERS = 4
+
+BLAME_CACHE_FILE_NAME = '.ocsgwh-blame.json'
+
+
+def run_git(repo_dir: Path, command: list) -> str:
+    p = subprocess.run(command, cwd=repo_dir, capture_output=True, encoding='utf-8',
+                       errors='replace')
+    if p.returncode != 0:
+        raise GitExecutionError(p.returncode)
+    return p.stdout
+
+
+def run_git_tree_blobs(repo_dir: Path, revision: str = 'HEAD') -> list:
+    """
+    Returns the files of the given revision as a list of tuples
+    ``(blob id, path)``. Submodules are not included.
+    """
+    ret = []
+    for entry in run_git(repo_dir, GIT_LS_TREE_COMMAND + [revision]).split('\0'):
+        if entry:
+            info, path = entry.split('\t', 1)
+            mode, type, id = info.split(' ')
+            if type == 'blob':
+                ret.append((id, path))
+    return ret
+
+
+def run_git_text_blobs(repo_dir: Path, revision: str = 'HEAD', paths: list = None) -> list:
+    """
+    Returns the text files of the given revision as a list of tuples
+    ``(blob id, path)``. Binary files, symbolic links and submodules are
+    not included. If ``paths`` is given, only the files that match these
+    pathspecs are returned.
+    """
+    text_files = set()
+    command = GIT_TEXT_FILES_COMMAND + [revision]
+    if paths:
+        command += ['--'] + paths
+    p = subprocess.run(command, cwd=repo_dir,
+                       capture_output=True, encoding='utf-8', errors='replace')
+    # git grep returns 1 if no file matches.
+    if p.returncode not in (0, 1):
+        raise GitExecutionError(p.returncode)
+    prefix = revision + ':'
+    for l in p.stdout.split('\n'):
+        if l:
+            name = l.split('\0', 1)[0]
+            text_files.add(name[len(prefix):] if name.startswith(prefix) else name)
+    return [(id, path) for id, path in run_git_tree_blobs(repo_dir, revision)
+            if path in text_files]
+
+
+def parse_blame_incremental(output: str) -> dict:
+    """
+    Parses the output of ``git blame --incremental``. Returns a dictionary
+    that maps each ``GitAuthor`` into the number of lines attributed to it.
+    The author of each commit is only reported on its first group of lines.
+    """
+    authors = {}
+    lines = {}
+    commit = None
+    name = None
+    for l in output.split('\n'):
+        if commit is None:
+            if not l:
+                continue
+            fields = l.split(' ')
+            commit = fields[0]
+            lines[commit] = lines.get(commit, 0) + int(fields[3])
+        elif l.startswith('author '):
+            name = l[len('author '):]
+        elif l.startswith('author-mail '):
+            authors[commit] = GitAuthor(l[len('author-mail '):].strip('<>'), name)
+        elif l.startswith('filename '):
+            # The filename ends each group.
+            commit = None
+    ret = {}
+    for commit, count in lines.items():
+        author = authors[commit]
+        ret[author] = ret.get(author, 0) + count
+    return ret
+
+
+def run_git_blame(repo_dir: Path, path: str, revision: str = 'HEAD') -> dict:
+    """
+    Returns the number of lines of the given file attributed to each
+    ``GitAuthor`` at the given revision.
+    """
+    return parse_blame_incremental(
+        run_git(repo_dir, GIT_BLAME_COMMAND + [revision, '--', path]))
+
+
+class BlameCache:
+    """
+    This class implements the cache of the results of git blame. The results
+    are stored by blob id and path, thus files that did not change are never
+    blamed again. The cache is kept as a JSON file.
+    """
+
+    def __init__(self, cache_file: Path = None) -> None:
+        self.cache_file = cache_file
+        self._entries = {}
+        if cache_file is not None and cache_file.is_file():
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as inp:
+                    self._entries = json.load(inp)
+            except ValueError:
+                LOGGER.warning(f'Ignoring invalid blame cache "{cache_file}".')
+
+    @staticmethod
+    def key(blob_id: str, path: str) -> str:
+        return f'{blob_id} {path}'
+
+    def get(self, blob_id: str, path: str) -> dict:
+        entry = self._entries.get(self.key(blob_id, path), None)
+        if entry is None:
+            return None
+        return {GitAuthor(email, name): count for email, name, count in entry}
+
+    def put(self, blob_id: str, path: str, lines: dict):
+        self._entries[self.key(blob_id, path)] = [
+            [a.email, a.name, count] for a, count in lines.items()]
+
+    def save(self, blobs: list):
+        """
+        Saves the entries of the given list of tuples ``(blob id, path)``.
+        The other entries are dropped. Without a cache file, the entries are
+        only kept in memory.
+        """
+        keys = set(self.key(id, path) for id, path in blobs)
+        self._entries = {k: v for k, v in self._entries.items() if k in keys}
+        if self.cache_file is None:
+            return
+        with open(self.cache_file, 'w', encoding='utf-8') as outp:
+            json.dump(self._entries, outp)
+
+
+def blame_tree(repo_dir: Path, blobs: list, cache: BlameCache,
+               workers: int = BLAME_WORKERS, revision: str = 'HEAD') -> dict:
+    """
+    Blames the given list of tuples ``(blob id, path)`` of a revision. Files
+    that are not in the cache are blamed by a pool of ``workers`` git
+    processes.
+
+    Returns a dictionary that maps each path into a dictionary with the
+    number of lines of each ``GitAuthor``.
+    """
+    ret = {}
+    missing = []
+    for id, path in blobs:
+        lines = cache.get(id, path)
+        if lines is None:
+            missing.append((id, path))
+        else:
+            ret[path] = lines
+    LOGGER.info(f'Blaming {len(missing)} of {len(blobs)} files.')
+    with ThreadPoolExecutor(workers) as executor:
+        results = executor.map(
+            lambda x: run_git_blame(repo_dir, x[1], revision), missing)
+        for (id, path), lines in zip(missing, results):
+            cache.put(id, path, lines)
+            ret[path] = lines
+    return ret
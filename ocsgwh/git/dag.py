@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+from array import array
+
+# Node id used when a commit has no parent inside the log.
+NO_PARENT = -1
+
+
+class CommitDAG:
+    """
+    This class implements a compact index of the commit graph of a log. Each
+    commit is mapped into an integer node id, its position in the log, and
+    the parents are stored in flat arrays: the parents of the node ``n``
+    are ``parents[offsets[n]:offsets[n + 1]]``, first parent first.
+
+    Parents that are not in the log (e.g. when the log is limited by date)
+    are ignored, thus their children become roots of the graph.
+    """
+
+    def __init__(self, commits) -> None:
+        self.ids = [c.id for c in commits]
+        self._nodes = {id: n for n, id in enumerate(self.ids)}
+        self.offsets = array('i', [0])
+        self.parents = array('i')
+        for c in commits:
+            for p in c.parents:
+                n = self._nodes.get(p, None)
+                if n is not None:
+                    self.parents.append(n)
+            self.offsets.append(len(self.parents))
+        self._order = None
+        self._generations = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._nodes
+
+    def node(self, id: str) -> int:
+        """
+        Returns the node id of the given commit id.
+        """
+        return self._nodes[id]
+
+    def node_parents(self, node: int):
+        return self.parents[self.offsets[node]:self.offsets[node + 1]]
+
+    def first_parent(self, node: int) -> int:
+        """
+        Returns the first parent of the node or ``NO_PARENT``.
+        """
+        start = self.offsets[node]
+        return self.parents[start] if start < self.offsets[node + 1] else NO_PARENT
+
+    def children_counts(self) -> array:
+        counts = array('i', bytes(4 * len(self)))
+        for p in self.parents:
+            counts[p] += 1
+        return counts
+
+    def topological_order(self) -> array:
+        """
+        Returns the node ids in topological order, children before their
+        parents, as ``git log --topo-order`` does. It runs in linear time
+        and the result is cached.
+        """
+        if self._order is None:
+            offsets = self.offsets
+            parents = self.parents
+            pending = self.children_counts()
+            stack = [n for n in range(len(self) - 1, -1, -1) if not pending[n]]
+            order = array('i')
+            while stack:
+                n = stack.pop()
+                order.append(n)
+                for i in range(offsets[n], offsets[n + 1]):
+                    p = parents[i]
+                    pending[p] -= 1
+                    if not pending[p]:
+                        stack.append(p)
+            self._order = order
+        return self._order
+
+    def generations(self) -> array:
+        """
+        Returns the generation number of each node: 1 for the roots and
+        1 + the largest generation of its parents otherwise. A node can only
+        be an ancestor of nodes with a larger generation.
+        """
+        if self._generations is None:
+            offsets = self.offsets
+            parents = self.parents
+            generations = array('i', bytes(4 * len(self)))
+            for n in reversed(self.topological_order()):
+                g = 0
+                for i in range(offsets[n], offsets[n + 1]):
+                    if generations[parents[i]] > g:
+                        g = generations[parents[i]]
+                generations[n] = g + 1
+            self._generations = generations
+        return self._generations
+
+    def first_parent_chain(self, node: int) -> list:
+        """
+        Returns the node and its ancestors following only the first parents,
+        as ``git log --first-parent`` does.
+        """
+        chain = []
+        while node != NO_PARENT:
+            chain.append(node)
+            node = self.first_parent(node)
+        return chain
+
+    def _mark_ancestors(self, nodes, marks: bytearray, min_generation: int = 0):
+        # Marks the given nodes and all their ancestors whose generations are
+        # not lower than min_generation. Already marked nodes are not visited
+        # again.
+        offsets = self.offsets
+        parents = self.parents
+        generations = self.generations()
+        stack = [n for n in nodes if not marks[n]]
+        for n in stack:
+            marks[n] = 1
+        while stack:
+            n = stack.pop()
+            for i in range(offsets[n], offsets[n + 1]):
+                p = parents[i]
+                if not marks[p] and generations[p] >= min_generation:
+                    marks[p] = 1
+                    stack.append(p)
+
+    def ancestors(self, node: int) -> bytearray:
+        """
+        Returns the set of ancestors of the node, including itself, as a
+        bytearray indexed by the node ids.
+        """
+        marks = bytearray(len(self))
+        self._mark_ancestors((node,), marks)
+        return marks
+
+    def is_ancestor(self, ancestor: int, node: int) -> bool:
+        """
+        Returns True if ``ancestor`` is reachable from ``node``. As in
+        ``git merge-base --is-ancestor``, a node is an ancestor of itself.
+        The search is pruned by the generation numbers.
+        """
+        generations = self.generations()
+        if generations[ancestor] > generations[node]:
+            return False
+        marks = bytearray(len(self))
+        self._mark_ancestors((node,), marks, generations[ancestor])
+        return bool(marks[ancestor])
+
+    def merge_bases(self, a: int, b: int) -> list:
+        """
+        Returns the best common ancestors of 2 nodes, the common ancestors
+        that are not ancestors of other common ancestors, as
+        ``git merge-base --all`` does. The result is sorted by generation,
+        newest first.
+        """
+        common = self.ancestors(a)
+        b_marks = self.ancestors(b)
+        generations = self.generations()
+        candidates = [n for n in range(len(self)) if common[n] and b_marks[n]]
+        candidates.sort(key=lambda n: generations[n], reverse=True)
+        # A candidate visited from a newer candidate is not a best one.
+        stale = bytearray(len(self))
+        ret = []
+        for n in candidates:
+            if not stale[n]:
+                ret.append(n)
+            self._mark_ancestors(self.node_parents(n), stale)
+        return ret
+
+    def merge_base(self, a: int, b: int) -> int:
+        """
+        Returns one of the best common ancestors of 2 nodes or ``NO_PARENT``
+        if they have none.
+        """
+        bases = self.merge_bases(a, b)
+        return bases[0] if bases else NO_PARENT
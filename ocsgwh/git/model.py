@@ -15,12 +15,13 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see < https: // www.gnu.org/licenses/>.
-from functools import total_ordering
+from functools import total_ordering, cached_property
 from datetime import datetime, date
 from enum import Enum, auto
 from hashlib import sha1
 import re
 import codecs
+from .dag import CommitDAG
 
 
 class GitAuthor:
@@ -501,13 +502,20 @@ class GitLog:
 
     def _update(self):
         self._commits.sort(key=lambda x: x.timestamp)
+        self._update_authors(c.author for c in self._commits)
+
+    def _update_authors(self, authors):
+        """
+        Builds the list of ``GitAuthorName`` from the given sequence of
+        ``GitAuthor``. The authors are expected to be in order of appearance.
+        """
         seen = set()
         builders = []
-        for c in self._commits:
-            if not c.author in seen:
-                seen.add(c.author)
+        for author in authors:
+            if not author in seen:
+                seen.add(author)
                 found = False
-                ca = ComparableGitAuthor(c.author)
+                ca = ComparableGitAuthor(author)
                 for candidate in builders:
                     if candidate.try_add(ca):
                         found = True
@@ -531,6 +539,40 @@ class GitLog:
     def __getitem__(self, index: int) -> GitCommit:
         return self._commits[index]
 
+    def close(self):
+        """
+        Releases the resources used by the log (e.g. the file of a
+        snapshot). The log must not be used after it. This implementation
+        does nothing.
+        """
+        pass
+
+    @cached_property
+    def dag(self) -> CommitDAG:
+        """
+        The compact commit graph of this log. It is built once, in the first
+        access.
+        """
+        return CommitDAG(self._commits)
+
+    @cached_property
+    def columns(self):
+        """
+        The columnar representation of this log used by ``group_by()``. It
+        is built once, in the first access.
+        """
+        from ..query import LogColumns
+        return LogColumns(self)
+
+    def group_by(self, *dimensions: str):
+        """
+        Creates a query that groups the changes of this log by the given
+        dimensions (see ``ocsgwh.query.DIMENSIONS``). For example::
+
+            log.group_by('author', 'week').sum('added', 'deleted').count()
+        """
+        return self.columns.group_by(*dimensions)
+
     @ property
     def min_date(self) -> datetime:
         return self[0].timestamp
@@ -565,3 +607,62 @@ class GitLog:
         """
         return GitLog([c for c in self._commits
                        if c.timestamp.date() >= start_date and c.timestamp.date() < end_date])
+
+    def deduplicate(self, patch_ids: dict):
+        """
+        Collapses the commits with the same patch id (e.g. cherry-picks and
+        rebased copies) into the oldest one. ``patch_ids`` maps the commit
+        ids into their patch ids, commits not in it are always kept.
+
+        Copies keep the author timestamp of the original commit, thus ties
+        are broken by the generation of the commits (ancestors first) and
+        then by their ids, so the result does not depend on the order of
+        the output of git.
+
+        The children of the removed commits inherit their parents, thus the
+        other commits remain reachable from the same references. References
+        that point to a removed commit must be moved to the kept copy.
+
+        Returns a tuple with the new log and a dictionary that maps the ids
+        of the removed commits into the ids of the copies that were kept.
+        """
+        generations = self.dag.generations()
+        order = sorted(range(len(self._commits)), key=lambda i: (
+            self._commits[i].timestamp, generations[i], self._commits[i].id))
+        kept = {}
+        removed = {}
+        replaced = {}
+        for i in order:
+            c = self._commits[i]
+            p = patch_ids.get(c.id, None)
+            if p is None:
+                continue
+            k = kept.get(p, None)
+            if k is not None:
+                removed[c.id] = c.parents
+                replaced[c.id] = k
+            else:
+                kept[p] = c.id
+        if not removed:
+            return self, replaced
+
+        def resolve(parents):
+            # Removed commits have a single parent, thus this walks chains.
+            ret = []
+            stack = list(reversed(parents))
+            while stack:
+                p = stack.pop()
+                if p in removed:
+                    stack.extend(reversed(removed[p]))
+                elif p not in ret:
+                    ret.append(p)
+            return ret
+
+        commits = []
+        for c in self._commits:
+            if c.id in removed:
+                continue
+            if any(p in removed for p in c.parents):
+                c = GitCommit(c.id, resolve(c.parents), c.timestamp, c.author, c.diff)
+            commits.append(c)
+        return GitLog(commits), replaced
@@ -17,9 +17,12 @@
 # along with this program.  If not, see < https: // www.gnu.org/licenses/>.
 import re
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import subprocess
 from pathlib import Path
 from .model import *
+from .pathfilter import PathFilter
 
 from logging import getLogger
 LOGGER = getLogger(__name__)
@@ -53,25 +56,68 @@ def parse_iso_date(s):
 # <added>\t<deleted>\t<file name>
 #
 # ```
-GIT_LOG_COMMAND = [
+GIT_LOG_BASE_COMMAND = [
     'git',
     'log',
     '--pretty=format:*****%n%H%n%P%n%aN%n%ae%n%aI%n',
     '--numstat',
-    '--no-color',
-    '--all']
+    '--no-color']
+
+GIT_LOG_COMMAND = GIT_LOG_BASE_COMMAND + ['--all']
 
 GIT_COMMIT_SEPARATOR = '*****'
 
+# Lists all references of the repository as '<object id> <ref name>'.
+GIT_REFS_COMMAND = [
+    'git',
+    'for-each-ref',
+    '--format=%(objectname) %(refname)']
+
+# Prints the git directory and the directory shared by all worktrees.
+GIT_DIRS_COMMAND = ['git', 'rev-parse', '--git-dir', '--git-common-dir']
+
+
+def git_log_command(revisions: list = None) -> list:
+    """
+    Returns the git log command for the given list of revisions. If no
+    revisions are specified, it returns ``GIT_LOG_COMMAND``.
+    """
+    if revisions:
+        return GIT_LOG_BASE_COMMAND + list(revisions)
+    else:
+        return GIT_LOG_COMMAND
+
+
+def git_log_arguments(refs: list = None, since: str = None, until: str = None,
+                      paths: list = None) -> list:
+    """
+    Returns the revision and path arguments of git log that limit the
+    log to the commits reachable from ``refs`` (all references by default),
+    committed between ``since`` and ``until`` and touching the given
+    ``paths``. The diffs are also limited to the given paths.
 
-def run_git_log(repo_dir: Path) -> str:
+    The dates are passed to git as is, thus any format accepted by git may
+    be used (e.g.: ``2021-01-01`` or ``3 months ago``).
+    """
+    ret = list(refs) if refs else ['--all']
+    if since:
+        ret.append(f'--since={since}')
+    if until:
+        ret.append(f'--until={until}')
+    if paths:
+        ret.append('--')
+        ret.extend(paths)
+    return ret
+
+
+def run_git_log(repo_dir: Path, revisions: list = None) -> str:
     """
     Execute the git log command (defined by ``GIT_LOG_COMMAND``) inside the
-    given repository.
+    given repository. If ``revisions`` is specified, it replaces ``--all``.
 
     Returns the log in case of success or None otherwise.
     """
-    p = subprocess.run(GIT_LOG_COMMAND, cwd=repo_dir,
+    p = subprocess.run(git_log_command(revisions), cwd=repo_dir,
                        capture_output=True, encoding='utf-8')
     if p.returncode == 0:
         return p.stdout
@@ -79,6 +125,52 @@ def run_git_log(repo_dir: Path) -> str:
         raise GitExecutionError(p.returncode)
 
 
+def run_git_refs(repo_dir: Path) -> dict:
+    """
+    Returns a dictionary that maps the name of each reference in the
+    repository to the object it points to.
+    """
+    p = subprocess.run(GIT_REFS_COMMAND, cwd=repo_dir,
+                       capture_output=True, encoding='utf-8')
+    if p.returncode != 0:
+        raise GitExecutionError(p.returncode)
+    ret = {}
+    for l in p.stdout.split('\n'):
+        if l:
+            id, name = l.split(' ', 1)
+            ret[name] = id
+    return ret
+
+
+def run_git_dirs(repo_dir: Path) -> tuple:
+    """
+    Returns a tuple with the git directory of the repository and the common
+    directory shared by all its worktrees. ``HEAD`` is stored in the former
+    while the references are stored in the latter. Both are the same unless
+    ``repo_dir`` is a linked worktree.
+    """
+    p = subprocess.run(GIT_DIRS_COMMAND, cwd=repo_dir,
+                       capture_output=True, encoding='utf-8')
+    if p.returncode != 0:
+        raise GitExecutionError(p.returncode)
+    git_dir, common_dir = p.stdout.split('\n')[:2]
+    return (repo_dir / git_dir, repo_dir / common_dir)
+
+
+def run_git_is_ancestor(repo_dir: Path, ancestor: str, commit: str) -> bool:
+    """
+    Verifies if ``ancestor`` is an ancestor of ``commit``.
+    """
+    p = subprocess.run(['git', 'merge-base', '--is-ancestor', ancestor, commit],
+                       cwd=repo_dir, capture_output=True, encoding='utf-8')
+    if p.returncode == 0:
+        return True
+    elif p.returncode == 1:
+        return False
+    else:
+        raise GitExecutionError(p.returncode)
+
+
 class BaseGitCommitParser:
     """
     This class defines the base class for all GitCommitParsers.
@@ -98,27 +190,53 @@ class GitCommitParser(BaseGitCommitParser):
     STAT_ENTRY_BIN_RE = re.compile(r'\-\t\-\t(.+)')
     ID_RE = re.compile(r'[0-9a-f]{40,}')
 
-    def _parse_diff(self, c):
+    def __init__(self, path_filter: PathFilter = None) -> None:
         """
-        Parses the diff part of the the commit. It stops at the
-        first entry that does not match ``STAT_ENTRY_RE``.
+        Creates a new instance of this class. If ``path_filter`` is
+        specified, the diff entries rejected by it are discarded.
         """
-        builder = GitDiffBuilder()
+        self.path_filter = path_filter if path_filter else None
+
+    def _parse_diff_entries(self, c) -> list:
+        """
+        Parses the diff part of the the commit into a list of tuples
+        ``(file name, added, deleted, binary)``. It stops at the
+        first empty line.
+        """
+        entries = []
+        path_filter = self.path_filter
         for l in c:
             if l:
                 m = GitCommitParser.STAT_ENTRY_RE.match(l)
                 if m:
-                    builder.add_entry(m[3], int(m[1]), int(m[2]), False)
+                    added = int(m[1])
+                    deleted = int(m[2])
+                    if path_filter is None or path_filter.accept(m[3], added, deleted):
+                        entries.append((m[3], added, deleted, False))
                 else:
                     m = GitCommitParser.STAT_ENTRY_BIN_RE.match(l)
                     if m:
-                        builder.add_entry(m[1], 0, 0, True)
+                        if path_filter is None or path_filter.accept(m[1], 0, 0):
+                            entries.append((m[1], 0, 0, True))
                     else:
                         LOGGER.warning(f'invalid diff stat "{l}".')
             else:
                 break
+        return entries
+
+    def _build_diff(self, entries: list) -> GitDiff:
+        builder = GitDiffBuilder()
+        for e in entries:
+            builder.add_entry(*e)
         return builder.build()
 
+    def _parse_diff(self, c):
+        """
+        Parses the diff part of the the commit. It stops at the
+        first entry that does not match ``STAT_ENTRY_RE``.
+        """
+        return self._build_diff(self._parse_diff_entries(c))
+
     def _parse_id(self, id: str):
         id = id.strip()
         if GitCommitParser.ID_RE.match(id):
@@ -142,9 +260,12 @@ class GitCommitParser(BaseGitCommitParser):
         else:
             raise ValueError('The name of the author is empty.')
 
-    def parse(self, commit: list) -> GitCommit:
+    def parse_fields(self, commit: list) -> tuple:
         """
-        Parses the commit entry as a list of lines.
+        Parses the commit entry as a list of lines into a tuple
+        ``(id, parents, timestamp, email, name, diff entries)``. This
+        intermediate form is cheaper to transfer between processes than
+        the ``GitCommit`` instance.
         """
         if len(commit) < 6:
             raise ValueError('The commit must have at least 6 lines.')
@@ -155,8 +276,22 @@ class GitCommitParser(BaseGitCommitParser):
         author_email = self._parse_name(next(ci))
         author_date = parse_iso_date(next(ci))
         next(ci)
+        return (id, parents, author_date, author_email, author,
+                self._parse_diff_entries(ci))
+
+    def build(self, fields: tuple) -> GitCommit:
+        """
+        Creates the ``GitCommit`` from the tuple returned by ``parse_fields()``.
+        """
+        id, parents, author_date, author_email, author, entries = fields
         return GitCommit(id, parents, author_date,
-                         GitAuthor(author_email, author), self._parse_diff(ci))
+                         GitAuthor(author_email, author), self._build_diff(entries))
+
+    def parse(self, commit: list) -> GitCommit:
+        """
+        Parses the commit entry as a list of lines.
+        """
+        return self.build(self.parse_fields(commit))
 
 
 class GitLogParser:
@@ -165,6 +300,7 @@ class GitLogParser:
         self._result = []
         self._commit_parser = commit_parser
         self._count = 0
+        self._pending = []
 
     def _process_commit(self, commit: list) -> GitCommit:
         self._count += 1
@@ -175,25 +311,43 @@ class GitLogParser:
             except ValueError:
                 LOGGER.warning(f'Invalid entry {self._count}: {commit}.')
 
+    def feed(self, line: str) -> None:
+        """
+        Feeds a single line of the log into this parser. It allows the log
+        to be parsed while it is still being generated. Call ``finish()``
+        after the last line.
+        """
+        line = line.rstrip()
+        if line == GIT_COMMIT_SEPARATOR:
+            self._process_commit(self._pending)
+            self._pending = []
+        else:
+            self._pending.append(line)
+
+    def finish(self) -> None:
+        """
+        Processes the last commit fed into this parser.
+        """
+        if self._pending:
+            self._process_commit(self._pending)
+            self._pending = []
+
     def _split_commit(self, source: str) -> None:
-        commit = list()
         for l in source.split('\n'):
-            l = l.rstrip()
-            if l == GIT_COMMIT_SEPARATOR:
-                self._process_commit(commit)
-                commit.clear()
-            else:
-                commit.append(l)
-        if commit:
-            self._process_commit(commit)
+            self.feed(l)
+        self.finish()
 
-    def run(self, source: str) -> bool:
+    def reset(self) -> None:
         self._result.clear()
+        self._pending = []
+
+    def run(self, source: str) -> bool:
+        self.reset()
         self._split_commit(source)
         return True
 
-    def run_git(self, repo_dir: Path) -> bool:
-        source = run_git_log(repo_dir)
+    def run_git(self, repo_dir: Path, revisions: list = None) -> bool:
+        source = run_git_log(repo_dir, revisions)
         if source:
             return self.run(source)
         else:
@@ -205,3 +359,76 @@ class GitLogParser:
 
     def build_git_log(self) -> GitLog:
         return GitLog(self.result)
+
+
+def split_log(source: str, chunk_size: int) -> list:
+    """
+    Splits the output of git log into chunks of approximately ``chunk_size``
+    characters. Each chunk ends right before a commit separator, thus no
+    commit is split between 2 chunks.
+    """
+    chunks = []
+    separator = '\n' + GIT_COMMIT_SEPARATOR + '\n'
+    start = 0
+    while start < len(source):
+        end = source.find(separator, start + chunk_size)
+        if end < 0:
+            chunks.append(source[start:])
+            break
+        chunks.append(source[start:end + 1])
+        start = end + 1
+    return chunks
+
+
+def parse_log_chunk(commit_parser: GitCommitParser, chunk: str) -> list:
+    """
+    Parses a chunk of the git log into a list of the intermediate tuples
+    returned by ``GitCommitParser.parse_fields()``. Invalid commits are
+    ignored.
+
+    This function is executed by the worker processes of
+    ``ParallelGitLogParser``.
+    """
+    ret = []
+    commit = []
+    for l in chunk.split('\n') + [GIT_COMMIT_SEPARATOR]:
+        l = l.rstrip()
+        if l == GIT_COMMIT_SEPARATOR:
+            if commit:
+                try:
+                    ret.append(commit_parser.parse_fields(commit))
+                except ValueError:
+                    LOGGER.warning(f'Invalid entry: {commit}.')
+            commit = []
+        else:
+            commit.append(l)
+    return ret
+
+
+class ParallelGitLogParser(GitLogParser):
+    """
+    This class implements a version of ``GitLogParser`` that parses the log
+    using multiple processes. The log is split into chunks at the commit
+    boundaries and each chunk is parsed by a worker process. The results
+    are then converted into ``GitCommit`` instances in order.
+
+    Logs smaller than ``chunk_size`` are parsed by the current process.
+    """
+
+    def __init__(self, jobs: int = None, chunk_size: int = 4 * 1024 * 1024,
+                 commit_parser: GitCommitParser = GitCommitParser()) -> None:
+        super().__init__(commit_parser)
+        self.jobs = jobs
+        self.chunk_size = chunk_size
+
+    def run(self, source: str) -> bool:
+        chunks = split_log(source, self.chunk_size)
+        if len(chunks) < 2 or self.jobs == 1:
+            return super().run(source)
+        self.reset()
+        with ProcessPoolExecutor(self.jobs) as executor:
+            for commits in executor.map(partial(parse_log_chunk, self._commit_parser), chunks):
+                for fields in commits:
+                    self._result.append(self._commit_parser.build(fields))
+        return True
+
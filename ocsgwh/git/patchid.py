@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import subprocess
+from pathlib import Path
+from threading import Thread
+from .model import GitLog, GitCommit
+from .parser import GitExecutionError
+
+# Reads commit ids from the standard input and writes their patches.
+GIT_DIFF_TREE_COMMAND = ['git', 'diff-tree', '--stdin', '-p', '--no-color']
+
+# Reads the patches and writes '<patch id> <commit id>' for each commit.
+GIT_PATCH_ID_COMMAND = ['git', 'patch-id', '--stable']
+
+# Number of commit ids written to git diff-tree at once.
+PATCH_ID_BATCH_SIZE = 1000
+
+
+def diff_signature(commit: GitCommit) -> tuple:
+    """
+    Returns a signature of the diff of the commit computed from the output of
+    ``--numstat``. Commits with the same patch always have the same
+    signature, thus only commits that share their signature with others may
+    be duplicates.
+    """
+    return tuple(sorted((d.file_name, d.added, d.deleted) for d in commit.diff))
+
+
+def find_candidates(log: GitLog) -> list:
+    """
+    Returns the commits of the log that may be copies of other commits: the
+    commits with a single parent and a non-empty diff whose signature is
+    shared with another commit.
+    """
+    groups = {}
+    for c in log:
+        if len(c.parents) == 1 and len(c.diff):
+            groups.setdefault(diff_signature(c), []).append(c)
+    return [c for g in groups.values() if len(g) > 1 for c in g]
+
+
+def _write_batches(stdin, commit_ids: list, batch_size: int):
+    try:
+        for start in range(0, len(commit_ids), batch_size):
+            batch = commit_ids[start:start + batch_size]
+            stdin.write(''.join(id + '\n' for id in batch))
+            stdin.flush()
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            stdin.close()
+        except BrokenPipeError:
+            pass
+
+
+def run_git_patch_ids(repo_dir: Path, commit_ids: list,
+                      batch_size: int = PATCH_ID_BATCH_SIZE) -> dict:
+    """
+    Computes the stable patch ids of the given commits. The commit ids are
+    fed in batches to a single ``git diff-tree`` process whose output is
+    streamed into a single ``git patch-id`` process.
+
+    Returns a dictionary that maps the commit ids into their patch ids.
+    Commits without a patch (e.g. only mode changes) are not included.
+    """
+    if not commit_ids:
+        return {}
+    diff_tree = subprocess.Popen(GIT_DIFF_TREE_COMMAND, cwd=repo_dir,
+                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                 stderr=subprocess.DEVNULL, encoding='utf-8')
+    patch_id = subprocess.Popen(GIT_PATCH_ID_COMMAND, cwd=repo_dir,
+                                stdin=diff_tree.stdout, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, encoding='utf-8')
+    # Only git patch-id must read the output of git diff-tree.
+    diff_tree.stdout.close()
+    writer = Thread(target=_write_batches,
+                    args=(diff_tree.stdin, commit_ids, batch_size), daemon=True)
+    writer.start()
+    ret = {}
+    for l in patch_id.stdout:
+        fields = l.split()
+        if len(fields) == 2:
+            ret[fields[1]] = fields[0]
+    writer.join()
+    diff_tree_code = diff_tree.wait()
+    patch_id_code = patch_id.wait()
+    if diff_tree_code != 0:
+        raise GitExecutionError(diff_tree_code)
+    if patch_id_code != 0:
+        raise GitExecutionError(patch_id_code)
+    return ret
+
+
+def compute_patch_ids(repo_dir: Path, log: GitLog, cache: dict,
+                      batch_size: int = PATCH_ID_BATCH_SIZE) -> dict:
+    """
+    Computes the patch ids of the candidates of the log. The patch ids are
+    cached by commit id in ``cache``, commits without a patch are cached
+    with an empty patch id. Only the commits that are not in the cache are
+    sent to git.
+
+    Returns a dictionary that maps the commit ids of the candidates into
+    their patch ids.
+    """
+    candidates = [c.id for c in find_candidates(log)]
+    missing = [id for id in candidates if id not in cache]
+    found = run_git_patch_ids(repo_dir, missing, batch_size)
+    for id in missing:
+        cache[id] = found.get(id, '')
+    return {id: cache[id] for id in candidates if cache[id]}
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import re
+from fnmatch import translate
+
+# Characters that turn a rule into a glob pattern.
+GLOB_CHARS = frozenset('*?[')
+
+# Renames reported by git log --numstat, e.g. 'src/{old => new}/a.c'.
+RENAME_PATTERN = re.compile(r'^(.*)\{(.*) => (.*)\}(.*)$')
+
+
+def rename_paths(path: str) -> list:
+    """
+    Returns the paths described by a diff entry. Renames are reported by
+    git as ``prefix/{old => new}/suffix`` (or ``old => new`` if the paths
+    have nothing in common), thus they are expanded into both paths.
+    Other entries describe a single path.
+    """
+    m = RENAME_PATTERN.match(path)
+    if m is not None:
+        prefix, old, new, suffix = m.groups()
+        # Either side may be empty, e.g. 'src/{ => lib}/a.c'
+        return [(prefix + old + suffix).replace('//', '/'),
+                (prefix + new + suffix).replace('//', '/')]
+    if ' => ' in path:
+        return path.split(' => ', 1)
+    return [path]
+
+
+class PathRuleSet:
+    """
+    This class compiles a list of path rules into a single matcher. Rules
+    without glob characters are directory prefixes (or exact file names)
+    and are stored in a prefix trie of path components. All other rules
+    are glob patterns matched against the whole path and are combined into
+    a single regular expression. As in ``fnmatch``, ``*`` also matches
+    ``/``, thus ``*.lock`` matches lock files in any directory.
+    """
+
+    def __init__(self, rules: list) -> None:
+        self._trie = {}
+        globs = []
+        for r in rules:
+            if GLOB_CHARS.isdisjoint(r):
+                self._add_prefix(r)
+            else:
+                globs.append(r)
+        if globs:
+            self._regex = re.compile('|'.join(translate(g) for g in globs))
+        else:
+            self._regex = None
+        self._empty = not rules
+
+    def _add_prefix(self, prefix: str):
+        node = self._trie
+        for p in prefix.strip('/').split('/'):
+            node = node.setdefault(p, {})
+        # None marks the end of a prefix.
+        node[None] = True
+
+    def _match_prefix(self, path: str) -> bool:
+        node = self._trie
+        for p in path.split('/'):
+            node = node.get(p, None)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
+
+    def __bool__(self):
+        return not self._empty
+
+    def match(self, path: str) -> bool:
+        if self._trie and self._match_prefix(path):
+            return True
+        return self._regex is not None and self._regex.match(path) is not None
+
+
+class PathFilter:
+    """
+    This class implements the filter of diff entries used by the parser.
+    A path is accepted if it matches at least one of the ``include`` rules
+    (if any) and none of the ``exclude`` rules. Entries with more than
+    ``max_lines`` changed lines (added plus deleted) are also rejected, as
+    they are usually generated files.
+
+    Renames are expanded into the old and the new path. They are accepted
+    if any of them is included and none of them is excluded.
+
+    The verdict of each distinct path is computed only once.
+    """
+
+    def __init__(self, include: list = None, exclude: list = None,
+                 max_lines: int = None) -> None:
+        self.include = PathRuleSet(include or [])
+        self.exclude = PathRuleSet(exclude or [])
+        self.max_lines = max_lines
+        self._cache = {}
+
+    def __bool__(self):
+        return bool(self.include) or bool(self.exclude) or self.max_lines is not None
+
+    def accept_path(self, path: str) -> bool:
+        ret = self._cache.get(path, None)
+        if ret is None:
+            paths = rename_paths(path)
+            ret = (not self.include or any(self.include.match(p) for p in paths)) and \
+                not any(self.exclude.match(p) for p in paths)
+            self._cache[path] = ret
+        return ret
+
+    def accept(self, path: str, added: int, deleted: int) -> bool:
+        """
+        Verifies if the given diff entry must be included.
+        """
+        if not self.accept_path(path):
+            return False
+        return self.max_lines is None or added + deleted <= self.max_lines
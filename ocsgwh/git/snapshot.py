@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import timezone, timedelta
+from pathlib import Path
+from .model import *
+
+# The snapshot file is composed by a header followed by a sequence of
+# fixed-width arrays in native byte order. Each section is aligned to 8
+# bytes. The sections are, in order:
+#
+# ```
+# commit_ts        int64[commits]      Commit timestamp (seconds since epoch)
+# commit_tz        int32[commits]      UTC offset of the timestamp in seconds
+# commit_author    uint32[commits]     Identity index
+# commit_entries   uint32[commits + 1] First entry of each commit
+# commit_parents   uint32[commits + 1] First parent of each commit
+# entry_path       uint32[entries]     Path index
+# entry_added      uint32[entries]
+# entry_deleted    uint32[entries]
+# entry_updates    uint32[entries]
+# entry_binary     uint8[entries]
+# commit_ids       bytes[commits * id_size]
+# parent_ids       bytes[parents * id_size]
+# emails           string table[identities]
+# names            string table[identities]
+# paths            string table[paths]
+# ```
+#
+# Each string table is composed by an uint32[count + 1] offset array followed
+# by the UTF-8 encoded strings. The identities are stored in order of first
+# appearance in the log.
+#
+# The header holds an opaque scope string (up to 64 ASCII characters) that
+# identifies the options used to create the log.
+SNAPSHOT_MAGIC = b'OCSGWHS2'
+SNAPSHOT_HEADER = struct.Struct('<8s8sIIIIII64s')
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class _StringTableBuilder:
+
+    def __init__(self) -> None:
+        self._index = {}
+        self.offsets = array('I', [0])
+        self.data = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def add(self, s) -> int:
+        id = self._index.get(s, None)
+        if id is None:
+            id = len(self._index)
+            self._index[s] = id
+            self.data += s.encode('utf-8')
+            self.offsets.append(len(self.data))
+        return id
+
+    def append(self, s: str):
+        self.data += s.encode('utf-8')
+        self.offsets.append(len(self.data))
+
+
+class _StringTable:
+
+    def __init__(self, offsets: memoryview, data: memoryview) -> None:
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return str(self._data[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+
+def save_snapshot(log: GitLog, file: Path, scope: str = ''):
+    """
+    Saves the given ``GitLog`` into a snapshot file. ``scope`` identifies
+    the options used to create the log, it is returned by
+    ``GitLogSnapshot.scope``.
+
+    The snapshot is written into a temporary file that replaces the target
+    only when it is complete, thus the file may be the one that backs the
+    log itself.
+    """
+    commit_ts = array('q')
+    commit_tz = array('i')
+    commit_author = array('I')
+    commit_entries = array('I', [0])
+    commit_parents = array('I', [0])
+    entry_path = array('I')
+    entry_added = array('I')
+    entry_deleted = array('I')
+    entry_updates = array('I')
+    entry_binary = array('B')
+    commit_ids = bytearray()
+    parent_ids = bytearray()
+    identities = {}
+    emails = _StringTableBuilder()
+    names = _StringTableBuilder()
+    paths = _StringTableBuilder()
+    id_size = len(bytes.fromhex(log[0].id)) if log else 20
+
+    for c in log:
+        author = identities.get(c.author, None)
+        if author is None:
+            author = len(identities)
+            identities[c.author] = author
+            emails.append(c.author.email)
+            names.append(c.author.name)
+        commit_ts.append(int(c.timestamp.timestamp()))
+        commit_tz.append(int(c.timestamp.utcoffset().total_seconds()))
+        commit_author.append(author)
+        commit_ids += bytes.fromhex(c.id)
+        for p in c.parents:
+            parent_ids += bytes.fromhex(p)
+        commit_parents.append(commit_parents[-1] + len(c.parents))
+        for d in c.diff:
+            entry_path.append(paths.add(d.file_name))
+            entry_added.append(d.added)
+            entry_deleted.append(d.deleted)
+            entry_updates.append(d.update_count)
+            entry_binary.append(int(d.binary))
+        commit_entries.append(len(entry_path))
+
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, sys.byteorder.encode('ascii'), id_size, len(log),
+        len(entry_path), len(parent_ids) // id_size, len(identities), len(paths),
+        scope.encode('ascii'))
+    sections = [commit_ts, commit_tz, commit_author, commit_entries,
+                commit_parents, entry_path, entry_added, entry_deleted,
+                entry_updates, entry_binary, commit_ids, parent_ids,
+                emails.offsets, emails.data, names.offsets, names.data,
+                paths.offsets, paths.data]
+    tmp_file = Path(file).with_name(Path(file).name + '.tmp')
+    try:
+        with open(tmp_file, 'wb') as outp:
+            outp.write(header)
+            offset = len(header)
+            for s in sections:
+                padding = _align(offset) - offset
+                outp.write(b'\0' * padding)
+                data = bytes(s) if isinstance(s, bytearray) else s.tobytes()
+                outp.write(data)
+                offset += padding + len(data)
+        os.replace(tmp_file, file)
+    except:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+class GitLogSnapshot:
+    """
+    This class implements a read-only sequence of ``GitCommit`` backed by
+    a memory-mapped snapshot file. The commits are materialized only when
+    they are accessed and are kept for the next accesses.
+
+    The file remains mapped until ``close()`` is called. Commits that were
+    already materialized remain valid after it.
+    """
+
+    def __init__(self, file: Path) -> None:
+        with open(file, 'rb') as inp:
+            self._mmap = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            self._load(file)
+        except:
+            self.close()
+            raise
+
+    def _load(self, file: Path):
+        buff = memoryview(self._mmap)
+        self._views.append(buff)
+        if len(buff) < SNAPSHOT_HEADER.size:
+            raise ValueError(f'"{file}" is not a valid snapshot.')
+        magic, byteorder, self._id_size, commits, entries, parents, identities, paths, scope = \
+            SNAPSHOT_HEADER.unpack_from(buff)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f'"{file}" is not a valid snapshot.')
+        if byteorder.rstrip(b'\0') != sys.byteorder.encode('ascii'):
+            raise ValueError(
+                f'"{file}" was created on a platform with a different byte order.')
+        self.scope = scope.rstrip(b'\0').decode('ascii')
+        self._offset = SNAPSHOT_HEADER.size
+        self._buff = buff
+        self._ts = self._section('q', commits)
+        self._tz = self._section('i', commits)
+        self._author = self._section('I', commits)
+        self._entries = self._section('I', commits + 1)
+        self._parents = self._section('I', commits + 1)
+        self._entry_path = self._section('I', entries)
+        self._entry_added = self._section('I', entries)
+        self._entry_deleted = self._section('I', entries)
+        self._entry_updates = self._section('I', entries)
+        self._entry_binary = self._section('B', entries)
+        self._commit_ids = self._section('B', commits * self._id_size)
+        self._parent_ids = self._section('B', parents * self._id_size)
+        self._emails = self._string_table(identities)
+        self._names = self._string_table(identities)
+        self._paths = self._string_table(paths)
+        self._commits = [None] * commits
+
+    def _section(self, format: str, count: int) -> memoryview:
+        start = _align(self._offset)
+        end = start + struct.calcsize(format) * count
+        if end > len(self._buff):
+            raise ValueError('Truncated snapshot file.')
+        self._offset = end
+        view = self._buff[start:end].cast(format)
+        self._views.append(view)
+        return view
+
+    def close(self):
+        """
+        Releases the views of the file and unmaps it.
+        """
+        if self._mmap is None:
+            return
+        for v in reversed(self._views):
+            v.release()
+        self._views = []
+        self._mmap.close()
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _string_table(self, count: int) -> _StringTable:
+        offsets = self._section('I', count + 1)
+        data = self._section('B', offsets[-1])
+        return _StringTable(offsets, data)
+
+    def _get_id(self, ids: memoryview, index: int) -> str:
+        return ids[index * self._id_size:(index + 1) * self._id_size].hex()
+
+    @property
+    def identities(self) -> list:
+        """
+        Returns the list of ``GitAuthor`` in order of first appearance.
+        """
+        return [GitAuthor(self._emails[i], self._names[i]) for i in range(len(self._emails))]
+
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def __getitem__(self, index: int) -> GitCommit:
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('Commit index out of range.')
+        commit = self._commits[index]
+        if commit is None:
+            commit = self._decode(index)
+            self._commits[index] = commit
+        return commit
+
+    def author_indexes(self, authors) -> list:
+        """
+        Returns the indexes of the commits of the given ``GitAuthor``
+        identities. Only the author column is read.
+        """
+        identities = set(i for i in range(len(self._emails))
+                         if GitAuthor(self._emails[i], self._names[i]) in authors)
+        return [i for i, a in enumerate(self._author) if a in identities]
+
+    def _decode(self, index: int) -> GitCommit:
+        author = self._author[index]
+        entries = []
+        for e in range(self._entries[index], self._entries[index + 1]):
+            entries.append(GitDiffEntry(self._paths[self._entry_path[e]],
+                                        self._entry_added[e], self._entry_deleted[e],
+                                        self._entry_updates[e], bool(self._entry_binary[e])))
+        parents = [self._get_id(self._parent_ids, p)
+                   for p in range(self._parents[index], self._parents[index + 1])]
+        tz = timezone(timedelta(seconds=self._tz[index]))
+        return GitCommit(self._get_id(self._commit_ids, index), parents,
+                         datetime.fromtimestamp(self._ts[index], tz),
+                         GitAuthor(self._emails[author], self._names[author]),
+                         GitDiff(entries))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class SnapshotGitLog(GitLog):
+    """
+    This class implements a ``GitLog`` backed by a ``GitLogSnapshot``. The
+    list of authors is computed from the identity table of the snapshot, thus
+    no commit is materialized until the log is iterated.
+    """
+
+    def __init__(self, snapshot: GitLogSnapshot) -> None:
+        self._commits = snapshot
+        self._update_authors(snapshot.identities)
+
+    @property
+    def scope(self) -> str:
+        return self._commits.scope
+
+    def by_author_name(self, author: GitAuthorName):
+        return GitLog([self._commits[i] for i in self._commits.author_indexes(author)])
+
+    def close(self):
+        self._commits.close()
+
+
+def load_snapshot(file: Path) -> GitLog:
+    """
+    Loads a ``GitLog`` from a snapshot file created by ``save_snapshot()``.
+    """
+    return SnapshotGitLog(GitLogSnapshot(file))
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import json
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from .model import *
+
+# Version of the schema of the commits and diff entries. Stores created with
+# other versions have these tables created again.
+STORE_VERSION = '2'
+
+SETTINGS_SCHEMA = '''CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL)'''
+
+# The schema of the commit store. The diff entries are stored in a separate
+# table that references both the commit and the path by their row ids. The
+# indexes cover the columns used by the aggregation queries.
+STORE_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS authors (
+        id INTEGER PRIMARY KEY,
+        email TEXT NOT NULL,
+        name TEXT NOT NULL,
+        UNIQUE(email, name))''',
+    '''CREATE TABLE IF NOT EXISTS paths (
+        id INTEGER PRIMARY KEY,
+        path TEXT NOT NULL UNIQUE)''',
+    '''CREATE TABLE IF NOT EXISTS commits (
+        id INTEGER PRIMARY KEY,
+        hash TEXT NOT NULL UNIQUE,
+        author_id INTEGER NOT NULL REFERENCES authors(id))''',
+    '''CREATE TABLE IF NOT EXISTS diff_entries (
+        commit_id INTEGER NOT NULL REFERENCES commits(id),
+        path_id INTEGER NOT NULL REFERENCES paths(id),
+        added INTEGER NOT NULL,
+        deleted INTEGER NOT NULL,
+        binary INTEGER NOT NULL)''',
+    '''CREATE TABLE IF NOT EXISTS patch_ids (
+        hash TEXT PRIMARY KEY,
+        patch_id TEXT NOT NULL)''',
+    'CREATE INDEX IF NOT EXISTS commits_author_idx ON commits(author_id)',
+    'CREATE INDEX IF NOT EXISTS diff_entries_commit_idx ON diff_entries(commit_id)',
+    'CREATE INDEX IF NOT EXISTS diff_entries_path_idx ON diff_entries(path_id)',
+]
+
+
+class GitLogStore:
+    """
+    This class implements a commit store backed by a SQLite database. It
+    keeps the diff entries of the parsed commits across multiple runs and
+    computes the per-file aggregates of the reports with SQL queries.
+
+    The reports still load the whole log into memory to compute the charts,
+    thus the store does not reduce the memory usage of a run.
+
+    The queries may be called by multiple threads at the same time.
+    """
+
+    def __init__(self, db_file: Path) -> None:
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._lock = Lock()
+        self._conn.execute(SETTINGS_SCHEMA)
+        if self.get_setting('version') != STORE_VERSION:
+            with self._conn:
+                self._conn.execute('DROP TABLE IF EXISTS diff_entries')
+                self._conn.execute('DROP TABLE IF EXISTS commits')
+        for s in STORE_SCHEMA:
+            self._conn.execute(s)
+        self._conn.commit()
+        self.set_setting('version', STORE_VERSION)
+        self._author_ids = {}
+        self._path_ids = {}
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM commits').fetchone()[0]
+
+    def __contains__(self, commit_id: str) -> bool:
+        return self._conn.execute('SELECT 1 FROM commits WHERE hash = ?',
+                                  (commit_id,)).fetchone() is not None
+
+    def _get_author_id(self, author: GitAuthor) -> int:
+        key = (author.email, author.name)
+        id = self._author_ids.get(key, None)
+        if id is None:
+            self._conn.execute(
+                'INSERT OR IGNORE INTO authors(email, name) VALUES (?, ?)', key)
+            id = self._conn.execute(
+                'SELECT id FROM authors WHERE email = ? AND name = ?', key).fetchone()[0]
+            self._author_ids[key] = id
+        return id
+
+    def _get_path_id(self, path: str) -> int:
+        id = self._path_ids.get(path, None)
+        if id is None:
+            self._conn.execute(
+                'INSERT OR IGNORE INTO paths(path) VALUES (?)', (path,))
+            id = self._conn.execute(
+                'SELECT id FROM paths WHERE path = ?', (path,)).fetchone()[0]
+            self._path_ids[path] = id
+        return id
+
+    def get_setting(self, name: str) -> str:
+        row = self._conn.execute('SELECT value FROM settings WHERE name = ?',
+                                 (name,)).fetchone()
+        return row[0] if row is not None else None
+
+    def set_setting(self, name: str, value: str):
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO settings(name, value) VALUES (?, ?)', (name, value))
+
+    def set_scope(self, scope: str) -> bool:
+        """
+        Sets the fingerprint of the options used to parse the commits (e.g.
+        the path filters). The stored commits are removed if it differs from
+        the one used to parse them, as their diffs would be outdated. The
+        patch ids do not depend on these options, thus they are kept.
+
+        Returns True if the commits were removed.
+        """
+        current = self.get_setting('scope')
+        if current == scope:
+            return False
+        with self._conn:
+            self._conn.execute('DELETE FROM diff_entries')
+            self._conn.execute('DELETE FROM commits')
+        self.set_setting('scope', scope)
+        return current is not None
+
+    def commit_ids(self) -> set:
+        """
+        Returns the set of commit hashes already present in this store.
+        """
+        return set(r[0] for r in self._conn.execute('SELECT hash FROM commits'))
+
+    def add_commits(self, commits) -> int:
+        """
+        Adds the given commits to the store. Commits that are already in the
+        store are ignored.
+
+        Returns the number of commits actually added.
+        """
+        known = self.commit_ids()
+        count = 0
+        with self._conn:
+            for c in commits:
+                if c.id in known:
+                    continue
+                known.add(c.id)
+                cur = self._conn.execute(
+                    'INSERT INTO commits(hash, author_id) VALUES (?, ?)',
+                    (c.id, self._get_author_id(c.author)))
+                commit_id = cur.lastrowid
+                self._conn.executemany(
+                    'INSERT INTO diff_entries(commit_id, path_id, added, deleted, binary) VALUES (?, ?, ?, ?, ?)',
+                    [(commit_id, self._get_path_id(d.file_name), d.added, d.deleted, int(d.binary))
+                     for d in c.diff])
+                count += 1
+        return count
+
+    def prune(self, commit_ids: set) -> int:
+        """
+        Removes all commits that are not in the given set of commit hashes.
+        It is used to drop commits that are no longer reachable in the
+        repository (e.g.: after a force push).
+
+        Returns the number of commits removed.
+        """
+        stale = [(h,) for h in self.commit_ids() if h not in commit_ids]
+        with self._conn:
+            for h in stale:
+                self._conn.execute(
+                    'DELETE FROM diff_entries WHERE commit_id IN (SELECT id FROM commits WHERE hash = ?)', h)
+                self._conn.execute('DELETE FROM commits WHERE hash = ?', h)
+        return len(stale)
+
+    def _find_author_ids(self, authors: list) -> list:
+        """
+        Returns the ids of the given list of ``GitAuthor``. Authors that are
+        not in the store are ignored.
+        """
+        ret = []
+        for a in authors:
+            key = (a.email, a.name)
+            id = self._author_ids.get(key, None)
+            if id is None:
+                row = self._conn.execute(
+                    'SELECT id FROM authors WHERE email = ? AND name = ?', key).fetchone()
+                if row is None:
+                    continue
+                id = row[0]
+                self._author_ids[key] = id
+            ret.append(id)
+        return ret
+
+    def patch_ids(self) -> dict:
+        """
+        Returns the cached patch ids as a dictionary that maps the commit
+        hashes into their patch ids.
+        """
+        return dict(self._conn.execute('SELECT hash, patch_id FROM patch_ids'))
+
+    def add_patch_ids(self, patch_ids: dict):
+        """
+        Adds the given patch ids to the cache. Known commits are ignored.
+        """
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO patch_ids(hash, patch_id) VALUES (?, ?)',
+                patch_ids.items())
+
+    def diff_by_file(self, authors: list = None) -> GitDiff:
+        """
+        Computes the aggregated diff of all commits in the store, optionally
+        restricted to the given list of ``GitAuthor``. The result is equivalent
+        to the one produced by adding all commit diffs into a ``GitDiffBuilder``.
+        """
+        query = '''SELECT p.path, SUM(d.added), SUM(d.deleted), COUNT(*), MAX(d.binary)
+                   FROM diff_entries d
+                   JOIN paths p ON p.id = d.path_id
+                   JOIN commits c ON c.id = d.commit_id
+                   {}
+                   GROUP BY d.path_id
+                   ORDER BY p.path'''
+        with self._lock:
+            if authors is None:
+                rows = self._conn.execute(query.format('')).fetchall()
+            else:
+                # The ids are passed as a single JSON array, as authors may
+                # have more identities than the parameters accepted by SQLite.
+                ids = json.dumps(self._find_author_ids(authors))
+                rows = self._conn.execute(query.format(
+                    'WHERE c.author_id IN (SELECT value FROM json_each(?))'), (ids,)).fetchall()
+        return GitDiff([GitDiffEntry(path, added, deleted, count, bool(binary))
+                        for path, added, deleted, count, binary in rows])
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+import tempfile
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+from .blame import *
+from . import blame
+
+SAMPLE_BLAME = '''1111111111111111111111111111111111111111 1 1 2
+author Alan Turing
+author-mail <aturing@email.com>
+author-time 1600000000
+author-tz +0000
+summary first
+boundary
+filename a.txt
+2222222222222222222222222222222222222222 3 3 1
+author Ada Lovelace
+author-mail <ada@email.com>
+author-time 1600000001
+author-tz +0000
+summary second
+previous 1111111111111111111111111111111111111111 a.txt
+filename a.txt
+1111111111111111111111111111111111111111 4 4 3
+filename a.txt
+'''
+
+TURING = GitAuthor('aturing@email.com', 'Alan Turing')
+ADA = GitAuthor('ada@email.com', 'Ada Lovelace')
+
+
+class TestFunctions(unittest.TestCase):
+
+    def test_parse_blame_incremental(self):
+        self.assertEqual(parse_blame_incremental(SAMPLE_BLAME), {TURING: 5, ADA: 1})
+        self.assertEqual(parse_blame_incremental(''), {})
+
+
+class TestBlameCache(unittest.TestCase):
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_file = Path(tmp) / BLAME_CACHE_FILE_NAME
+            cache = BlameCache(cache_file)
+            self.assertIsNone(cache.get('1', 'a.txt'))
+            cache.put('1', 'a.txt', {TURING: 5, ADA: 1})
+            cache.put('2', 'b.txt', {ADA: 2})
+            self.assertEqual(cache.get('1', 'a.txt'), {TURING: 5, ADA: 1})
+            self.assertIsNone(cache.get('1', 'b.txt'))
+            cache.save([('1', 'a.txt')])
+
+            cache = BlameCache(cache_file)
+            self.assertEqual(cache.get('1', 'a.txt'), {TURING: 5, ADA: 1})
+            self.assertIsNone(cache.get('2', 'b.txt'))
+
+            cache_file.write_text('invalid')
+            self.assertIsNone(BlameCache(cache_file).get('1', 'a.txt'))
+
+    def test_no_file(self):
+        cache = BlameCache()
+        cache.put('1', 'a.txt', {ADA: 2})
+        cache.put('2', 'b.txt', {ADA: 1})
+        # Nothing is saved without a file but the entries are pruned
+        cache.save([('1', 'a.txt')])
+        self.assertEqual(cache.get('1', 'a.txt'), {ADA: 2})
+        self.assertIsNone(cache.get('2', 'b.txt'))
+
+
+class TestBlameTree(unittest.TestCase):
+
+    def git(self, name: str, email: str, *args):
+        subprocess.run(['git', '-c', f'user.name={name}', '-c', f'user.email={email}',
+                        *args], cwd=self.repo_dir, check=True, capture_output=True)
+
+    def commit(self, author: GitAuthor, file_name: str, content):
+        f = self.repo_dir / file_name
+        if isinstance(content, bytes):
+            f.write_bytes(content)
+        else:
+            f.write_text(content)
+        self.git(author.name, author.email, 'add', file_name)
+        self.git(author.name, author.email, 'commit', '-m', file_name)
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.repo_dir = Path(self.tmp_dir.name)
+        self.git(TURING.name, TURING.email, 'init', '-q')
+        self.commit(TURING, 'a.txt', 'a\nb\nc\n')
+        self.commit(ADA, 'a.txt', 'a\nB\nc\nd\n')
+        self.commit(ADA, 'b c.txt', 'x\n')
+        self.commit(ADA, 'image.png', b'\x00\x01\x02')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_run_git_text_blobs(self):
+        blobs = run_git_text_blobs(self.repo_dir)
+        self.assertEqual(sorted(path for id, path in blobs), ['a.txt', 'b c.txt'])
+        self.assertTrue(all(len(id) == 40 for id, path in blobs))
+        blobs = run_git_text_blobs(self.repo_dir, paths=['b*'])
+        self.assertEqual([path for id, path in blobs], ['b c.txt'])
+
+    def test_run_git_tree_blobs(self):
+        blobs = run_git_tree_blobs(self.repo_dir)
+        self.assertEqual(sorted(path for id, path in blobs), ['a.txt', 'b c.txt', 'image.png'])
+
+    def test_blame_tree(self):
+        blobs = run_git_text_blobs(self.repo_dir)
+        cache = BlameCache()
+        result = blame_tree(self.repo_dir, blobs, cache, 2)
+        self.assertEqual(result, {'a.txt': {TURING: 2, ADA: 2}, 'b c.txt': {ADA: 1}})
+        # Cached files are not blamed again
+        with patch.object(blame, 'run_git_blame') as run:
+            self.assertEqual(blame_tree(self.repo_dir, blobs, cache, 2), result)
+            run.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
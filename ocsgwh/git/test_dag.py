@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+from datetime import datetime, timezone
+from .dag import *
+from .model import GitAuthor, GitCommit, GitDiff, GitLog
+
+AUTHOR = GitAuthor('alice@example.com', 'Alice')
+
+
+def create_commit(id: str, parents: list, day: int) -> GitCommit:
+    return GitCommit(id, parents, datetime(2021, 1, day, tzinfo=timezone.utc),
+                     AUTHOR, GitDiff([]))
+
+
+def get_sample_commits() -> list:
+    # a - b - c ----- g - h   (main)
+    #      \         /
+    #       d - e - f         (feature)
+    #            \
+    #             i           (other)
+    return [
+        create_commit('a', [], 1),
+        create_commit('b', ['a'], 2),
+        create_commit('c', ['b'], 3),
+        create_commit('d', ['b'], 4),
+        create_commit('e', ['d'], 5),
+        create_commit('f', ['e'], 6),
+        create_commit('g', ['c', 'f'], 7),
+        create_commit('h', ['g'], 8),
+        create_commit('i', ['e'], 9),
+    ]
+
+
+class TestCommitDAG(unittest.TestCase):
+
+    def setUp(self):
+        self.dag = CommitDAG(get_sample_commits())
+
+    def n(self, id):
+        return self.dag.node(id)
+
+    def test_init(self):
+        dag = self.dag
+        self.assertEqual(9, len(dag))
+        self.assertIn('g', dag)
+        self.assertNotIn('z', dag)
+        self.assertEqual(0, dag.node('a'))
+        self.assertEqual('g', dag.ids[dag.node('g')])
+        self.assertEqual([self.n('c'), self.n('f')], list(dag.node_parents(self.n('g'))))
+        self.assertEqual(self.n('c'), dag.first_parent(self.n('g')))
+        self.assertEqual(NO_PARENT, dag.first_parent(self.n('a')))
+
+    def test_init_missing_parents(self):
+        dag = CommitDAG(get_sample_commits()[3:])
+        self.assertEqual(NO_PARENT, dag.first_parent(dag.node('d')))
+        self.assertEqual([dag.node('f')], list(dag.node_parents(dag.node('g'))))
+
+    def test_topological_order(self):
+        order = list(self.dag.topological_order())
+        self.assertEqual(len(self.dag), len(order))
+        self.assertEqual(set(range(len(self.dag))), set(order))
+        position = {n: i for i, n in enumerate(order)}
+        for n in range(len(self.dag)):
+            for p in self.dag.node_parents(n):
+                self.assertLess(position[n], position[p])
+        self.assertIs(self.dag.topological_order(), self.dag.topological_order())
+
+    def test_generations(self):
+        g = self.dag.generations()
+        self.assertEqual(1, g[self.n('a')])
+        self.assertEqual(3, g[self.n('c')])
+        self.assertEqual(6, g[self.n('g')])
+        self.assertEqual(7, g[self.n('h')])
+        self.assertEqual(5, g[self.n('i')])
+
+    def test_first_parent_chain(self):
+        self.assertEqual([self.n(x) for x in 'hgcba'],
+                         self.dag.first_parent_chain(self.n('h')))
+        self.assertEqual([self.n('a')], self.dag.first_parent_chain(self.n('a')))
+
+    def test_ancestors(self):
+        marks = self.dag.ancestors(self.n('f'))
+        self.assertEqual(set('abdef'), set(id for id, m in zip(self.dag.ids, marks) if m))
+
+    def test_is_ancestor(self):
+        dag = self.dag
+        self.assertTrue(dag.is_ancestor(self.n('a'), self.n('h')))
+        self.assertTrue(dag.is_ancestor(self.n('f'), self.n('h')))
+        self.assertTrue(dag.is_ancestor(self.n('h'), self.n('h')))
+        self.assertFalse(dag.is_ancestor(self.n('h'), self.n('a')))
+        self.assertFalse(dag.is_ancestor(self.n('c'), self.n('f')))
+        self.assertFalse(dag.is_ancestor(self.n('i'), self.n('h')))
+
+    def test_merge_bases(self):
+        dag = self.dag
+        self.assertEqual([self.n('b')], dag.merge_bases(self.n('c'), self.n('f')))
+        self.assertEqual([self.n('e')], dag.merge_bases(self.n('h'), self.n('i')))
+        self.assertEqual([self.n('f')], dag.merge_bases(self.n('f'), self.n('h')))
+        self.assertEqual(self.n('b'), dag.merge_base(self.n('c'), self.n('i')))
+
+    def test_merge_bases_criss_cross(self):
+        # x and y are both best merge bases of m1 and m2.
+        dag = CommitDAG([
+            create_commit('r', [], 1),
+            create_commit('x', ['r'], 2),
+            create_commit('y', ['r'], 3),
+            create_commit('m1', ['x', 'y'], 4),
+            create_commit('m2', ['y', 'x'], 5)])
+        self.assertEqual({dag.node('x'), dag.node('y')},
+                         set(dag.merge_bases(dag.node('m1'), dag.node('m2'))))
+
+    def test_merge_base_none(self):
+        dag = CommitDAG([create_commit('a', [], 1), create_commit('b', [], 2)])
+        self.assertEqual([], dag.merge_bases(0, 1))
+        self.assertEqual(NO_PARENT, dag.merge_base(0, 1))
+
+    def test_git_log_dag(self):
+        log = GitLog(get_sample_commits())
+        self.assertIs(log.dag, log.dag)
+        self.assertEqual(len(log), len(log.dag))
+        self.assertEqual(log[0].id, log.dag.ids[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see < https: // www.gnu.org/licenses/>.
 import unittest
+from datetime import datetime, timezone
 from .model import *
 from .test_parser import get_sample_log
 
@@ -488,6 +489,36 @@ class TestGitLog(unittest.TestCase):
             self.assertGreaterEqual(c.timestamp.date(), start_date)
             self.assertLess(c.timestamp.date(), end_date)
 
+    def test_deduplicate(self):
+        author = GitAuthor('alice@email.com', 'Alice')
+
+        def commit(id, parents, day):
+            return GitCommit(id, parents, datetime(2021, 1, day, tzinfo=timezone.utc),
+                             author, GitDiff([]))
+        # c is a copy of a and d is a copy of b.
+        src = GitLog([commit('r', [], 1), commit('a', ['r'], 2), commit('b', ['r'], 3),
+                      commit('c', ['b'], 4), commit('d', ['c'], 5), commit('e', ['d'], 6)])
+        self.assertEqual(src.deduplicate({}), (src, {}))
+        l, replaced = src.deduplicate({'a': 'p1', 'b': 'p2', 'c': 'p1', 'd': 'p2'})
+        self.assertEqual([c.id for c in l], ['r', 'a', 'b', 'e'])
+        self.assertEqual(l[3].parents, ['b'])
+        self.assertEqual(l[2].parents, ['r'])
+        self.assertEqual(replaced, {'c': 'a', 'd': 'b'})
+
+    def test_deduplicate_ties(self):
+        author = GitAuthor('alice@email.com', 'Alice')
+        ts = datetime(2021, 1, 2, tzinfo=timezone.utc)
+        # The copies keep the timestamp of the original commit. The copy
+        # listed first is deeper in the history.
+        src = GitLog([GitCommit('x', ['y'], ts, author, GitDiff([])),
+                      GitCommit('a', ['r'], ts, author, GitDiff([])),
+                      GitCommit('y', ['r'], ts, author, GitDiff([])),
+                      GitCommit('r', [], datetime(2021, 1, 1, tzinfo=timezone.utc),
+                                author, GitDiff([]))])
+        l, replaced = src.deduplicate({'a': 'p1', 'x': 'p1'})
+        self.assertEqual(replaced, {'x': 'a'})
+        self.assertEqual(set(c.id for c in l), set(['r', 'a', 'y']))
+
 
 def get_sample_git_log():
     """
@@ -33,6 +33,14 @@ class TestFunctions(unittest.TestCase):
         self.assertRaises(ValueError, parse_iso_date,
                           '2021-01-21 14:24:07-03:00')
 
+    def test_git_log_arguments(self):
+        self.assertEqual(git_log_arguments(), ['--all'])
+        self.assertEqual(git_log_arguments(['main', 'v1.0..v2.0'], '2021-01-01', '1 week ago',
+                                           ['src', '*.py']),
+                         ['main', 'v1.0..v2.0', '--since=2021-01-01', '--until=1 week ago',
+                          '--', 'src', '*.py'])
+        self.assertEqual(git_log_command(git_log_arguments()), GIT_LOG_COMMAND)
+
     def test_run_into_myself(self):
         s = run_git_log(ROOT_DIR)
 
@@ -104,6 +112,19 @@ class TestGitCommitParser(unittest.TestCase):
         self.assertEqual(d[1].added, 8)
         self.assertEqual(d[1].deleted, 12)
 
+    def test__parse_diff_filtered(self):
+        p = GitCommitParser(PathFilter(exclude=['vendor', '*.lock'], max_lines=10))
+
+        d = p._parse_diff(iter([
+            '1\t2\tsrc/a.py',
+            '1\t2\tvendor/lib/b.py',
+            '1\t2\tCargo.lock',
+            '100\t2\tsrc/generated.py',
+            '-\t-\tvendor/c.png',
+            '-\t-\td.png',
+        ]))
+        self.assertEqual([e.file_name for e in d], ['d.png', 'src/a.py'])
+
     def test_parse_id(self):
         p = GitCommitParser()
 
@@ -328,5 +349,43 @@ class TestGitLogParser(unittest.TestCase):
         self.assertEqual(len(p), 67)
 
 
+class TestParallelGitLogParser(unittest.TestCase):
+
+    def test_split_log(self):
+        src = load_sample_file('log-sample.txt')
+        self.assertEqual(split_log(src, len(src)), [src])
+        self.assertEqual(split_log('', 10), [])
+
+        chunks = split_log(src, 100)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), src)
+        for c in chunks[1:]:
+            self.assertTrue(c.startswith(GIT_COMMIT_SEPARATOR + '\n'))
+
+    def test_parse_log_chunk(self):
+        src = load_sample_file('log-sample.txt')
+        p = GitCommitParser()
+        ret = [p.build(f) for f in parse_log_chunk(p, src)]
+        exp = get_sample_log()
+        self.assertEqual([c.id for c in ret], [c.id for c in exp])
+
+    def test_run(self):
+        for file in ['log-sample.txt', 'log-sample-defect.txt']:
+            src = load_sample_file(file)
+            p = ParallelGitLogParser(2, 1000)
+            self.assertTrue(p.run(src))
+            ret = p.result
+
+            exp = GitLogParser()
+            exp.run(src)
+            self.assertEqual(len(ret), len(exp.result))
+            for c1, c2 in zip(ret, exp.result):
+                self.assertEqual(c1.id, c2.id)
+                self.assertEqual(c1.parents, c2.parents)
+                self.assertEqual(c1.timestamp, c2.timestamp)
+                self.assertEqual(c1.author, c2.author)
+                self.assertEqual(list(c1.diff), list(c2.diff))
+
+
 if __name__ == '__main__':
     unittest.main()
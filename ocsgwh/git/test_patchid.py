@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+import tempfile
+import subprocess
+from pathlib import Path
+from .patchid import *
+from .parser import GitLogParser
+
+
+class TestPatchId(unittest.TestCase):
+
+    def git(self, *args) -> str:
+        return subprocess.run(['git', '-c', 'user.name=Alan Turing', '-c', 'user.email=aturing@email.com',
+                               *args], cwd=self.repo_dir, check=True, capture_output=True,
+                              encoding='utf-8').stdout
+
+    def commit(self, file_name: str, content: str) -> str:
+        (self.repo_dir / file_name).write_text(content)
+        self.git('add', file_name)
+        self.git('commit', '-m', file_name)
+        return self.git('rev-parse', 'HEAD').strip()
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.repo_dir = Path(self.tmp_dir.name)
+        self.git('init', '-q', '-b', 'main')
+        self.root = self.commit('a.txt', 'a\n')
+        self.git('checkout', '-q', '-b', 'other')
+        self.other = self.commit('b.txt', 'b\n')
+        self.git('checkout', '-q', 'main')
+        self.picked = self.commit('c.txt', 'c\n')
+        self.git('checkout', '-q', 'other')
+        self.git('cherry-pick', 'main')
+        self.copy = self.git('rev-parse', 'HEAD').strip()
+        parser = GitLogParser()
+        parser.run_git(self.repo_dir)
+        self.log = parser.build_git_log()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_find_candidates(self):
+        self.assertEqual(set(c.id for c in find_candidates(self.log)),
+                         set([self.picked, self.copy]))
+
+    def test_run_git_patch_ids(self):
+        ids = run_git_patch_ids(self.repo_dir, [self.root, self.other, self.picked, self.copy], 1)
+        # Root commits have no patch
+        self.assertEqual(set(ids), set([self.other, self.picked, self.copy]))
+        self.assertEqual(ids[self.picked], ids[self.copy])
+        self.assertNotEqual(ids[self.picked], ids[self.other])
+        self.assertEqual(run_git_patch_ids(self.repo_dir, []), {})
+
+    def test_compute_patch_ids(self):
+        cache = {}
+        ids = compute_patch_ids(self.repo_dir, self.log, cache)
+        self.assertEqual(set(ids), set([self.picked, self.copy]))
+        self.assertEqual(cache, ids)
+        # Cached results are not computed again
+        cache[self.copy] = 'cached'
+        ids = compute_patch_ids(self.repo_dir, self.log, cache)
+        self.assertEqual(ids[self.copy], 'cached')
+
+    def test_deduplicate(self):
+        log, replaced = self.log.deduplicate(compute_patch_ids(self.repo_dir, self.log, {}))
+        self.assertEqual(len(log), 3)
+        self.assertNotIn(self.copy, [c.id for c in log])
+        self.assertEqual(list(replaced), [self.copy])
+        self.assertIn(replaced[self.copy], [c.id for c in log])
+
+
+if __name__ == '__main__':
+    unittest.main()
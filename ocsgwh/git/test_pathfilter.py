@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+import pickle
+from .pathfilter import *
+
+
+class TestPathRuleSet(unittest.TestCase):
+
+    def test_empty(self):
+        r = PathRuleSet([])
+        self.assertFalse(r)
+        self.assertFalse(r.match('a'))
+
+    def test_match(self):
+        r = PathRuleSet(['vendor/', 'third_party/lib', 'package-lock.json',
+                         '*.lock', 'docs/*.md'])
+        self.assertTrue(r)
+        self.assertTrue(r.match('vendor/a.c'))
+        self.assertTrue(r.match('vendor/a/b.c'))
+        self.assertFalse(r.match('vendors/a.c'))
+        self.assertFalse(r.match('src/vendor/a.c'))
+        self.assertTrue(r.match('third_party/lib/a.c'))
+        self.assertFalse(r.match('third_party/other/a.c'))
+        self.assertTrue(r.match('package-lock.json'))
+        self.assertTrue(r.match('Cargo.lock'))
+        self.assertTrue(r.match('a/b/Cargo.lock'))
+        self.assertTrue(r.match('docs/a.md'))
+        self.assertFalse(r.match('src/a.md'))
+
+
+class TestPathFilter(unittest.TestCase):
+
+    def test_empty(self):
+        f = PathFilter()
+        self.assertFalse(f)
+        self.assertTrue(f.accept('a', 1000, 1000))
+
+    def test_accept(self):
+        f = PathFilter(include=['src', '*.md'], exclude=['src/gen'], max_lines=100)
+        self.assertTrue(f)
+        self.assertTrue(f.accept('src/a.c', 50, 50))
+        self.assertFalse(f.accept('src/a.c', 50, 51))
+        self.assertFalse(f.accept('src/gen/a.c', 1, 1))
+        self.assertTrue(f.accept('README.md', 1, 1))
+        self.assertFalse(f.accept('test/a.c', 1, 1))
+
+    def test_rename(self):
+        self.assertEqual(rename_paths('a/b.c'), ['a/b.c'])
+        self.assertEqual(rename_paths('{vendor => lib}/x.c'), ['vendor/x.c', 'lib/x.c'])
+        self.assertEqual(rename_paths('src/{a => b}/c.c'), ['src/a/c.c', 'src/b/c.c'])
+        self.assertEqual(rename_paths('src/{ => gen}/c.c'), ['src/c.c', 'src/gen/c.c'])
+        self.assertEqual(rename_paths('src/{a.c => b.c}'), ['src/a.c', 'src/b.c'])
+        self.assertEqual(rename_paths('a.c => b.c'), ['a.c', 'b.c'])
+
+        f = PathFilter(exclude=['vendor/', '*.lock'])
+        self.assertFalse(f.accept('{vendor => lib}/x.c', 1, 1))
+        self.assertFalse(f.accept('{lib => vendor}/x.c', 1, 1))
+        self.assertFalse(f.accept('{a.c => Cargo.lock}', 1, 1))
+        self.assertTrue(f.accept('{src => lib}/x.c', 1, 1))
+        f = PathFilter(include=['src'])
+        self.assertTrue(f.accept('{src => lib}/x.c', 1, 1))
+        self.assertTrue(f.accept('src/{a.c => b.c}', 1, 1))
+        self.assertFalse(f.accept('{test => lib}/x.c', 1, 1))
+
+    def test_pickle(self):
+        f = pickle.loads(pickle.dumps(PathFilter(exclude=['*.lock'])))
+        self.assertFalse(f.accept('Cargo.lock', 1, 1))
+        self.assertTrue(f.accept('a.c', 1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+import tempfile
+from .snapshot import *
+from .test_model import get_sample_git_log
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file = Path(self.tmp_dir.name) / 'log.snapshot'
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_load(self):
+        src = get_sample_git_log()
+        save_snapshot(src, self.file)
+        log = load_snapshot(self.file)
+
+        self.assertEqual(len(log), len(src))
+        self.assertEqual(log.authors, src.authors)
+        self.assertEqual(log.min_date, src.min_date)
+        self.assertEqual(log.max_date, src.max_date)
+        for c1, c2 in zip(src, log):
+            self.assertEqual(c1.id, c2.id)
+            self.assertEqual(c1.parents, c2.parents)
+            self.assertEqual(c1.timestamp, c2.timestamp)
+            self.assertEqual(c1.timestamp.utcoffset(),
+                             c2.timestamp.utcoffset())
+            self.assertEqual(c1.author, c2.author)
+            self.assertEqual(list(c1.diff), list(c2.diff))
+            for d1, d2 in zip(c1.diff, c2.diff):
+                self.assertEqual(d1.update_count, d2.update_count)
+                self.assertEqual(d1.binary, d2.binary)
+
+        for a in src.authors:
+            self.assertEqual(len(log.by_author_name(a)),
+                             len(src.by_author_name(a)))
+
+    def test_close(self):
+        src = get_sample_git_log()
+        save_snapshot(src, self.file)
+        with GitLogSnapshot(self.file) as snapshot:
+            commit = snapshot[0]
+        self.assertEqual(commit.id, src[0].id)
+        self.assertRaises(ValueError, lambda: snapshot[0])
+        snapshot.close()
+
+        log = load_snapshot(self.file)
+        self.assertEqual(len(log), len(src))
+        log.close()
+        # The file is no longer mapped, thus it may be replaced
+        save_snapshot(GitLog([]), self.file)
+        self.assertFalse(load_snapshot(self.file))
+
+    def test_cache(self):
+        src = get_sample_git_log()
+        save_snapshot(src, self.file)
+        log = load_snapshot(self.file)
+        self.assertIs(log[0], log[0])
+        self.assertEqual([c.id for c in log], [c.id for c in src])
+        self.assertIs(next(iter(log)), log[0])
+        for a in src.authors:
+            self.assertEqual([c.id for c in log.by_author_name(a)],
+                             [c.id for c in src.by_author_name(a)])
+        log.close()
+
+    def test_scope(self):
+        save_snapshot(get_sample_git_log(), self.file, 'abc')
+        log = load_snapshot(self.file)
+        self.assertEqual(log.scope, 'abc')
+        log.close()
+        save_snapshot(GitLog([]), self.file)
+        log = load_snapshot(self.file)
+        self.assertEqual(log.scope, '')
+        log.close()
+
+    def test_replace_loaded(self):
+        src = get_sample_git_log()
+        save_snapshot(src, self.file)
+        log = load_snapshot(self.file)
+        # Saving over the mapped file must not truncate it
+        save_snapshot(log, self.file)
+        self.assertEqual([c.id for c in log], [c.id for c in src])
+        log.close()
+        log = load_snapshot(self.file)
+        self.assertEqual(len(log), len(src))
+        log.close()
+        self.assertEqual(list(Path(self.tmp_dir.name).iterdir()), [self.file])
+
+    def test_empty(self):
+        save_snapshot(GitLog([]), self.file)
+        log = load_snapshot(self.file)
+        self.assertFalse(log)
+        self.assertFalse(log.authors)
+
+    def test_invalid(self):
+        with open(self.file, 'wb') as outp:
+            outp.write(b'not a snapshot' * 10)
+        self.assertRaises(ValueError, load_snapshot, self.file)
+
+        save_snapshot(get_sample_git_log(), self.file)
+        with open(self.file, 'r+b') as outp:
+            outp.truncate(100)
+        self.assertRaises(ValueError, load_snapshot, self.file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from .store import *
+from .test_parser import get_sample_log
+
+
+class TestGitLogStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_file = Path(self.tmp_dir.name) / 'store.db'
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_add_commits(self):
+        commits = get_sample_log()
+        with GitLogStore(self.db_file) as store:
+            self.assertEqual(len(store), 0)
+            self.assertEqual(store.add_commits(commits), len(commits))
+            self.assertEqual(len(store), len(commits))
+            self.assertTrue(commits[0].id in store)
+            self.assertEqual(store.add_commits(commits), 0)
+
+        # Reuse the database
+        with GitLogStore(self.db_file) as store:
+            self.assertEqual(len(store), len(commits))
+            self.assertEqual(store.add_commits(commits[:10]), 0)
+
+    def test_diff_by_file(self):
+        src = GitLog(get_sample_log())
+        with GitLogStore(self.db_file) as store:
+            store.add_commits(src)
+
+            b = GitDiffBuilder()
+            for c in src:
+                b.add_diff(c.diff)
+            exp = b.build()
+            diff = store.diff_by_file()
+            self.assertEqual(list(diff), list(exp))
+            for d1, d2 in zip(diff, exp):
+                self.assertEqual(d1.update_count, d2.update_count)
+                self.assertEqual(d1.binary, d2.binary)
+
+            for a in src.authors:
+                b = GitDiffBuilder()
+                for c in src.by_author_name(a):
+                    b.add_diff(c.diff)
+                self.assertEqual(list(store.diff_by_file(a.authors)),
+                                 list(b.build()))
+            self.assertFalse(store.diff_by_file([]))
+
+            # More identities than the parameters accepted by SQLite
+            identities = [GitAuthor(f'{i}@email.com', 'Someone') for i in range(40000)]
+            for a in src.authors:
+                self.assertEqual(list(store.diff_by_file(identities + a.authors)),
+                                 list(store.diff_by_file(a.authors)))
+
+    def test_prune(self):
+        commits = get_sample_log()
+        with GitLogStore(self.db_file) as store:
+            store.add_commits(commits)
+            keep = set(c.id for c in commits[10:])
+            self.assertEqual(store.prune(keep), 10)
+            self.assertEqual(store.commit_ids(), keep)
+            self.assertEqual(sum(d.update_count for d in store.diff_by_file()),
+                             sum(len(c.diff) for c in commits[10:]))
+
+    def test_diff_by_file_threads(self):
+        src = GitLog(get_sample_log())
+        with GitLogStore(self.db_file) as store:
+            store.add_commits(src)
+            exp = {a.name: list(store.diff_by_file(a.authors)) for a in src.authors}
+            with ThreadPoolExecutor(8) as executor:
+                for i in range(5):
+                    results = executor.map(lambda a: (a.name, list(store.diff_by_file(a.authors))),
+                                           src.authors * 4)
+                    for name, diff in results:
+                        self.assertEqual(diff, exp[name])
+
+    def test_version(self):
+        commits = get_sample_log()
+        with GitLogStore(self.db_file) as store:
+            store.add_commits(commits)
+            store.add_patch_ids({'a': 'p1'})
+            store.set_setting('version', '1')
+        # The commits of other versions are dropped
+        with GitLogStore(self.db_file) as store:
+            self.assertEqual(len(store), 0)
+            self.assertEqual(store.patch_ids(), {'a': 'p1'})
+            self.assertEqual(store.get_setting('version'), STORE_VERSION)
+
+    def test_set_scope(self):
+        commits = get_sample_log()
+        with GitLogStore(self.db_file) as store:
+            self.assertFalse(store.set_scope('a'))
+            store.add_commits(commits)
+            store.add_patch_ids({'a': 'p1'})
+            self.assertFalse(store.set_scope('a'))
+            self.assertEqual(len(store), len(commits))
+        with GitLogStore(self.db_file) as store:
+            self.assertTrue(store.set_scope('b'))
+            self.assertEqual(len(store), 0)
+            self.assertFalse(store.diff_by_file())
+            self.assertEqual(store.patch_ids(), {'a': 'p1'})
+            self.assertEqual(store.add_commits(commits), len(commits))
+
+    def test_patch_ids(self):
+        with GitLogStore(self.db_file) as store:
+            self.assertEqual(store.patch_ids(), {})
+            store.add_patch_ids({'a': 'p1', 'b': ''})
+            store.add_patch_ids({'a': 'p2', 'c': 'p3'})
+        with GitLogStore(self.db_file) as store:
+            self.assertEqual(store.patch_ids(), {'a': 'p1', 'b': '', 'c': 'p3'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,6 +17,8 @@
 # along with this program.  If not, see < https: // www.gnu.org/licenses/>.
 from datetime import date, datetime, timedelta
 from collections import OrderedDict
+from array import array
+from bisect import bisect_left
 
 ONE_DAY_DELTA = timedelta(days=1)
 ONE_WEEK_DELTA = timedelta(weeks=1)
@@ -279,13 +281,18 @@ class WeeklyHistogram(DailyHistogram):
 
     As such, it can be updated with keys being both ``date`` and ``datetime``
     instances. Furthermore, the scan
+
+    By default the weeks start on Sunday but it can be changed by
+    ``first_weekday`` (1 for Monday up to 7 for Sunday).
     """
 
-    def __init__(self, create_value_func=lambda: 0) -> None:
+    def __init__(self, create_value_func=lambda: 0, first_weekday: int = 7) -> None:
         super().__init__(create_value_func)
+        self.unit = WeekUnit(first_weekday)
 
     def group_key(self, key):
-        return find_previous_sunday(super().group_key(key))
+        unit = self.unit
+        return unit.start_date(unit.date_index(key))
 
     def key_sequence(self):
         return DateSequenceIterator(self.min_date, self.max_date, ONE_WEEK_DELTA)
@@ -295,3 +302,363 @@ class WeeklyHistogram(DailyHistogram):
             return int((self.max_date - self.min_date).days / 7) + 1
         else:
             return 0
+
+
+# Ordinal (as returned by ``date.toordinal()``) of 1970-01-01.
+EPOCH_ORDINAL = 719163
+
+MONDAY = 1
+SUNDAY = 7
+
+
+def civil_from_ordinal(ordinal: int) -> tuple:
+    """
+    Converts a date ordinal (as returned by ``date.toordinal()``) into a
+    tuple ``(year, month, day)`` using only integer arithmetic.
+
+    This is the ``civil_from_days`` algorithm by Howard Hinnant.
+    """
+    z = ordinal - EPOCH_ORDINAL + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    d = doy - (153 * mp + 2) // 5 + 1
+    m = mp + 3 if mp < 10 else mp - 9
+    return (yoe + era * 400 + (m <= 2), m, d)
+
+
+def ordinal_from_civil(year: int, month: int, day: int) -> int:
+    """
+    Converts a date into its ordinal using only integer arithmetic. It is the
+    inverse of ``civil_from_ordinal()``.
+
+    This is the ``days_from_civil`` algorithm by Howard Hinnant.
+    """
+    year -= month <= 2
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month - 3 if month > 2 else month + 9) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468 + EPOCH_ORDINAL
+
+
+def ordinals_from_timestamps(timestamps, offsets=None) -> array:
+    """
+    Converts a sequence of UNIX timestamps into the ordinals of their dates.
+    If ``offsets`` is given, it must contain the UTC offset in seconds of each
+    timestamp, thus the local date of each timestamp is used.
+    """
+    if offsets is None:
+        return array('q', [t // 86400 + EPOCH_ORDINAL for t in timestamps])
+    else:
+        return array('q', [(t + o) // 86400 + EPOCH_ORDINAL
+                           for t, o in zip(timestamps, offsets)])
+
+
+def to_ordinal(d) -> int:
+    """
+    Returns the ordinal of a ``date`` or ``datetime``. For ``datetime``
+    instances, the date in its own timezone is used.
+    """
+    if isinstance(d, (date, datetime)):
+        return d.toordinal()
+    else:
+        raise ValueError(
+            'The key must be an instance of date or datetime.')
+
+
+class CalendarUnit:
+    """
+    This is the base class of all calendar units. A calendar unit maps a
+    date ordinal into an integer bucket index and back, using only integer
+    arithmetic.
+    """
+
+    def index(self, ordinal: int) -> int:
+        """
+        Returns the bucket index of the given date ordinal.
+        """
+        raise NotImplementedError('Subclasses must implement this method.')
+
+    def start(self, index: int) -> int:
+        """
+        Returns the ordinal of the first day of the given bucket.
+        """
+        raise NotImplementedError('Subclasses must implement this method.')
+
+    def label(self, index: int) -> str:
+        """
+        Returns the label of the given bucket. By default, it is the first
+        day of the bucket in ISO format.
+        """
+        return str(self.start_date(index))
+
+    def assign(self, ordinals) -> array:
+        """
+        Maps a sequence of date ordinals into their bucket indexes at once.
+        """
+        index = self.index
+        return array('q', [index(o) for o in ordinals])
+
+    def start_date(self, index: int) -> date:
+        return date.fromordinal(self.start(index))
+
+    def date_index(self, d) -> int:
+        """
+        Returns the bucket index of a ``date`` or ``datetime``.
+        """
+        return self.index(to_ordinal(d))
+
+
+class DayUnit(CalendarUnit):
+
+    def index(self, ordinal: int) -> int:
+        return ordinal
+
+    def start(self, index: int) -> int:
+        return index
+
+    def assign(self, ordinals) -> array:
+        return array('q', ordinals)
+
+
+class WeekUnit(CalendarUnit):
+    """
+    Calendar unit of weeks starting at a given ISO weekday (1 for Monday
+    up to 7 for Sunday). The default is Sunday.
+    """
+
+    def __init__(self, first_weekday: int = SUNDAY) -> None:
+        if first_weekday < 1 or first_weekday > 7:
+            raise ValueError('The weekday must be between 1 and 7.')
+        # The ordinal 1 (0001-01-01) is a Monday, thus the ordinal N
+        # has the ISO weekday N for N between 1 and 7.
+        self.first_weekday = first_weekday
+
+    def index(self, ordinal: int) -> int:
+        return (ordinal - self.first_weekday) // 7
+
+    def start(self, index: int) -> int:
+        return index * 7 + self.first_weekday
+
+    def assign(self, ordinals) -> array:
+        w = self.first_weekday
+        return array('q', [(o - w) // 7 for o in ordinals])
+
+
+class MonthPeriodUnit(CalendarUnit):
+    """
+    Calendar unit of periods composed by a fixed number of months. The
+    periods may start in any month, thus it can also be used to represent
+    fiscal quarters and years.
+    """
+
+    def __init__(self, months: int, first_month: int = 1) -> None:
+        if first_month < 1 or first_month > 12:
+            raise ValueError('The month must be between 1 and 12.')
+        self.months = months
+        self.first_month = first_month
+
+    def index(self, ordinal: int) -> int:
+        y, m, d = civil_from_ordinal(ordinal)
+        return (y * 12 + m - self.first_month) // self.months
+
+    def start(self, index: int) -> int:
+        m = index * self.months + self.first_month - 1
+        return ordinal_from_civil(m // 12, m % 12 + 1, 1)
+
+
+class MonthUnit(MonthPeriodUnit):
+
+    def __init__(self) -> None:
+        super().__init__(1)
+
+    def label(self, index: int) -> str:
+        return f'{index // 12}-{index % 12 + 1:02d}'
+
+
+class QuarterUnit(MonthPeriodUnit):
+
+    def __init__(self, first_month: int = 1) -> None:
+        super().__init__(3, first_month)
+
+    def label(self, index: int) -> str:
+        if self.first_month == 1:
+            return f'{index // 4}-Q{index % 4 + 1}'
+        else:
+            return super().label(index)
+
+
+class YearUnit(MonthPeriodUnit):
+    """
+    Calendar unit of years. If ``first_month`` is not January, it represents
+    fiscal years, labeled by the calendar year in which they end.
+    """
+
+    def __init__(self, first_month: int = 1) -> None:
+        super().__init__(12, first_month)
+
+    def label(self, index: int) -> str:
+        if self.first_month == 1:
+            return str(index)
+        else:
+            return f'FY{index + 1}'
+
+
+class HierarchicalHistogram:
+    """
+    This class implements a multi-resolution histogram with the levels
+    year, quarter, month, week and day. The entries are always added to
+    the day level and the other levels are aggregated from it on their
+    first access, thus the levels that are never used are never computed.
+    Each level is mapped to its buckets by a ``CalendarUnit``.
+
+    Each level is sparse, thus periods without entries are not stored. The
+    key of each entry is the first day of the period.
+    """
+
+    LEVELS = ('year', 'quarter', 'month', 'week', 'day')
+
+    def __init__(self, create_value_func=lambda: 0, merge_value_func=lambda a, b: a + b,
+                 units: dict = None) -> None:
+        """
+        Creates a new instance of this class. The parameter ``create_value_func``
+        creates a new value (zero) and ``merge_value_func`` merges 2 values
+        into a new one. For optimization reasons, ``merge_value_func`` is
+        allowed to update the first value and return it.
+
+        The parameter ``units`` may be used to replace the ``CalendarUnit`` of
+        the levels (e.g.: weeks starting on Monday or fiscal years).
+        """
+        self._create_value_func = create_value_func
+        self._merge_value_func = merge_value_func
+        self.units = {
+            'year': YearUnit(),
+            'quarter': QuarterUnit(),
+            'month': MonthUnit(),
+            'week': WeekUnit(),
+            'day': DayUnit()}
+        if units:
+            self.units.update(units)
+        self._levels = {'day': {}}
+        self._keys = {}
+
+    def update_entry(self, key, arg):
+        """
+        Updates the day level entry of the given ``date`` or ``datetime``.
+        """
+        key = to_ordinal(key)
+        days = self._levels['day']
+        old = days.get(key, None)
+        if old is None:
+            old = self._create_value_func()
+        old += arg
+        days[key] = old
+
+    def build(self):
+        """
+        Marks the end of the updates. The aggregated levels computed before
+        it are discarded, as they would be outdated.
+        """
+        self._levels = {'day': self._levels['day']}
+        self._keys = {}
+        return self
+
+    def _level(self, level: str) -> dict:
+        """
+        Returns the entries of the given level, aggregating them from the
+        day level on the first access.
+        """
+        ret = self._levels.get(level, None)
+        if ret is None:
+            days = self._levels['day']
+            ret = {}
+            for k, value in zip(self.units[level].assign(days), days.values()):
+                v = ret.get(k, None)
+                if v is None:
+                    v = self._create_value_func()
+                ret[k] = self._merge_value_func(v, value)
+            self._levels[level] = ret
+        return ret
+
+    def __bool__(self):
+        return bool(self._levels['day'])
+
+    @property
+    def min_date(self) -> date:
+        return date.fromordinal(min(self._levels['day']))
+
+    @property
+    def max_date(self) -> date:
+        return date.fromordinal(max(self._levels['day']))
+
+    def level(self, level: str) -> list:
+        """
+        Returns the non-empty entries of the given level as a list of
+        tuples ``(period start, value)`` sorted by date.
+        """
+        unit = self.units[level]
+        return [(unit.start_date(k), v) for k, v in sorted(self._level(level).items())]
+
+    def __getitem__(self, key):
+        """
+        Returns the value of a given ``(level, date)`` key. Empty periods
+        return ``create_value_func()``.
+        """
+        level, d = key
+        v = self._level(level).get(self.units[level].date_index(d), None)
+        if v is None:
+            return self._create_value_func()
+        return v
+
+    def label(self, level: str, period: date) -> str:
+        """
+        Returns the label of the period that contains the given date.
+        """
+        unit = self.units[level]
+        return unit.label(unit.date_index(period))
+
+    def periods(self, level: str, start: date = None, end: date = None):
+        """
+        Returns a generator of all periods of a given level between
+        ``start`` and ``end`` (inclusive), including the empty ones. By
+        default, it covers the whole histogram.
+        """
+        unit = self.units[level]
+        first = unit.date_index(self.min_date if start is None else start)
+        last = unit.date_index(self.max_date if end is None else end)
+        for i in range(first, last + 1):
+            yield unit.start_date(i)
+
+    def children(self, level: str, period: date) -> list:
+        """
+        Returns the non-empty entries of the next finer level that start
+        inside the given period. It allows the drill-down from a given
+        period. The entries are found by a binary search, thus drilling down
+        all periods of a level is not quadratic.
+        """
+        child = HierarchicalHistogram.LEVELS[HierarchicalHistogram.LEVELS.index(
+            level) + 1]
+        unit = self.units[level]
+        index = unit.date_index(period)
+        child_unit = self.units[child]
+        keys = self._sorted_keys(child)
+        first = bisect_left(keys, self._first_child(child_unit, unit.start(index)))
+        last = bisect_left(keys, self._first_child(child_unit, unit.start(index + 1)))
+        values = self._level(child)
+        return [(child_unit.start_date(k), values[k]) for k in keys[first:last]]
+
+    @staticmethod
+    def _first_child(unit: CalendarUnit, ordinal: int) -> int:
+        # The index of the first bucket that starts at or after the ordinal.
+        k = unit.index(ordinal)
+        return k if unit.start(k) >= ordinal else k + 1
+
+    def _sorted_keys(self, level: str) -> list:
+        ret = self._keys.get(level, None)
+        if ret is None:
+            ret = sorted(self._level(level))
+            self._keys[level] = ret
+        return ret
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+
+_UNSET = object()
+
+
+class LazyValue:
+    """
+    This class implements a proxy to a value that is computed by
+    ``func(*args)`` on its first use and memoized. Arguments that are
+    ``LazyValue`` instances are evaluated before the call, so lazy values
+    may share intermediate results.
+
+    The proxy forwards the attribute and item access, iteration, length,
+    truth value and string conversion to the value, thus templates can use
+    it as the value itself. Templates must not compare it with ``none``.
+    """
+    __slots__ = ('_func', '_args', '_value')
+
+    def __init__(self, func, *args) -> None:
+        self._func = func
+        self._args = args
+        self._value = _UNSET
+
+    @property
+    def evaluated(self) -> bool:
+        return self._value is not _UNSET
+
+    @property
+    def value(self):
+        if self._value is _UNSET:
+            args = [a.value if isinstance(a, LazyValue) else a for a in self._args]
+            self._value = self._func(*args)
+            self._func = None
+            self._args = None
+        return self._value
+
+    def __getattr__(self, name: str):
+        return getattr(self.value, name)
+
+    def __getitem__(self, key):
+        return self.value[key]
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __contains__(self, item) -> bool:
+        return item in self.value
+
+    def __bool__(self) -> bool:
+        return bool(self.value)
+
+    def __str__(self) -> str:
+        return str(self.value)
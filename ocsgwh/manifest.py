@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import json
+from hashlib import sha1
+from pathlib import Path
+
+from logging import getLogger
+LOGGER = getLogger(__name__)
+
+MANIFEST_FILE_NAME = '.ocsgwh-manifest.json'
+
+
+def fingerprint(*inputs) -> str:
+    """
+    Computes the fingerprint of a sequence of inputs. Each input may be
+    a string, bytes or an iterable of strings.
+    """
+    h = sha1()
+    for i in inputs:
+        if isinstance(i, bytes):
+            h.update(i)
+        elif isinstance(i, str):
+            h.update(i.encode('utf-8'))
+        else:
+            for s in i:
+                h.update(str(s).encode('utf-8'))
+                h.update(b'\n')
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def file_fingerprint(*files: Path) -> str:
+    """
+    Computes the fingerprint of the contents of the given files.
+    """
+    h = sha1()
+    for f in files:
+        h.update(f.name.encode('utf-8'))
+        h.update(b'\0')
+        h.update(f.read_bytes())
+    return h.hexdigest()
+
+
+class OutputManifest:
+    """
+    This class implements the manifest of the files in the output directory.
+    It maps the name of each output file to the fingerprint of the inputs used
+    to generate it, allowing unchanged files to be skipped in subsequent runs.
+    """
+
+    def __init__(self, output_dir: Path) -> None:
+        self.file = output_dir / MANIFEST_FILE_NAME
+        self._entries = {}
+        self._touched = set()
+        if self.file.is_file():
+            try:
+                with open(self.file, 'r', encoding='utf-8') as inp:
+                    self._entries = json.load(inp)
+            except ValueError:
+                LOGGER.warning(f'Ignoring invalid manifest "{self.file}".')
+
+    def __contains__(self, file_name: str) -> bool:
+        return file_name in self._entries
+
+    def __getitem__(self, file_name: str) -> str:
+        return self._entries[file_name]
+
+    def update(self, file_name: str, fingerprint: str) -> bool:
+        """
+        Registers the fingerprint of the given output file.
+
+        Returns True if the file must be generated or False if it is
+        already up to date.
+        """
+        self._touched.add(file_name)
+        output_file = self.file.parent / file_name
+        if self._entries.get(file_name, None) == fingerprint and output_file.is_file():
+            return False
+        self._entries[file_name] = fingerprint
+        return True
+
+    def stale_files(self) -> list:
+        """
+        Returns the list of files registered in this manifest that were not
+        updated since it was loaded.
+        """
+        return sorted(f for f in self._entries if f not in self._touched)
+
+    def remove(self, file_name: str):
+        self._entries.pop(file_name, None)
+
+    def save(self):
+        with open(self.file, 'w', encoding='utf-8') as outp:
+            json.dump(self._entries, outp, indent=1, sort_keys=True)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+from datetime import timedelta
+from .git.model import GitLog, GitAuthorName
+
+# Fraction of the changes that must be covered by the authors counted by
+# the bus factor.
+BUS_FACTOR_COVERAGE = 0.5
+
+# Number of days without commits after which an author is considered
+# inactive.
+INACTIVE_DAYS = 365
+
+
+class Interner:
+    """
+    This class maps distinct values into sequential integer ids.
+    """
+
+    def __init__(self) -> None:
+        self._ids = {}
+        self.values = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, value) -> bool:
+        return value in self._ids
+
+    def intern(self, value) -> int:
+        id = self._ids.get(value, None)
+        if id is None:
+            id = len(self.values)
+            self._ids[value] = id
+            self.values.append(value)
+        return id
+
+    def id(self, value) -> int:
+        return self._ids[value]
+
+
+def bus_factor(contributions: dict, coverage: float = BUS_FACTOR_COVERAGE) -> int:
+    """
+    Returns the minimum number of authors whose contributions cover the given
+    fraction of the total. ``contributions`` maps the authors into their
+    number of changed lines.
+    """
+    total = sum(contributions.values())
+    if total == 0:
+        return 0
+    target = total * coverage
+    covered = 0
+    count = 0
+    for v in sorted(contributions.values(), reverse=True):
+        covered += v
+        count += 1
+        if covered >= target:
+            break
+    return count
+
+
+class OwnershipMatrix:
+    """
+    This class implements a sparse author x path matrix with the number of
+    lines changed by each author in each file. Authors and paths are interned
+    into integer ids and each row of the matrix is a dictionary that maps the
+    author id into the number of changed lines, thus the memory used is
+    proportional to the number of non-zero entries.
+
+    Changes without changed lines (e.g. binary files) count as one line.
+    Renames are ignored as their paths describe two locations at once.
+    """
+
+    def __init__(self, log: GitLog = None) -> None:
+        self.authors = Interner()
+        self.paths = Interner()
+        self._rows = []
+        self._last_commit = []
+        self.max_date = None
+        if log is not None:
+            self.add_log(log)
+
+    def add_log(self, log: GitLog):
+        """
+        Adds all commits of the log into the matrix in a single pass.
+        """
+        names = {}
+        for a in log.authors:
+            for identity in a.authors:
+                names[identity] = self.authors.intern(a)
+        last_commit = self._last_commit
+        last_commit.extend([None] * (len(self.authors) - len(last_commit)))
+        rows = self._rows
+        paths = self.paths
+        for commit in log:
+            author_id = names[commit.author]
+            ts = commit.timestamp
+            if last_commit[author_id] is None or last_commit[author_id] < ts:
+                last_commit[author_id] = ts
+            if self.max_date is None or self.max_date < ts:
+                self.max_date = ts
+            for d in commit.diff:
+                if d.rename:
+                    continue
+                path_id = paths.intern(d.file_name)
+                if path_id == len(rows):
+                    rows.append({})
+                row = rows[path_id]
+                row[author_id] = row.get(author_id, 0) + (d.changed or 1)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of non-zero entries of the matrix.
+        """
+        return sum(len(r) for r in self._rows)
+
+    def _shares(self, contributions: dict) -> list:
+        total = sum(contributions.values())
+        ret = [(self.authors.values[a], v / total) for a, v in contributions.items()]
+        ret.sort(key=lambda x: x[1], reverse=True)
+        return ret
+
+    def row(self, path: str) -> dict:
+        """
+        Returns the number of lines changed by each author in the given file.
+        """
+        row = self._rows[self.paths.id(path)]
+        return {self.authors.values[a]: v for a, v in row.items()}
+
+    def file_shares(self, path: str) -> list:
+        """
+        Returns the ownership shares of the given file as a list of tuples
+        ``(GitAuthorName, share)`` sorted by share.
+        """
+        return self._shares(self._rows[self.paths.id(path)])
+
+    def directory_contributions(self, depth: int = 1) -> dict:
+        """
+        Aggregates the rows into the directories at the given depth in a
+        single pass. Returns a dictionary that maps each directory path into
+        a dictionary of author ids and changed lines. Files above the given
+        depth are not included.
+        """
+        ret = {}
+        for path, row in zip(self.paths.values, self._rows):
+            parts = path.split('/', depth)
+            if len(parts) <= depth:
+                continue
+            target = ret.setdefault('/'.join(parts[:depth]), {})
+            for a, v in row.items():
+                target[a] = target.get(a, 0) + v
+        return ret
+
+    def directory_shares(self, directory: str) -> list:
+        """
+        Returns the ownership shares of the given directory as a list of
+        tuples ``(GitAuthorName, share)`` sorted by share.
+        """
+        depth = directory.strip('/').count('/') + 1
+        contributions = self.directory_contributions(depth).get(directory.strip('/'), {})
+        return self._shares(contributions) if contributions else []
+
+    def author_totals(self) -> dict:
+        """
+        Returns the total number of changed lines of each author id.
+        """
+        ret = {}
+        for row in self._rows:
+            for a, v in row.items():
+                ret[a] = ret.get(a, 0) + v
+        return ret
+
+    def bus_factor(self, coverage: float = BUS_FACTOR_COVERAGE) -> int:
+        """
+        Returns the bus factor of the whole repository.
+        """
+        return bus_factor(self.author_totals(), coverage)
+
+    def file_bus_factor(self, path: str, coverage: float = BUS_FACTOR_COVERAGE) -> int:
+        return bus_factor(self._rows[self.paths.id(path)], coverage)
+
+    def directory_bus_factors(self, depth: int = 1, coverage: float = BUS_FACTOR_COVERAGE) -> list:
+        """
+        Returns the bus factor of each directory at the given depth as a list
+        of tuples ``(directory, bus factor, changed lines)`` sorted by the
+        number of changed lines.
+        """
+        ret = [(d, bus_factor(c, coverage), sum(c.values()))
+               for d, c in self.directory_contributions(depth).items()]
+        ret.sort(key=lambda x: x[2], reverse=True)
+        return ret
+
+    def inactive_authors(self, inactive_days: int = INACTIVE_DAYS) -> set:
+        """
+        Returns the ids of the authors without commits in the last
+        ``inactive_days`` days of the log.
+        """
+        if self.max_date is None:
+            return set()
+        limit = self.max_date - timedelta(days=inactive_days)
+        return set(a for a, ts in enumerate(self._last_commit)
+                   if ts is not None and ts < limit)
+
+    def orphaned_files(self, inactive_days: int = INACTIVE_DAYS, existing: set = None) -> list:
+        """
+        Returns the files whose authors are all inactive as a list of tuples
+        ``(path, changed lines)`` sorted by the number of changed lines. If
+        ``existing`` is given, only these paths are considered (e.g. the
+        files at HEAD), otherwise removed files are reported too.
+        """
+        inactive = self.inactive_authors(inactive_days)
+        if not inactive:
+            return []
+        ret = [(p, sum(row.values())) for p, row in zip(self.paths.values, self._rows)
+               if inactive.issuperset(row) and (existing is None or p in existing)]
+        ret.sort(key=lambda x: x[1], reverse=True)
+        return ret
+
+    def owned_files(self, author: GitAuthorName) -> list:
+        """
+        Returns the files in which the given author has the largest share as
+        a list of tuples ``(path, share)`` sorted by share.
+        """
+        if author not in self.authors:
+            return []
+        id = self.authors.id(author)
+        ret = []
+        for p, row in zip(self.paths.values, self._rows):
+            v = row.get(id, 0)
+            if v and v == max(row.values()):
+                ret.append((p, v / sum(row.values())))
+        ret.sort(key=lambda x: x[1], reverse=True)
+        return ret
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+from array import array
+from collections import namedtuple
+from enum import Enum
+from .git.model import GitLog, GitCommitType
+from .historgram import DayUnit, WeekUnit, MonthUnit, QuarterUnit, YearUnit, to_ordinal
+from .filetypes import FileTypeClassifier, split_path
+from .ownership import Interner
+
+# Calendar dimensions. Their values are the first day of each period.
+CALENDAR_UNITS = {
+    'day': DayUnit(),
+    'week': WeekUnit(),
+    'month': MonthUnit(),
+    'quarter': QuarterUnit(),
+    'year': YearUnit()}
+
+# Dimensions computed from the path of each diff entry. Commits without
+# diff entries are ignored when grouped by them.
+PATH_DIMENSIONS = ('path', 'directory', 'file_type')
+
+DIMENSIONS = ('author', 'commit_type') + PATH_DIMENSIONS + tuple(CALENDAR_UNITS)
+
+MEASURES = ('added', 'deleted', 'changed')
+
+COMMIT_TYPES = list(GitCommitType)
+
+# Id of the path of the rows of commits without diff entries.
+NO_PATH = -1
+
+
+class LogColumns:
+    """
+    This class implements a columnar representation of a log. Each row is a
+    diff entry and each column is an ``array`` of integers: the index of
+    the commit, the interned author and path, the added and deleted lines,
+    the date ordinal and the commit type. Commits without diff entries have
+    a single row with the path ``NO_PATH``, so they are still counted.
+
+    The columns of the derived dimensions (directories, file types and
+    calendar periods) are computed once from the distinct values of the
+    base columns and cached.
+    """
+
+    def __init__(self, log: GitLog) -> None:
+        self.authors = Interner()
+        self.paths = Interner()
+        names = {}
+        for a in log.authors:
+            id = self.authors.intern(a)
+            for identity in a.authors:
+                names[identity] = id
+        self.commit = array('i')
+        self.author = array('i')
+        self.path = array('i')
+        self.added = array('q')
+        self.deleted = array('q')
+        self.day = array('i')
+        self.commit_type = array('b')
+        for i, c in enumerate(log):
+            author = names[c.author]
+            day = to_ordinal(c.timestamp)
+            commit_type = COMMIT_TYPES.index(c.commit_type)
+            entries = [(self.paths.intern(d.file_name), d.added, d.deleted) for d in c.diff] \
+                or [(NO_PATH, 0, 0)]
+            for path, added, deleted in entries:
+                self.commit.append(i)
+                self.author.append(author)
+                self.path.append(path)
+                self.added.append(added)
+                self.deleted.append(deleted)
+                self.day.append(day)
+                self.commit_type.append(commit_type)
+        self.commit_count = len(log)
+        self._columns = {}
+        self._values = {}
+
+    def __len__(self) -> int:
+        return len(self.commit)
+
+    def _path_column(self, name: str, func):
+        # Maps each distinct path into the id of func(path). NO_PATH is kept
+        # as the last entry of the table, thus table[NO_PATH] is NO_PATH.
+        values = Interner()
+        table = [values.intern(func(p)) for p in self.paths.values]
+        table.append(NO_PATH)
+        self._values[name] = values.values
+        return array('i', [table[p] for p in self.path])
+
+    def column(self, name: str):
+        """
+        Returns the column with the given name. Dimensions are returned as
+        integer keys that can be decoded by ``decode()``.
+        """
+        ret = self._columns.get(name, None)
+        if ret is not None:
+            return ret
+        if name in ('author', 'path', 'commit_type', 'added', 'deleted', 'commit'):
+            ret = getattr(self, name)
+        elif name == 'changed':
+            ret = array('q', map(int.__add__, self.added, self.deleted))
+        elif name == 'directory':
+            ret = self._path_column(name, lambda p: split_path(p)[0])
+        elif name == 'file_type':
+            ret = self._path_column(name, FileTypeClassifier(self.paths.values))
+        elif name in CALENDAR_UNITS:
+            ret = CALENDAR_UNITS[name].assign(self.day)
+        else:
+            raise ValueError(f'Unknown column "{name}".')
+        self._columns[name] = ret
+        return ret
+
+    def decode(self, dimension: str, key: int):
+        """
+        Converts the integer key of a dimension into its value.
+        """
+        if dimension == 'author':
+            return self.authors.values[key]
+        elif dimension == 'path':
+            return self.paths.values[key]
+        elif dimension == 'commit_type':
+            return COMMIT_TYPES[key]
+        elif dimension in CALENDAR_UNITS:
+            return CALENDAR_UNITS[dimension].start_date(key)
+        else:
+            return self._values[dimension][key]
+
+    def group_by(self, *dimensions: str):
+        return GroupBy(self, dimensions)
+
+
+def _sort_key(row: tuple):
+    return tuple(x.value if isinstance(x, Enum) else x for x in row)
+
+
+class GroupBy:
+    """
+    This class implements a group-by query over the columns of a log. The
+    aggregations are added by ``sum()``, ``count()`` and
+    ``count_distinct()``, which return the query itself so they can be
+    chained, e.g.::
+
+        log.group_by('author', 'week').sum('added', 'deleted').count()
+
+    The query is executed in a single pass over the columns when its rows
+    are first requested. Each row is a named tuple with the dimensions
+    followed by the aggregates (``count`` for ``count()`` and
+    ``<dimension>_count`` for ``count_distinct()``), sorted by the
+    dimensions.
+    """
+
+    def __init__(self, columns: LogColumns, dimensions: tuple) -> None:
+        for d in dimensions:
+            if d not in DIMENSIONS:
+                raise ValueError(f'Unknown dimension "{d}".')
+        self.columns = columns
+        self.dimensions = tuple(dimensions)
+        self._sums = []
+        self._count = False
+        self._distinct = []
+        self._rows = None
+
+    def _add(self):
+        if self._rows is not None:
+            raise ValueError('The query was already executed.')
+        return self
+
+    def sum(self, *measures: str):
+        for m in measures:
+            if m not in MEASURES:
+                raise ValueError(f'Unknown measure "{m}".')
+        self._sums.extend(measures)
+        return self._add()
+
+    def count(self):
+        """
+        Counts the commits of each group.
+        """
+        self._count = True
+        return self._add()
+
+    def count_distinct(self, *dimensions: str):
+        """
+        Counts the distinct values of the given dimensions in each group
+        (e.g. the number of authors of each week).
+        """
+        for d in dimensions:
+            if d not in DIMENSIONS:
+                raise ValueError(f'Unknown dimension "{d}".')
+        self._distinct.extend(dimensions)
+        return self._add()
+
+    @property
+    def fields(self) -> tuple:
+        return self.dimensions + tuple(self._sums) + \
+            (('count',) if self._count else ()) + \
+            tuple(d + '_count' for d in self._distinct)
+
+    def _execute(self) -> dict:
+        columns = self.columns
+        key_columns = [columns.column(d) for d in self.dimensions]
+        sum_columns = [columns.column(m) for m in self._sums]
+        distinct_columns = [columns.column(d) for d in self._distinct]
+        skip_missing = any(d in PATH_DIMENSIONS for d in self.dimensions)
+        n_sums = len(sum_columns)
+        n_distinct = len(distinct_columns)
+        groups = {}
+        # The key of each row is a tuple, even with a single dimension.
+        keys = zip(*key_columns) if key_columns else iter(tuple, None)
+        for key, commit, path, *values in zip(keys, columns.commit, columns.path,
+                                              *sum_columns, *distinct_columns):
+            if skip_missing and path == NO_PATH:
+                continue
+            g = groups.get(key, None)
+            if g is None:
+                # [sums..., commit count, last commit, distinct sets...]
+                g = [0] * n_sums + [0, -1] + [set() for i in range(n_distinct)]
+                groups[key] = g
+            for i in range(n_sums):
+                g[i] += values[i]
+            # The rows of a commit are contiguous.
+            if g[n_sums + 1] != commit:
+                g[n_sums] += 1
+                g[n_sums + 1] = commit
+            for i in range(n_distinct):
+                g[n_sums + 2 + i].add(values[n_sums + i])
+        # Commits without changes do not count as a distinct path.
+        for i, d in enumerate(self._distinct):
+            if d in PATH_DIMENSIONS:
+                for g in groups.values():
+                    g[n_sums + 2 + i].discard(NO_PATH)
+        return groups
+
+    def rows(self) -> list:
+        """
+        Executes the query (only once) and returns its rows.
+        """
+        if self._rows is None:
+            Row = namedtuple('Row', self.fields)
+            decode = self.columns.decode
+            rows = []
+            for key, g in self._execute().items():
+                values = [decode(d, k) for d, k in zip(self.dimensions, key)]
+                values.extend(g[:len(self._sums)])
+                if self._count:
+                    values.append(g[len(self._sums)])
+                values.extend(len(s) for s in g[len(self._sums) + 2:])
+                rows.append(Row(*values))
+            n = len(self.dimensions)
+            rows.sort(key=lambda r: _sort_key(r[:n]))
+            self._rows = rows
+        return self._rows
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def __len__(self) -> int:
+        return len(self.rows())
+
+    def to_dict(self) -> dict:
+        """
+        Returns the rows as a dictionary that maps the dimensions into the
+        aggregates. Single dimensions and aggregates are not wrapped into
+        tuples.
+        """
+        n = len(self.dimensions)
+        ret = {}
+        for r in self.rows():
+            key = r[0] if n == 1 else tuple(r[:n])
+            ret[key] = r[n] if len(r) == n + 1 else tuple(r[n:])
+        return ret
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import heapq
+from operator import attrgetter
+from .git.model import GitDiff
+from .dirtree import DirectoryTree
+
+# Number of entries of each ranking displayed in the reports.
+HOTSPOT_COUNT = 10
+
+# Metrics that can be used to rank the entries. They work with
+# ``GitDiffEntry``, ``DirectoryNode`` and ``DiffSummaryValue``.
+RANKING_KEYS = {
+    'changed': attrgetter('changed'),
+    'added': attrgetter('added'),
+    'deleted': attrgetter('deleted'),
+    'balance': attrgetter('balance'),
+    'update_count': attrgetter('update_count'),
+}
+
+
+def ranking_key(key):
+    """
+    Returns the key function of the given metric. ``key`` may be the name of
+    a metric in ``RANKING_KEYS`` or a function.
+    """
+    if callable(key):
+        return key
+    try:
+        return RANKING_KEYS[key]
+    except KeyError:
+        raise ValueError(f'Unknown ranking metric "{key}".')
+
+
+def top_k(items, k: int, key='changed', lowest: bool = False) -> list:
+    """
+    Returns the ``k`` items with the largest (or the lowest if ``lowest`` is
+    True) values of the given metric, sorted from the best to the worst. It
+    keeps a heap of at most ``k`` items instead of sorting all of them.
+    """
+    if lowest:
+        return heapq.nsmallest(k, items, key=ranking_key(key))
+    else:
+        return heapq.nlargest(k, items, key=ranking_key(key))
+
+
+def top_files(diff: GitDiff, k: int = HOTSPOT_COUNT, key='changed', lowest: bool = False) -> list:
+    """
+    Returns the ``k`` entries of the aggregated diff with the largest values
+    of the given metric. Renames are ignored.
+    """
+    return top_k((d for d in diff if not d.rename), k, key, lowest)
+
+
+def top_directories(tree: DirectoryTree, k: int = HOTSPOT_COUNT, key='changed',
+                    depth: int = None) -> list:
+    """
+    Returns the ``k`` directories with the largest values of the given
+    metric at the given depth or at any depth if ``depth`` is None.
+    """
+    return tree.top(k, depth, ranking_key(key))
+
+
+def top_authors(summaries, k: int = HOTSPOT_COUNT, key='changed') -> list:
+    """
+    Returns the ``k`` authors with the largest values of the given metric.
+    ``summaries`` must be a sequence of tuples ``(author, value)``.
+    """
+    key = ranking_key(key)
+    return heapq.nlargest(k, summaries, key=lambda x: key(x[1]))
@@ -19,11 +19,23 @@ from datetime import date, timedelta
 from collections import Counter
 from typing import List, Tuple
 import pygal
-from .historgram import DailyHistogram, DateSequenceIterator, Histogram, ONE_WEEK_DELTA, find_previous_sunday, WeeklyHistogram
+from .historgram import DailyHistogram, DateSequenceIterator, Histogram, ONE_WEEK_DELTA, find_previous_sunday, WeeklyHistogram, HierarchicalHistogram
 from .git.model import *
+from .filetypes import FileTypeClassifier
+from .dirtree import DirectoryTree, TREE_DEPTH, TREE_CHILDREN
+from .ranking import HOTSPOT_COUNT, top_files, top_directories, top_authors
+from .ownership import OwnershipMatrix, BUS_FACTOR_COVERAGE, INACTIVE_DAYS
+from .survival import SurvivingLines
+from .lazy import LazyValue
 
 ONE_DAY_TIME_DELTA = timedelta(days=1)
 
+# Sections of the diff reports that may be disabled. The names match the
+# blocks of base_diff.html, except for the parts of the histograms block.
+REPORT_SECTIONS = ('file_types', 'hotspots', 'ownership', 'surviving_lines',
+                   'histograms', 'author_histogram', 'activity_csv', 'daily_histogram',
+                   'changes_per_directory', 'changes_per_file')
+
 
 class DiffSummaryValue:
     def __init__(self, added: int = 0, deleted: int = 0) -> None:
@@ -35,6 +47,10 @@ class DiffSummaryValue:
     def changed(self):
         return self.added + self.deleted
 
+    @property
+    def balance(self):
+        return self.added - self.deleted
+
     def new():
         """
         Creates a new instace with all properties set to 0.
@@ -62,6 +78,19 @@ class DiffSummaryValue:
             raise ValueError('')
         return self
 
+    def merge(self, v):
+        """
+        Merges another instance of ``DiffSummaryValue`` into this one,
+        including its ``update_count``. It always returns self.
+
+        This method was designed to be used with ``HierarchicalHistogram``
+        as ``merge_value_func``.
+        """
+        self.added += v.added
+        self.deleted += v.deleted
+        self.update_count += v.update_count
+        return self
+
 
 class AuthorNameSet:
 
@@ -121,6 +150,67 @@ def create_author_diff_report(log: GitLog) -> list:
     return ret
 
 
+def create_author_summaries(log: GitLog) -> list:
+    """
+    Computes the summary of the changes of each author in the log. It
+    returns a list of tuples ``(GitAuthorName, DiffSummaryValue)``. The
+    ``update_count`` of each summary is the number of commits.
+    """
+    summaries = {}
+    for r in log.group_by('author').sum('added', 'deleted').count():
+        summary = DiffSummaryValue(r.added, r.deleted)
+        summary.update_count = r.count
+        summaries[r.author.author_key] = summary
+    return [(a, summaries[a.author_key]) for a in log.authors]
+
+
+def create_hotspots(diff: GitDiff, tree: DirectoryTree, log: GitLog = None) -> dict:
+    """
+    Creates the rankings of the hotspots section. The authors are ranked
+    only if ``log`` is given.
+    """
+    ret = {'most_changed_files': top_files(diff, HOTSPOT_COUNT, 'changed'),
+           'most_updated_files': top_files(diff, HOTSPOT_COUNT, 'update_count'),
+           'most_grown_files': top_files(diff, HOTSPOT_COUNT, 'balance'),
+           'most_shrunk_files': top_files(diff, HOTSPOT_COUNT, 'balance', lowest=True),
+           'most_changed_directories': top_directories(tree, HOTSPOT_COUNT, 'changed')}
+    if log is not None:
+        ret['most_active_authors'] = top_authors(
+            create_author_summaries(log), HOTSPOT_COUNT, 'changed')
+    return ret
+
+
+def create_ownership_report(log: GitLog, head_paths: set = None) -> dict:
+    """
+    Creates the variables of the ownership section of the report. If
+    ``head_paths`` is given, only these files may be reported as orphaned.
+    """
+    m = OwnershipMatrix(log)
+    orphaned = m.orphaned_files(INACTIVE_DAYS, head_paths)
+    return {'bus_factor': m.bus_factor(BUS_FACTOR_COVERAGE),
+            'coverage_percent': int(BUS_FACTOR_COVERAGE * 100),
+            'directories': m.directory_bus_factors(1, BUS_FACTOR_COVERAGE)[:HOTSPOT_COUNT],
+            'inactive_days': INACTIVE_DAYS,
+            'inactive_authors': len(m.inactive_authors(INACTIVE_DAYS)),
+            'orphaned_count': len(orphaned),
+            'orphaned': orphaned[:HOTSPOT_COUNT]}
+
+
+def create_surviving_lines_report(surviving: SurvivingLines, author: GitAuthorName = None) -> dict:
+    """
+    Creates the variables of the surviving lines section of the report. If
+    ``author`` is None, the section lists all authors.
+    """
+    if author is None:
+        return {'total': surviving.total, 'others': surviving.others,
+                'authors': [(a, lines, surviving.share(a) * 100)
+                            for a, lines in surviving.authors()]}
+    else:
+        return {'total': surviving.total, 'lines': surviving.lines(author),
+                'percent': surviving.share(author) * 100,
+                'files': surviving.top_files(author, HOTSPOT_COUNT)}
+
+
 def basic_log_vars(log: GitLog):
     num_days = (log.max_date.date() - log.min_date.date()).days + 1
     commit_dates = set()
@@ -133,13 +223,13 @@ def basic_log_vars(log: GitLog):
             'author_count': len(log.authors)}
 
 
-def generate_histogram_image(h: DailyHistogram, start: date, end: date):
+def generate_histogram_image(h: HierarchicalHistogram, start: date, end: date):
     labels = [x for x in DateSequenceIterator(start, end)]
     added = []
     deleted = []
     commits = []
     for l in labels:
-        v = h[l]
+        v = h['day', l]
         added.append(v.added)
         deleted.append(v.deleted)
         commits.append(v.update_count)
@@ -156,44 +246,83 @@ def generate_histogram_image(h: DailyHistogram, start: date, end: date):
 FOUR_WEEKS_DELTA = timedelta(weeks=4)
 
 
-def generate_histogram(log: GitLog) -> str:
-
-    h = DailyHistogram(create_value_func=DiffSummaryValue.new)
-    # Compute the histogram
+def generate_activity_histogram(log: GitLog) -> HierarchicalHistogram:
+    """
+    Computes the activity histogram of the log in all levels.
+    """
+    h = HierarchicalHistogram(create_value_func=DiffSummaryValue.new,
+                              merge_value_func=DiffSummaryValue.merge)
     for commit in log:
         if commit.diff:
             h.update_entry(commit.timestamp, commit.diff)
-    histograms = []
-    start = find_previous_sunday(h.min_date)
-    while start < h.max_date:
-        end = start + ONE_WEEK_DELTA
-        histograms.append(
-            generate_histogram_image(h, start, end - ONE_DAY_TIME_DELTA))
-        start = end
-    return histograms
+    return h.build()
 
 
-def generate_weekly_histogram(log: GitLog) -> str:
+class DailyCharts:
+    """
+    This class implements the sequence of daily charts of each week of a
+    histogram. Weeks without activity are skipped. Each chart is only
+    generated when it is iterated, thus the charts are never kept in memory
+    all at once.
+    """
 
-    h = WeeklyHistogram(create_value_func=DiffSummaryValue.new)
-    # Compute the histogram
-    for commit in log:
-        if commit.diff:
-            h.update_entry(commit.timestamp, commit.diff)
+    def __init__(self, h: HierarchicalHistogram) -> None:
+        self._histogram = h
 
-    labels = h.keys()
+    def weeks(self) -> list:
+        """
+        Returns the first day of each week with activity.
+        """
+        h = self._histogram
+        return [start for start, v in h.level('week')] if h else []
+
+    def __len__(self) -> int:
+        return len(self.weeks())
+
+    def __iter__(self):
+        h = self._histogram
+        for start in self.weeks():
+            yield generate_histogram_image(h, start, start + ONE_WEEK_DELTA - ONE_DAY_TIME_DELTA)
+
+
+def generate_histogram(h: HierarchicalHistogram) -> DailyCharts:
+    """
+    Generates the daily charts of each week. Weeks without activity are
+    skipped.
+    """
+    return DailyCharts(h)
+
+
+LEVEL_TITLES = {
+    'year': 'Yearly',
+    'quarter': 'Quarterly',
+    'month': 'Monthly',
+    'week': 'Weekly',
+    'day': 'Daily',
+}
+
+
+def generate_level_histogram(h: HierarchicalHistogram, level: str):
+    """
+    Generates the chart of a given level of the histogram. All periods
+    between the first and the last entry are included.
+    """
+    labels = list(h.periods(level)) if h else []
     added = []
     deleted = []
     commits = []
     for l in labels:
-        v = h[l]
+        v = h[level, l]
         added.append(v.added)
         deleted.append(v.deleted)
         commits.append(v.update_count)
 
     line_chart = pygal.Bar(x_label_rotation=90, height=800, width=1600)
-    line_chart.title = f'Weekly activity from {h.min_date} to {h.max_date}'
-    line_chart.x_labels = map(str, labels)
+    if labels:
+        line_chart.title = f'{LEVEL_TITLES[level]} activity from {h.label(level, labels[0])} to {h.label(level, labels[-1])}'
+    else:
+        line_chart.title = f'{LEVEL_TITLES[level]} activity'
+    line_chart.x_labels = [h.label(level, l) for l in labels]
     line_chart.add('Added', added)
     line_chart.add('Deleted', deleted)
     line_chart.add('Commits', commits)
@@ -276,18 +405,53 @@ def create_pie_chart(values: Counter, title: str):
     return pie_chart.render_data_uri()
 
 
-def create_global_git_report(log: GitLog, all: bool) -> list:
+def count_file_types(diff: list, classifier: FileTypeClassifier = None) -> Tuple[Counter, Counter]:
+    """
+    Counts the files and the changed lines of each file type of the diff.
+    Renames are ignored. If ``classifier`` is None, the file types are
+    classified using the files of the diff as the context.
+    """
+    if classifier is None:
+        classifier = FileTypeClassifier(d.file_name for d in diff)
+    file_type_counter = Counter()
+    file_type_changes = Counter()
+    for d in diff:
+        if not d.rename:
+            t = classifier(d.file_name)
+            file_type_counter[t] += 1
+            if d.changed:
+                file_type_changes[t] += d.changed
+    return file_type_counter, file_type_changes
+
+
+def create_global_git_report(log: GitLog, all: bool, diff: GitDiff = None,
+                             classifier: FileTypeClassifier = None,
+                             head_paths: set = None) -> list:
+    """
+    Creates the variables of the diff report of the given log. If ``diff`` is
+    not None, it is used as the aggregated diff of the log instead of
+    computing it from the commits. If ``classifier`` is None, the file types
+    are classified using the files of the diff as the context. ``head_paths``
+    are the files at HEAD (it may be a ``LazyValue``), only they may be
+    reported as orphaned.
+
+    The charts, histograms and other sections are ``LazyValue`` instances,
+    thus they are only computed if the template uses them.
+    """
     b = GitDiffBuilder()
 
     basic_log = basic_log_vars(log)
 
     merges = 0
     for c in log:
-        b.add_diff(c.diff)
+        if diff is None:
+            b.add_diff(c.diff)
         if c.commit_type == GitCommitType.MERGE:
             merges += 1
 
-    diff = list(b.build())
+    if diff is None:
+        diff = b.build()
+    diff = list(diff)
     diff.sort(key=lambda x: x.file_name)
     added = 0
     deleted = 0
@@ -296,8 +460,6 @@ def create_global_git_report(log: GitLog, all: bool) -> list:
     renames = 0
     binaries = 0
     balance = 0
-    file_type_counter = Counter()
-    file_type_changes = Counter()
     for d in diff:
         added += d.added
         deleted += d.deleted
@@ -307,39 +469,44 @@ def create_global_git_report(log: GitLog, all: bool) -> list:
             added_only_lines += d.added
         if d.rename:
             renames += 1
-        else:
-            # TODO Improve this code later as it is too ugly
-            t = d.file_name.split('/')[-1].split('.')[-1].lower()
-            file_type_counter.update([t])
-            file_type_changes.update([t] * d.changed)
-
         if d.binary:
             binaries += 1
 
-    histo = generate_histogram(log)
-    weekly_histo = generate_weekly_histogram(log)
-
+    activity = LazyValue(generate_activity_histogram, log)
     # Author's statistics
-    authors_set, authors_histo = generate_weekly_author_histogram(log)
-    weekly_author_histo = generate_weekly_unique_author_histogram(
-        authors_histo)
+    authors_histo = LazyValue(generate_weekly_author_histogram, log)
     if all:
-        activity_csv = generate_weekly_author_activity(
-            authors_set, authors_histo)
+        activity_csv = LazyValue(
+            lambda x: generate_weekly_author_activity(*x), authors_histo)
+        ownership = LazyValue(create_ownership_report, log, head_paths)
     else:
         activity_csv = None
+        ownership = None
 
     mean_changes = float(added + deleted) / basic_log['days_with_commits']
+    tree = LazyValue(DirectoryTree, diff)
 
-    files_by_count = create_pie_chart(file_type_counter, 'File type count')
-    changes_by_type = create_pie_chart(
-        file_type_changes, 'Changes per file type')
+    file_types = LazyValue(count_file_types, diff, classifier)
+    files_by_count = LazyValue(
+        lambda x: create_pie_chart(x[0], 'File type count'), file_types)
+    changes_by_type = LazyValue(
+        lambda x: create_pie_chart(x[1], 'Changes per file type'), file_types)
 
     return {'diff': diff, 'total_added': added, 'total_deleted': deleted,
             'total_changed': added + deleted, 'mean_changes_per_day': mean_changes,
             'file_count': len(diff), 'added_only': added_only, 'added_only_lines': added_only_lines,
             'merges': merges, 'renames': renames, 'binaries': binaries, 'total_balance': balance,
             'files_by_count': files_by_count, 'changes_by_type': changes_by_type,
-            'histogram': histo, 'weekly_histo': weekly_histo,
-            'weekly_author_histo': weekly_author_histo, "activity_csv": activity_csv,
+            'directory_tree': tree, 'tree_depth': TREE_DEPTH,
+            'hotspots': LazyValue(create_hotspots, diff, tree, log if all else None),
+            'ownership': ownership,
+            'tree_children': TREE_CHILDREN,
+            'histogram': LazyValue(generate_histogram, activity),
+            'weekly_histo': LazyValue(generate_level_histogram, activity, 'week'),
+            'yearly_histo': LazyValue(generate_level_histogram, activity, 'year'),
+            'quarterly_histo': LazyValue(generate_level_histogram, activity, 'quarter'),
+            'monthly_histo': LazyValue(generate_level_histogram, activity, 'month'),
+            'weekly_author_histo': LazyValue(
+                lambda x: generate_weekly_unique_author_histogram(x[1]), authors_histo),
+            "activity_csv": activity_csv,
             **basic_log}
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import mimetypes
+from collections import OrderedDict
+from hashlib import sha1
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Lock
+from .engine import Engine, Options, STATIC_EXTENSIONS, TEMPLATE_DIR
+from .git.model import GitLog
+from .filetable import parse_shard_file_name
+from .branches import BRANCHES_FILE_NAME
+from .collaboration import COLLABORATION_JSON_FILE_NAME, COLLABORATION_GRAPHML_FILE_NAME
+
+from logging import getLogger
+LOGGER = getLogger(__name__)
+
+
+def content_type(name: str) -> str:
+    """
+    Returns the content type of the given file name.
+    """
+    if name.endswith('.graphml'):
+        return 'application/xml'
+    ret, encoding = mimetypes.guess_type(name)
+    if ret is None:
+        return 'application/octet-stream'
+    if ret.startswith('text/') or ret in ('application/json', 'application/javascript'):
+        return ret + '; charset=utf-8'
+    return ret
+
+
+class Page:
+    """
+    This class holds the contents of a page served by ``ReportServer``.
+    """
+    __slots__ = ('content', 'content_type', 'etag', 'attachments')
+
+    def __init__(self, content: bytes, content_type: str, attachments: dict = None) -> None:
+        self.content = content
+        self.content_type = content_type
+        self.etag = '"' + sha1(content).hexdigest() + '"'
+        # The files generated with the page (e.g. the shards of the file
+        # table) are kept with it.
+        self.attachments = attachments or {}
+
+
+class PageCache:
+    """
+    This class implements a thread-safe LRU cache of pages. Each page is
+    computed only once even if it is requested by multiple threads at the
+    same time.
+    """
+
+    def __init__(self, max_size: int = 64) -> None:
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._key_locks = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _get(self, key):
+        with self._lock:
+            page = self._entries.get(key, None)
+            if page is not None:
+                self._entries.move_to_end(key)
+            return page
+
+    def get(self, key, create_func) -> Page:
+        """
+        Returns the page associated with the given key. If it is not in the
+        cache, ``create_func()`` is called to create it.
+        """
+        page = self._get(key)
+        if page is not None:
+            return page
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, Lock())
+        with key_lock:
+            page = self._get(key)
+            if page is None:
+                page = create_func()
+                with self._lock:
+                    self._entries[key] = page
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+                    self._key_locks.pop(key, None)
+        return page
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """
+    The request handler used by ``ReportServer``. It supports conditional
+    requests based on the ETag of the pages.
+    """
+
+    def _send_page(self, send_body: bool):
+        name = self.path.split('?', 1)[0].lstrip('/')
+        page = self.server.report.get_page(name)
+        if page is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        if page.etag in self.headers.get('If-None-Match', ''):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', page.etag)
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', page.content_type)
+        self.send_header('Content-Length', str(len(page.content)))
+        self.send_header('ETag', page.etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(page.content)
+
+    def do_GET(self):
+        self._send_page(True)
+
+    def do_HEAD(self):
+        self._send_page(False)
+
+    def log_message(self, format, *args):
+        LOGGER.info(format % args)
+
+
+class ReportServer(Engine):
+    """
+    This engine loads the log once and serves the report pages over HTTP.
+    Each page is rendered only when it is requested for the first time
+    and kept in a LRU cache.
+
+    The log is never modified after it is loaded, thus it is shared by all
+    request threads.
+    """
+
+    def __init__(self, options: Options, port: int = 8000, host: str = 'localhost',
+                 cache_size: int = 64) -> None:
+        super().__init__(options)
+        self.port = port
+        self.host = host
+        self.cache = PageCache(cache_size)
+        self.log = None
+
+    def prepare_output_dir(self):
+        # Nothing is written into the output directory.
+        pass
+
+    def load(self, log: GitLog):
+        """
+        Replaces the log of the report. The previous log is closed.
+        """
+        if self.log is not None and self.log is not log:
+            self.log.close()
+        self.log = log
+        self.authors = {a.author_key: a for a in log.authors}
+        self.init_basic_template_vars()
+
+    def create_http_server(self) -> ThreadingHTTPServer:
+        server = ThreadingHTTPServer((self.host, self.port), ReportRequestHandler)
+        server.report = self
+        return server
+
+    def run_core(self):
+        self.load(self.get_git_log())
+        server = self.create_http_server()
+        LOGGER.info(f'Serving the report at http://{self.host}:{self.port}/')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            LOGGER.info('Server interrupted.')
+        finally:
+            server.server_close()
+            self.log.close()
+
+    def blame_cache_file(self) -> Path:
+        # Nothing is written into the output directory.
+        return None
+
+    def _html_page(self, template_name: str, file_name: str, vars: dict) -> Page:
+        outputs = self.render_outputs(template_name, file_name, vars)
+        attachments = {name: Page(content.encode('utf-8'), content_type(name))
+                       for name, content in outputs[1:]}
+        return Page(outputs[0][1].encode('utf-8'), 'text/html; charset=utf-8', attachments)
+
+    def _static_page(self, name: str) -> Page:
+        f = TEMPLATE_DIR / name
+        return Page(f.read_bytes(), content_type(name))
+
+    def create_page(self, name: str) -> Page:
+        """
+        Renders the page with the given name. The name must be accepted by
+        ``is_known_page()``.
+        """
+        if name == 'index.html':
+            return self._html_page('index.html', name, self.index_vars(self.log))
+        elif name == 'global_diff.html':
+            return self._html_page('global_diff.html', name, self.global_diff_vars(self.log))
+        elif name == BRANCHES_FILE_NAME:
+            return self._html_page('branches.html', name, self.branches_vars(
+                self.log, self.get_branch_refs()))
+        elif name.endswith('.html'):
+            author = self.authors[name[:-len('.html')]]
+            return self._html_page('author_diff.html', name, self.author_diff_vars(
+                author, self.log.by_author_name(author), self.log))
+        else:
+            return self._static_page(name)
+
+    def get_page(self, name: str) -> Page:
+        """
+        Returns the page with the given name from the cache. Returns None if
+        the page does not exist.
+        """
+        if name == '':
+            name = 'index.html'
+        parent = self.get_parent_page_name(name)
+        if parent is not None:
+            if not self.is_known_page(parent):
+                return None
+            return self.get_page(parent).attachments.get(name, None)
+        if not self.is_known_page(name):
+            return None
+        return self.cache.get(name, lambda: self.create_page(name))
+
+    def get_parent_page_name(self, name: str) -> str:
+        """
+        Returns the name of the page that generates the given file or None
+        if the file is not generated with a page.
+        """
+        if name in (COLLABORATION_JSON_FILE_NAME, COLLABORATION_GRAPHML_FILE_NAME):
+            return 'index.html'
+        shard = parse_shard_file_name(name)
+        if shard is not None:
+            return shard[0]
+        return None
+
+    def is_known_page(self, name: str) -> bool:
+        if name in ('index.html', 'global_diff.html', BRANCHES_FILE_NAME):
+            return True
+        if name.endswith('.html'):
+            return name[:-len('.html')] in self.authors
+        return '/' not in name and (TEMPLATE_DIR / name).suffix in STATIC_EXTENSIONS \
+            and (TEMPLATE_DIR / name).is_file()
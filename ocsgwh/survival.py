@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import heapq
+from .git.model import GitLog, GitAuthor, GitAuthorName
+
+
+class SurvivingLines:
+    """
+    This class aggregates the result of git blame into the number of lines
+    of the current tree written by each author of the log. Lines written by
+    identities that are not in the log (e.g. when the log is limited by
+    date) are counted as ``others``.
+    """
+
+    def __init__(self, log: GitLog, blame: dict) -> None:
+        self._names = {}
+        self._emails = {}
+        self._author_names = {}
+        for a in log.authors:
+            for identity in a.authors:
+                self._names[identity] = a
+                self._emails.setdefault(identity.email.lower(), a)
+                self._author_names.setdefault(identity.name, a)
+        self.total = 0
+        self.others = 0
+        self.by_author = {}
+        self._files = {}
+        for path, lines in blame.items():
+            for identity, count in lines.items():
+                self.total += count
+                author = self.author_name(identity)
+                if author is None:
+                    self.others += count
+                    continue
+                self.by_author[author] = self.by_author.get(author, 0) + count
+                files = self._files.setdefault(author, {})
+                files[path] = files.get(path, 0) + count
+
+    def author_name(self, identity: GitAuthor) -> GitAuthorName:
+        """
+        Returns the author of the log that matches the given identity or
+        None. As git blame applies the mailmap to the emails and git log
+        does not, identities that are not in the log are matched by email
+        and then by name.
+        """
+        ret = self._names.get(identity, None)
+        if ret is None:
+            ret = self._emails.get(identity.email.lower(), None) or \
+                self._author_names.get(identity.name, None)
+            self._names[identity] = ret
+        return ret
+
+    def __bool__(self) -> bool:
+        return self.total > 0
+
+    def lines(self, author: GitAuthorName) -> int:
+        return self.by_author.get(author, 0)
+
+    def share(self, author: GitAuthorName) -> float:
+        return self.lines(author) / self.total if self.total else 0.0
+
+    def authors(self) -> list:
+        """
+        Returns the authors with surviving lines as a list of tuples
+        ``(GitAuthorName, lines)`` sorted by the number of lines.
+        """
+        ret = list(self.by_author.items())
+        ret.sort(key=lambda x: x[1], reverse=True)
+        return ret
+
+    def top_files(self, author: GitAuthorName, k: int) -> list:
+        """
+        Returns the ``k`` files with most surviving lines of the author as a
+        list of tuples ``(path, lines)``.
+        """
+        return heapq.nlargest(k, self._files.get(author, {}).items(), key=lambda x: x[1])
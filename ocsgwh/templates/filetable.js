@@ -0,0 +1,119 @@
+// Table of changes per file with virtual scrolling, sorting and filtering.
+// The rows are loaded from the shards generated next to each page. Each
+// shard is a script that calls ocsgwhFileShard() with its rows.
+var fileTables = {};
+
+function ocsgwhFileShard(prefix, index, rows) {
+    var table = fileTables[prefix];
+    if (table) {
+        table.addShard(index, rows);
+    }
+}
+
+function FileTable(element) {
+    var self = this;
+    this.element = element;
+    this.prefix = element.dataset.prefix;
+    this.shardCount = parseInt(element.dataset.shards);
+    this.rowCount = parseInt(element.dataset.rows);
+    this.rows = [];
+    this.view = [];
+    this.rowHeight = 24;
+    this.sortColumn = 0;
+    this.sortAscending = true;
+    this.filter = "";
+    this.viewport = element.querySelector(".file_table_viewport");
+    this.spacer = element.querySelector(".file_table_spacer");
+    this.table = element.querySelector(".file_table_rows");
+    this.body = this.table.querySelector("tbody");
+    this.status = element.querySelector(".file_table_status");
+
+    this.viewport.addEventListener("scroll", function () { self.render(); });
+    element.querySelector(".file_table_filter").addEventListener("input", function (e) {
+        self.filter = e.target.value.toLowerCase();
+        self.update();
+    });
+    element.querySelectorAll("th[data-column]").forEach(function (th) {
+        th.addEventListener("click", function () {
+            self.sort(parseInt(th.dataset.column));
+        });
+    });
+    fileTables[this.prefix] = this;
+    this.loadShard(0);
+}
+
+FileTable.prototype.loadShard = function (index) {
+    if (index >= this.shardCount) {
+        return;
+    }
+    var script = document.createElement("script");
+    script.src = this.prefix + "." + index + ".js";
+    document.body.appendChild(script);
+};
+
+FileTable.prototype.addShard = function (index, rows) {
+    for (var i = 0; i < rows.length; i++) {
+        var r = rows[i];
+        // [name, added, deleted, changes, balance, update count, class]
+        this.rows.push([r[0], r[1], r[2], r[1] + r[2], r[1] - r[2], r[3], r[4]]);
+    }
+    // Sorting all rows for each shard would be too expensive.
+    if (index == 0 || index == this.shardCount - 1) {
+        this.update();
+    } else {
+        this.status.textContent = "Loading " + this.rows.length + " of " + this.rowCount + " files...";
+    }
+    this.loadShard(index + 1);
+};
+
+FileTable.prototype.sort = function (column) {
+    if (this.sortColumn == column) {
+        this.sortAscending = !this.sortAscending;
+    } else {
+        this.sortColumn = column;
+        this.sortAscending = true;
+    }
+    this.update();
+};
+
+FileTable.prototype.update = function () {
+    var filter = this.filter;
+    var column = this.sortColumn;
+    var order = this.sortAscending ? 1 : -1;
+    this.view = filter ? this.rows.filter(function (r) {
+        return r[0].toLowerCase().indexOf(filter) >= 0;
+    }) : this.rows.slice();
+    this.view.sort(function (a, b) {
+        return a[column] < b[column] ? -order : (a[column] > b[column] ? order : 0);
+    });
+    this.status.textContent = this.view.length + " of " + this.rowCount + " files";
+    this.render();
+};
+
+FileTable.prototype.render = function () {
+    var height = this.viewport.clientHeight;
+    var first = Math.floor(this.viewport.scrollTop / this.rowHeight);
+    var count = Math.ceil(height / this.rowHeight) + 1;
+    var last = Math.min(first + count, this.view.length);
+    var html = [];
+    for (var i = first; i < last; i++) {
+        var r = this.view[i];
+        html.push('<tr class="diff_' + r[6] + '">');
+        for (var j = 0; j < r.length; j++) {
+            html.push("<td>");
+            html.push(String(r[j]).replace(/&/g, "&amp;").replace(/</g, "&lt;"));
+            html.push("</td>");
+        }
+        html.push("</tr>");
+    }
+    this.body.innerHTML = html.join("");
+    if (this.body.rows.length > 0) {
+        this.rowHeight = this.body.rows[0].offsetHeight || this.rowHeight;
+    }
+    this.spacer.style.height = (this.view.length * this.rowHeight) + "px";
+    this.table.style.top = (first * this.rowHeight) + "px";
+};
+
+document.querySelectorAll(".file_table").forEach(function (element) {
+    new FileTable(element);
+});
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+import tempfile
+import asyncio
+import gzip
+from pathlib import Path
+from unittest.mock import patch
+from .async_engine import *
+from .test_utils import ROOT_DIR
+
+
+class TestFunctions(unittest.TestCase):
+
+    def test_read_line(self):
+        async def read_lines(data: bytes, limit: int) -> list:
+            stream = asyncio.StreamReader(limit)
+            stream.feed_data(data)
+            stream.feed_eof()
+            ret = []
+            while True:
+                line = await read_line(stream)
+                if not line:
+                    return ret
+                ret.append(line)
+        data = b'a\n' + b'b' * 100 + b'\n\nc' * 3
+        self.assertEqual(asyncio.run(read_lines(data, 8)), data.splitlines(True))
+        self.assertEqual(asyncio.run(read_lines(b'', 8)), [])
+
+
+@unittest.skipUnless((ROOT_DIR / '.git').is_dir(), 'The root of the project is not a git repository.')
+class TestAsyncEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.tmp_dir.name)
+        self.engine = AsyncEngine(
+            Options(ROOT_DIR, self.output_dir, 'test'), writers=2, queue_size=1)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parse_git_log_async(self):
+        log = asyncio.run(self.engine.parse_git_log_async())
+        exp = self.engine.parse_git_log()
+        self.assertEqual([c.id for c in log], [c.id for c in exp])
+        for c1, c2 in zip(log, exp):
+            self.assertEqual(list(c1.diff), list(c2.diff))
+
+    def test_run(self):
+        self.engine.run()
+        log = self.engine.parse_git_log()
+        self.assertTrue((self.output_dir / 'index.html').is_file())
+        self.assertTrue((self.output_dir / 'global_diff.html').is_file())
+        self.assertTrue((self.output_dir / 'branches.html').is_file())
+        self.assertTrue((self.output_dir / 'ocsgwh.css').is_file())
+        self.assertTrue((self.output_dir / 'global_diff.files.0.js').is_file())
+        for a in log.authors:
+            self.assertTrue(
+                (self.output_dir / (a.author_key + '.html')).is_file())
+
+    def test_run_gzip(self):
+        self.engine.options.gzip = True
+        self.engine.run()
+        for f in ('index.html', 'global_diff.html', 'global_diff.files.0.js', 'ocsgwh.css'):
+            self.assertEqual(gzip.decompress((self.output_dir / (f + '.gz')).read_bytes()),
+                             (self.output_dir / f).read_bytes())
+        self.assertFalse((self.output_dir / 'logo.png.gz').exists())
+
+        self.engine.options.gzip = False
+        self.engine.run()
+        self.assertEqual(list(self.output_dir.glob('*.gz')), [])
+
+    def test_run_incremental_gzip(self):
+        self.engine.options.incremental = True
+        self.engine.run()
+        self.assertEqual(list(self.output_dir.glob('*.gz')), [])
+        # The pages of the previous run must be compressed too
+        self.engine.options.gzip = True
+        self.engine.run()
+        for f in ('index.html', 'global_diff.html', 'global_diff.files.0.js'):
+            self.assertTrue((self.output_dir / (f + '.gz')).is_file())
+
+    def test_snapshot_scope(self):
+        file = self.output_dir / 'log.snapshot'
+        self.engine.options.paths = ['README.md']
+        self.engine.options.save_snapshot_file = file
+        exp = self.engine.get_git_log()
+        self.engine.options.save_snapshot_file = None
+        self.engine.options.load_snapshot_file = file
+        log = self.engine.get_git_log()
+        self.assertEqual([c.id for c in log], [c.id for c in exp])
+        log.close()
+        self.engine.options.paths = ['LICENSE']
+        self.assertRaises(EngineError, self.engine.get_git_log)
+
+    def test_report_pages_blame(self):
+        self.engine.options.incremental = True
+        self.engine.options.blame_workers = 1
+        self.engine.options.paths = ['README.md']
+        log = self.engine.parse_git_log()
+        self.engine.init_basic_template_vars()
+        self.engine.open_manifest()
+        # The pages are selected without blaming the files
+        with patch('ocsgwh.engine.blame_tree') as blame:
+            pages = list(self.engine.report_pages(log))
+            blame.assert_not_called()
+        self.assertEqual(len(pages), len(log.authors) + 3)
+
+    def test_report_pages_inputs(self):
+        self.engine.options.blame_workers = 1
+        self.engine.options.paths = ['README.md']
+        log = self.engine.parse_git_log()
+        self.engine.init_basic_template_vars()
+        engine = self.engine
+        # Without the manifest, the inputs of the fingerprints are not computed
+        with patch.object(engine, 'surviving_lines_fingerprint') as surviving, \
+                patch.object(engine, 'file_types_fingerprint') as file_types, \
+                patch.object(engine, 'get_head_paths') as head_paths:
+            pages = list(engine.report_pages(log))
+            surviving.assert_not_called()
+            file_types.assert_not_called()
+            head_paths.assert_not_called()
+        self.assertEqual(len(pages), len(log.authors) + 3)
+
+        # The surviving lines are fingerprinted once for all pages
+        engine.options.incremental = True
+        engine.open_manifest()
+        with patch.object(engine, 'surviving_lines_fingerprint',
+                          wraps=engine.surviving_lines_fingerprint) as surviving:
+            pages = list(engine.report_pages(log))
+            surviving.assert_called_once_with(log)
+        self.assertEqual(len(pages), len(log.authors) + 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
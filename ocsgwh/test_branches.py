@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+from datetime import datetime, timezone
+from .branches import *
+from .git.model import *
+
+ALICE = GitAuthor('alice@email.com', 'Alice')
+BOB = GitAuthor('bob@email.com', 'Bob')
+
+
+def create_commit(id: str, parents: list, day: int, author: GitAuthor, added: int) -> GitCommit:
+    b = GitDiffBuilder()
+    b.add_entry(f'{id}.txt', added, 0, False)
+    return GitCommit(id, parents, datetime(2021, 1, day, tzinfo=timezone.utc),
+                     author, b.build())
+
+
+def get_sample_log() -> GitLog:
+    # a - b - c ----- g    (main)
+    #      \         /
+    #       d - e - f      (merged)
+    #            \
+    #             h        (feature)
+    # x                    (tag only)
+    return GitLog([
+        create_commit('a', [], 1, ALICE, 1),
+        create_commit('b', ['a'], 2, ALICE, 2),
+        create_commit('c', ['b'], 3, ALICE, 4),
+        create_commit('d', ['b'], 4, BOB, 8),
+        create_commit('e', ['d'], 5, BOB, 16),
+        create_commit('f', ['e'], 6, BOB, 32),
+        create_commit('g', ['c', 'f'], 7, ALICE, 64),
+        create_commit('h', ['e'], 8, BOB, 128),
+        create_commit('x', [], 9, ALICE, 256),
+    ])
+
+
+class TestFunctions(unittest.TestCase):
+
+    def test_branch_refs(self):
+        self.assertEqual(branch_refs({
+            'refs/heads/main': 'a',
+            'refs/heads/feature/x': 'b',
+            'refs/remotes/origin/main': 'c',
+            'refs/remotes/origin/HEAD': 'c',
+            'refs/tags/v1': 'd',
+            'refs/stash': 'e'}),
+            {'main': 'a', 'feature/x': 'b', 'origin/main': 'c'})
+
+    def test_iter_bits(self):
+        self.assertEqual(list(iter_bits(0)), [])
+        self.assertEqual(list(iter_bits(0b101001)), [0, 3, 5])
+        self.assertEqual(list(iter_bits(1 << 2000)), [2000])
+
+    def test_reachability(self):
+        log = get_sample_log()
+        dag = log.dag
+        reach = reachability(dag, [dag.node('g'), dag.node('h')])
+        self.assertEqual([reach[dag.node(x)] for x in 'abcdefghx'],
+                         [3, 3, 1, 3, 3, 1, 1, 2, 0])
+
+
+class TestBranchReport(unittest.TestCase):
+
+    def setUp(self):
+        self.log = get_sample_log()
+        self.report = BranchReport(self.log, {
+            'main': 'g', 'merged': 'f', 'feature': 'h', 'missing': 'z'})
+
+    def test_branches(self):
+        r = self.report
+        self.assertEqual(len(r), 3)
+        self.assertEqual([b.name for b in r], ['feature', 'main', 'merged'])
+        self.assertEqual(r.unreachable, 1)
+        with self.assertRaises(KeyError):
+            r['missing']
+
+    def test_summary(self):
+        names = {a.name: a for a in self.log.authors}
+        main = self.report['main']
+        self.assertEqual(main.tip.id, 'g')
+        self.assertEqual(main.commits, 7)
+        self.assertEqual(main.unique_commits, 2)
+        self.assertEqual(main.added, 68)
+        self.assertEqual(main.changed, 68)
+        self.assertEqual(main.authors, [names['Alice']])
+        self.assertEqual(main.first_date.day, 3)
+        self.assertEqual(main.last_date.day, 7)
+
+        feature = self.report['feature']
+        self.assertEqual(feature.commits, 5)
+        self.assertEqual(feature.unique_commits, 1)
+        self.assertEqual(feature.added, 128)
+        self.assertEqual(feature.authors, [names['Bob']])
+
+        merged = self.report['merged']
+        self.assertEqual(merged.commits, 5)
+        self.assertEqual(merged.unique_commits, 0)
+        self.assertEqual(merged.authors, [])
+        self.assertIsNone(merged.first_date)
+
+    def test_same_tip(self):
+        names = {a.name: a for a in self.log.authors}
+        r = BranchReport(self.log, {
+            'main': 'g', 'origin/main': 'g', 'feature': 'h'})
+        self.assertEqual([b.name for b in r], ['feature', 'main, origin/main'])
+        main = r['origin/main']
+        self.assertIs(main, r['main'])
+        self.assertEqual(main.names, ['main', 'origin/main'])
+        self.assertEqual(main.commits, 7)
+        self.assertEqual(main.unique_commits, 3)
+        self.assertEqual(main.authors, [names['Alice'], names['Bob']])
+        self.assertEqual(main.first_date.day, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
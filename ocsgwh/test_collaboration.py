@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+from .collaboration import *
+from .git.model import *
+from .test_ownership import ALICE, BOB, CAROL, create_commit, get_sample_log
+
+
+class TestFunctions(unittest.TestCase):
+
+    def test_build_path_index(self):
+        authors = Interner()
+        index = build_path_index(get_sample_log(), authors, 0)
+        self.assertEqual(len(authors), 3)
+        self.assertEqual(len(index), 5)
+        self.assertEqual(len(index[('src/a.c', 0)]), 2)
+
+        index = build_path_index(get_sample_log(), Interner(), 365)
+        self.assertEqual(len(index[('src/a.c', date(2018, 1, 1).toordinal() // 365)]), 1)
+
+
+class TestCollaborationGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.log = get_sample_log()
+        self.names = {a.name: a for a in self.log.authors}
+
+    def test_whole_log(self):
+        g = CollaborationGraph(self.log, 0)
+        self.assertEqual(len(g), 2)
+        self.assertEqual(g.weight(self.names['Alice'], self.names['Bob']), 1)
+        self.assertEqual(g.weight(self.names['Carol'], self.names['Bob']), 1)
+        self.assertEqual(g.weight(self.names['Alice'], self.names['Carol']), 0)
+        self.assertEqual(g.degrees()[0], (self.names['Bob'], 2))
+
+    def test_window(self):
+        g = CollaborationGraph(self.log, 365)
+        self.assertEqual(g.weight(self.names['Alice'], self.names['Bob']), 0)
+        self.assertEqual(g.weight(self.names['Carol'], self.names['Bob']), 0)
+
+    def test_bounded(self):
+        authors = [GitAuthor(f'a{i}@email.com', f'Author {i}') for i in range(10)]
+        commits = [create_commit(i, a, 2021, [('hot.c', 1, 0, False)])
+                   for i, a in enumerate(authors)]
+        # Author 0 is the most active
+        commits.append(create_commit(100, authors[0], 2021, [('hot.c', 1, 0, False)]))
+        log = GitLog(commits)
+        self.assertEqual(len(CollaborationGraph(log, 0)), 45)
+        g = CollaborationGraph(log, 0, max_authors=3)
+        self.assertEqual(len(g), 3)
+        a0 = [a for a in log.authors if a.name == 'Author 0'][0]
+        self.assertEqual(sum(1 for a, b, w in g.top_pairs(3) if a0 in (a, b)), 2)
+
+    def test_exports(self):
+        g = CollaborationGraph(self.log, 0)
+        d = json.loads(g.to_json())
+        self.assertEqual(len(d['nodes']), 3)
+        self.assertEqual(len(d['edges']), 2)
+        self.assertEqual(d['edges'][0]['weight'], 1)
+
+        root = ElementTree.fromstring(g.to_graphml())
+        ns = {'g': GRAPHML_NAMESPACE}
+        self.assertEqual(len(root.findall('g:graph/g:node', ns)), 3)
+        self.assertEqual(len(root.findall('g:graph/g:edge', ns)), 2)
+        self.assertEqual([n for n, c in g.exports()], [
+            COLLABORATION_JSON_FILE_NAME, COLLABORATION_GRAPHML_FILE_NAME])
+
+
+if __name__ == '__main__':
+    unittest.main()
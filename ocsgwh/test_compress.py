@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+import tempfile
+from .compress import *
+
+
+class TestOutputCompressor(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_is_compressible(self):
+        self.assertTrue(is_compressible('a.html'))
+        self.assertTrue(is_compressible('a.files.0.js'))
+        self.assertFalse(is_compressible('a.png'))
+
+    def test_compress(self):
+        c = OutputCompressor(self.dir, 2)
+        c.submit('a.html', b'a' * 1000)
+        c.submit('b.css', b'b')
+        c.submit('c.png', b'c')
+        self.assertEqual(c.close(), 2)
+        self.assertEqual(gzip.decompress(
+            (self.dir / 'a.html.gz').read_bytes()), b'a' * 1000)
+        self.assertTrue((self.dir / 'b.css.gz').is_file())
+        self.assertFalse((self.dir / 'c.png.gz').exists())
+
+        c = OutputCompressor(self.dir)
+        c.submit('a.html', b'a' * 1000)
+        c.submit('b.css', b'b2')
+        self.assertEqual(c.close(), 1)
+        self.assertEqual(gzip.decompress(
+            (self.dir / 'b.css.gz').read_bytes()), b'b2')
+
+        # The compressed file is missing
+        (self.dir / 'a.html.gz').unlink()
+        c = OutputCompressor(self.dir)
+        c.submit('a.html', b'a' * 1000)
+        c.remove('b.css')
+        self.assertEqual(c.close(), 1)
+        self.assertFalse((self.dir / 'b.css.gz').exists())
+
+    def test_compress_file(self):
+        content = b'abc' * READ_BLOCK_SIZE
+        (self.dir / 'a.html').write_bytes(content)
+        c = OutputCompressor(self.dir)
+        c.submit_file('a.html')
+        c.submit_file('c.png')
+        self.assertEqual(c.close(), 1)
+        self.assertEqual(gzip.decompress((self.dir / 'a.html.gz').read_bytes()), content)
+
+        # Same index as the compression from the memory
+        c = OutputCompressor(self.dir)
+        c.submit('a.html', content)
+        self.assertEqual(c.close(), 0)
+
+    def test_invalid_index(self):
+        (self.dir / COMPRESSED_INDEX_FILE_NAME).write_text('invalid')
+        c = OutputCompressor(self.dir)
+        c.submit('a.html', b'a')
+        self.assertEqual(c.close(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+from .dirtree import *
+
+
+def get_sample_diff() -> list:
+    return [
+        GitDiffEntry('README.md', 10, 0, 1),
+        GitDiffEntry('src/a.c', 100, 50, 3),
+        GitDiffEntry('src/lib/b.c', 20, 10, 2),
+        GitDiffEntry('src/lib/c.c', 5, 5, 1),
+        GitDiffEntry('docs/index.md', 30, 0, 1),
+        GitDiffEntry('docs/{a => b}/x.md', 0, 0, 1),
+    ]
+
+
+class TestDirectoryTree(unittest.TestCase):
+
+    def test_build(self):
+        t = DirectoryTree(get_sample_diff())
+        self.assertEqual(t.root.file_count, 5)
+        self.assertEqual(t.root.added, 165)
+        self.assertEqual(t.root.deleted, 65)
+        self.assertEqual(t.root.update_count, 8)
+        self.assertEqual(set(t.root.children), set(['src', 'docs']))
+
+        src = t['src']
+        self.assertEqual(src.path, 'src')
+        self.assertEqual(src.depth, 1)
+        self.assertEqual(src.file_count, 3)
+        self.assertEqual(src.changed, 190)
+        self.assertEqual(src.balance, 60)
+
+        lib = t['src/lib']
+        self.assertEqual(lib.path, 'src/lib')
+        self.assertEqual(lib.depth, 2)
+        self.assertEqual(lib.file_count, 2)
+        self.assertEqual(lib.added, 25)
+        self.assertEqual(lib.deleted, 15)
+        self.assertEqual(lib.update_count, 3)
+        self.assertRaises(KeyError, t.__getitem__, 'src/other')
+
+    def test_walk(self):
+        t = DirectoryTree(get_sample_diff())
+        self.assertEqual([n.path for n in t.walk()], ['src', 'src/lib', 'docs'])
+        self.assertEqual([n.path for n in t.walk(1)], ['src', 'docs'])
+        self.assertEqual(list(DirectoryTree().walk()), [])
+
+    def test_top(self):
+        t = DirectoryTree(get_sample_diff())
+        self.assertEqual([n.path for n in t.top(2)], ['src', 'src/lib'])
+        self.assertEqual([n.path for n in t.top(5, 1)], ['src', 'docs'])
+        self.assertEqual([n.path for n in t.top(5, 2)], ['src/lib'])
+        self.assertEqual([n.path for n in t.root.top_children(1)], ['src'])
+
+
+if __name__ == '__main__':
+    unittest.main()
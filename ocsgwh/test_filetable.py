@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+import tempfile
+from .filetable import *
+from .git.model import GitDiffEntry
+
+
+class TestFunctions(unittest.TestCase):
+
+    def test_names(self):
+        prefix = file_table_prefix('global_diff.html')
+        self.assertEqual(prefix, 'global_diff.files')
+        self.assertEqual(shard_file_name(prefix, 3), 'global_diff.files.3.js')
+        self.assertEqual(parse_shard_file_name('global_diff.files.3.js'),
+                         ('global_diff.html', 3))
+        self.assertIsNone(parse_shard_file_name('global_diff.html'))
+        self.assertIsNone(parse_shard_file_name('filetable.js'))
+
+    def test_file_table_shards(self):
+        diff = [GitDiffEntry(f'f{i}', i, 1, 1) for i in range(5)]
+        shards = file_table_shards('p.files', diff, 2)
+        self.assertEqual([s[0] for s in shards],
+                         ['p.files.0.js', 'p.files.1.js', 'p.files.2.js'])
+        self.assertEqual(shards[2][1],
+                         'ocsgwhFileShard("p.files",2,[["f4",4,1,1,"normal"]]);\n')
+        self.assertEqual(file_table_shards('p.files', []), [])
+
+    def test_remove_file_shards(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dir = Path(tmp_dir)
+            names = ['a.files.0.js', 'a.files.1.js', 'a.files.2.js', 'a.html',
+                     'b.files.0.js', 'a.files.x.files.0.js']
+            for n in names:
+                (dir / n).write_text('')
+            remove_file_shards(dir, 'a.files', 1)
+            self.assertEqual(sorted(f.name for f in dir.iterdir()),
+                             ['a.files.0.js', 'a.files.x.files.0.js', 'a.html', 'b.files.0.js'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+from .filetypes import *
+
+
+class TestFunctions(unittest.TestCase):
+
+    def test_split_path(self):
+        self.assertEqual(split_path('a'), ('', 'a'))
+        self.assertEqual(split_path('a/b/c.txt'), ('a/b', 'c.txt'))
+
+    def test_file_extension(self):
+        self.assertEqual(file_extension('a.TXT'), 'txt')
+        self.assertEqual(file_extension('a.tar.gz'), 'gz')
+        self.assertEqual(file_extension('Makefile'), '')
+        self.assertEqual(file_extension('.bashrc'), '')
+
+    def test_file_type(self):
+        self.assertEqual(file_type('src/main.py'), 'Python')
+        self.assertEqual(file_type('src/Main.JAVA'), 'Java')
+        self.assertEqual(file_type('Makefile'), 'Makefile')
+        self.assertEqual(file_type('a/Makefile.am'), 'Makefile')
+        self.assertEqual(file_type('docker/Dockerfile'), 'Dockerfile')
+        self.assertEqual(file_type('docker/Dockerfile.dev'), 'Dockerfile')
+        self.assertEqual(file_type('CMakeLists.txt'), 'CMake')
+        self.assertEqual(file_type('notes.txt'), 'Text')
+        self.assertEqual(file_type('types/index.d.ts'), 'TypeScript')
+        self.assertEqual(file_type('dist/app.min.js'), 'JavaScript (minified)')
+        self.assertEqual(file_type('app.js'), 'JavaScript')
+        self.assertEqual(file_type('.gitignore'), 'Git')
+        self.assertEqual(file_type('.bashrc'), OTHER_FILE_TYPE)
+        self.assertEqual(file_type('bin/tool'), OTHER_FILE_TYPE)
+        self.assertEqual(file_type('a.unknown'), OTHER_FILE_TYPE)
+
+
+class TestFileTypeClassifier(unittest.TestCase):
+
+    def test_classify(self):
+        c = FileTypeClassifier(['c/a.c', 'c/a.h', 'cpp/a.cpp', 'cpp/a.h',
+                                'objc/a.m', 'objc/a.h', 'matlab/a.m', 'matlab/a.mat'])
+        self.assertEqual(c('c/a.h'), 'C')
+        self.assertEqual(c('cpp/a.h'), 'C++')
+        self.assertEqual(c('objc/a.h'), 'Objective-C')
+        self.assertEqual(c('objc/a.m'), 'Objective-C')
+        self.assertEqual(c('matlab/a.m'), 'MATLAB')
+        self.assertEqual(c('other/a.h'), 'C')
+        self.assertEqual(c('cpp/a.cpp'), 'C++')
+
+    def test_add_path(self):
+        c = FileTypeClassifier()
+        c.add_path('a.hpp')
+        self.assertEqual(c('a.h'), 'C++')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -363,6 +363,14 @@ class WeekHistogramTest(unittest.TestCase):
                 datetime(d.year, d.month, d.day, 12, 0)), exp)
             self.assertRaises(ValueError, h.group_key, 'afdsd')
 
+    def test_first_weekday(self):
+        h = WeeklyHistogram(first_weekday=MONDAY)
+        for d in DateSequenceIterator(date(2256, 3, 9), date(2256, 4, 9)):
+            exp = find_previous_sunday(d) + ONE_DAY_DELTA
+            if exp > d:
+                exp -= ONE_WEEK_DELTA
+            self.assertEqual(h.group_key(d), exp)
+
 
 class TestFunctions(unittest.TestCase):
 
@@ -379,6 +387,153 @@ class TestFunctions(unittest.TestCase):
             self.assertEqual(v.isoweekday(), 7)
             d = d + ONE_DAY_DELTA
 
+    def test_civil_from_ordinal(self):
+        d = date(1600, 1, 1)
+        while d < date(2401, 1, 1):
+            o = d.toordinal()
+            self.assertEqual(civil_from_ordinal(o), (d.year, d.month, d.day))
+            self.assertEqual(ordinal_from_civil(d.year, d.month, d.day), o)
+            d = d + timedelta(days=13)
+        self.assertEqual(date(1970, 1, 1).toordinal(), EPOCH_ORDINAL)
+
+    def test_ordinals_from_timestamps(self):
+        self.assertEqual(list(ordinals_from_timestamps([0, 86399, 86400])), [
+            EPOCH_ORDINAL, EPOCH_ORDINAL, EPOCH_ORDINAL + 1])
+        self.assertEqual(list(ordinals_from_timestamps([0, 0], [-1, 86400])), [
+            EPOCH_ORDINAL - 1, EPOCH_ORDINAL + 1])
+
+
+class TestCalendarUnit(unittest.TestCase):
+
+    def check_unit(self, unit: CalendarUnit):
+        d = date(1984, 12, 1)
+        ordinals = []
+        while d < date(1987, 3, 1):
+            o = d.toordinal()
+            ordinals.append(o)
+            i = unit.index(o)
+            self.assertLessEqual(unit.start(i), o)
+            self.assertLess(o, unit.start(i + 1))
+            self.assertEqual(unit.index(unit.start(i)), i)
+            d = d + ONE_DAY_DELTA
+        self.assertEqual(list(unit.assign(ordinals)),
+                         [unit.index(o) for o in ordinals])
+
+    def test_units(self):
+        for unit in (DayUnit(), WeekUnit(), WeekUnit(MONDAY), MonthUnit(),
+                     QuarterUnit(), QuarterUnit(2), YearUnit(), YearUnit(7)):
+            self.check_unit(unit)
+
+    def test_week(self):
+        d = date(1985, 10, 26)
+        self.assertEqual(WeekUnit().start_date(
+            WeekUnit().date_index(d)), date(1985, 10, 20))
+        self.assertEqual(WeekUnit(MONDAY).start_date(
+            WeekUnit(MONDAY).date_index(d)), date(1985, 10, 21))
+        self.assertRaises(ValueError, WeekUnit, 0)
+        self.assertRaises(ValueError, WeekUnit, 8)
+
+    def test_month_periods(self):
+        d = datetime(1985, 10, 26, 1, 21)
+        for unit, start, label in (
+                (MonthUnit(), date(1985, 10, 1), '1985-10'),
+                (QuarterUnit(), date(1985, 10, 1), '1985-Q4'),
+                (QuarterUnit(2), date(1985, 8, 1), '1985-08-01'),
+                (YearUnit(), date(1985, 1, 1), '1985'),
+                (YearUnit(7), date(1985, 7, 1), 'FY1986')):
+            i = unit.date_index(d)
+            self.assertEqual(unit.start_date(i), start)
+            self.assertEqual(unit.label(i), label)
+        self.assertRaises(ValueError, MonthPeriodUnit, 1, 13)
+
+
+class TestHierarchicalHistogram(unittest.TestCase):
+
+    def create_sample(self):
+        h = HierarchicalHistogram()
+        h.update_entry(date(1985, 10, 26), 1)
+        h.update_entry(datetime(1985, 10, 26, 1, 21), 2)
+        h.update_entry(date(1985, 10, 27), 4)
+        h.update_entry(date(1955, 11, 5), 8)
+        h.update_entry(date(2015, 10, 21), 16)
+        return h.build()
+
+    def test_empty(self):
+        h = HierarchicalHistogram().build()
+        self.assertFalse(h)
+        for l in HierarchicalHistogram.LEVELS:
+            self.assertEqual(h.level(l), [])
+
+    def test_lazy_levels(self):
+        h = self.create_sample()
+        self.assertEqual(h[('week', date(1985, 10, 27))], 4)
+        self.assertEqual(set(h._levels), set(['day', 'week']))
+        # Updates after build() discard the aggregated levels
+        h.update_entry(date(1985, 10, 28), 32)
+        h.build()
+        self.assertEqual(h[('week', date(1985, 10, 27))], 36)
+
+    def test_levels(self):
+        h = self.create_sample()
+        self.assertTrue(h)
+        self.assertEqual(h.min_date, date(1955, 11, 5))
+        self.assertEqual(h.max_date, date(2015, 10, 21))
+
+        self.assertEqual(h.level('day'), [
+            (date(1955, 11, 5), 8), (date(1985, 10, 26), 3),
+            (date(1985, 10, 27), 4), (date(2015, 10, 21), 16)])
+        self.assertEqual(h.level('week'), [
+            (date(1955, 10, 30), 8), (date(1985, 10, 20), 3),
+            (date(1985, 10, 27), 4), (date(2015, 10, 18), 16)])
+        self.assertEqual(h.level('month'), [
+            (date(1955, 11, 1), 8), (date(1985, 10, 1), 7), (date(2015, 10, 1), 16)])
+        self.assertEqual(h.level('quarter'), [
+            (date(1955, 10, 1), 8), (date(1985, 10, 1), 7), (date(2015, 10, 1), 16)])
+        self.assertEqual(h.level('year'), [
+            (date(1955, 1, 1), 8), (date(1985, 1, 1), 7), (date(2015, 1, 1), 16)])
+
+        self.assertEqual(h['year', date(1985, 1, 1)], 7)
+        self.assertEqual(h['year', date(1986, 1, 1)], 0)
+
+    def test_periods(self):
+        h = self.create_sample()
+        years = list(h.periods('year'))
+        self.assertEqual(len(years), 2015 - 1955 + 1)
+        self.assertEqual(years[0], date(1955, 1, 1))
+        self.assertEqual(years[-1], date(2015, 1, 1))
+
+        months = list(h.periods('month', date(1985, 10, 26), date(1986, 2, 1)))
+        self.assertEqual(months, [date(1985, 10, 1), date(1985, 11, 1), date(1985, 12, 1),
+                                  date(1986, 1, 1), date(1986, 2, 1)])
+
+    def test_children(self):
+        h = self.create_sample()
+        self.assertEqual(h.children('year', date(1985, 1, 1)), [
+            (date(1985, 10, 1), 7)])
+        self.assertEqual(h.children('month', date(1985, 10, 1)), [
+            (date(1985, 10, 20), 3), (date(1985, 10, 27), 4)])
+        self.assertEqual(h.children('week', date(1985, 10, 20)), [
+            (date(1985, 10, 26), 3)])
+        self.assertEqual(h.children('year', date(1986, 1, 1)), [])
+        # The periods of these levels are nested, thus the drill-down of all
+        # periods returns the whole child level. Weeks may start in a month
+        # without entries.
+        for parent, child in (('year', 'quarter'), ('quarter', 'month'), ('week', 'day')):
+            self.assertEqual([e for p, v in h.level(parent) for e in h.children(parent, p)],
+                             h.level(child))
+
+    def test_units(self):
+        h = HierarchicalHistogram(units={
+            'week': WeekUnit(MONDAY), 'year': YearUnit(7)})
+        h.update_entry(date(1985, 10, 27), 1)
+        h.update_entry(date(1986, 7, 1), 2)
+        h.build()
+        self.assertEqual(h.level('week'), [
+            (date(1985, 10, 21), 1), (date(1986, 6, 30), 2)])
+        self.assertEqual(h.level('year'), [
+            (date(1985, 7, 1), 1), (date(1986, 7, 1), 2)])
+        self.assertEqual(h.label('year', date(1985, 10, 27)), 'FY1986')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+from unittest.mock import MagicMock
+from jinja2 import Environment
+from .lazy import *
+
+
+class TestLazyValue(unittest.TestCase):
+
+    def test_value(self):
+        func = MagicMock(return_value=[1, 2, 3])
+        v = LazyValue(func, 'a', 1)
+        self.assertFalse(v.evaluated)
+        func.assert_not_called()
+        self.assertEqual(v.value, [1, 2, 3])
+        self.assertEqual(v.value, [1, 2, 3])
+        self.assertTrue(v.evaluated)
+        func.assert_called_once_with('a', 1)
+
+    def test_lazy_arguments(self):
+        func = MagicMock(return_value=2)
+        shared = LazyValue(func)
+        a = LazyValue(lambda x: x * 2, shared)
+        b = LazyValue(lambda x: x * 3, shared)
+        self.assertEqual(a.value, 4)
+        self.assertEqual(b.value, 6)
+        func.assert_called_once_with()
+
+    def test_proxy(self):
+        v = LazyValue(lambda: {'a': 1, 'b': 2})
+        self.assertEqual(v['a'], 1)
+        self.assertEqual(len(v), 2)
+        self.assertTrue('a' in v)
+        self.assertEqual(sorted(v), ['a', 'b'])
+        self.assertEqual(list(v.keys()), ['a', 'b'])
+        self.assertTrue(v)
+        self.assertFalse(LazyValue(list))
+        self.assertEqual(str(LazyValue(lambda: 10)), '10')
+
+    def test_template(self):
+        env = Environment(autoescape=True)
+        t = env.from_string(
+            '{{ s }}|{{ d.a }}|{{ d.x is defined }}|{% for i in l %}{{ i }}{% endfor %}|'
+            '{{ l|length }}|{% if e %}e{% endif %}')
+        unused = LazyValue(MagicMock())
+        self.assertEqual(t.render(s=LazyValue(lambda: '<b>'), d=LazyValue(lambda: {'a': 1}),
+                                  l=LazyValue(lambda: [1, 2]), e=LazyValue(list), u=unused),
+                         '&lt;b&gt;|1|False|12|2|')
+        self.assertFalse(unused.evaluated)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+import tempfile
+from .manifest import *
+
+
+class TestFunctions(unittest.TestCase):
+
+    def test_fingerprint(self):
+        self.assertEqual(fingerprint('a', ['b', 'c']),
+                         fingerprint('a', iter(['b', 'c'])))
+        self.assertEqual(fingerprint(b'a'), fingerprint('a'))
+        self.assertNotEqual(fingerprint('a', 'b'), fingerprint('ab'))
+        self.assertNotEqual(fingerprint(['a', 'b']), fingerprint(['ab']))
+
+
+class TestOutputManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_update(self):
+        m = OutputManifest(self.dir)
+        self.assertTrue(m.update('a.html', '1'))
+        # The output file does not exist yet
+        self.assertTrue(m.update('a.html', '1'))
+        (self.dir / 'a.html').write_text('a')
+        self.assertFalse(m.update('a.html', '1'))
+        self.assertTrue(m.update('a.html', '2'))
+        m.save()
+
+        m = OutputManifest(self.dir)
+        self.assertTrue('a.html' in m)
+        self.assertEqual(m['a.html'], '2')
+        self.assertFalse(m.update('a.html', '2'))
+
+    def test_stale_files(self):
+        m = OutputManifest(self.dir)
+        m.update('a.html', '1')
+        m.update('b.html', '1')
+        m.save()
+
+        m = OutputManifest(self.dir)
+        m.update('b.html', '1')
+        self.assertEqual(m.stale_files(), ['a.html'])
+        m.remove('a.html')
+        self.assertFalse('a.html' in m)
+
+    def test_invalid(self):
+        (self.dir / MANIFEST_FILE_NAME).write_text('invalid')
+        m = OutputManifest(self.dir)
+        self.assertFalse('a.html' in m)
+
+
+if __name__ == '__main__':
+    unittest.main()
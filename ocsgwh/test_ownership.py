@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+from datetime import datetime, timezone
+from .ownership import *
+from .git.model import *
+from .git.test_model import get_sample_git_log
+
+ALICE = GitAuthor('alice@email.com', 'Alice')
+BOB = GitAuthor('bob@email.com', 'Bob')
+CAROL = GitAuthor('carol@email.com', 'Carol')
+
+
+def create_commit(n: int, author: GitAuthor, year: int, entries: list) -> GitCommit:
+    b = GitDiffBuilder()
+    for e in entries:
+        b.add_entry(*e)
+    return GitCommit(f'{n:040x}', [], datetime(year, 1, 1, tzinfo=timezone.utc),
+                     author, b.build())
+
+
+def get_sample_log() -> GitLog:
+    return GitLog([
+        create_commit(1, ALICE, 2018, [('src/a.c', 60, 0, False), ('old/x.c', 10, 0, False)]),
+        create_commit(2, BOB, 2020, [('src/a.c', 20, 20, False), ('src/b.c', 10, 0, False)]),
+        create_commit(3, CAROL, 2021, [('src/b.c', 5, 5, False), ('doc/img.png', 0, 0, True)]),
+        create_commit(4, BOB, 2021, [('README.md', 10, 0, False)]),
+    ])
+
+
+class TestFunctions(unittest.TestCase):
+
+    def test_interner(self):
+        i = Interner()
+        self.assertEqual(i.intern('a'), 0)
+        self.assertEqual(i.intern('b'), 1)
+        self.assertEqual(i.intern('a'), 0)
+        self.assertEqual(len(i), 2)
+        self.assertEqual(i.id('b'), 1)
+        self.assertTrue('a' in i)
+        self.assertFalse('c' in i)
+
+    def test_bus_factor(self):
+        self.assertEqual(bus_factor({}), 0)
+        self.assertEqual(bus_factor({'a': 60, 'b': 30, 'c': 10}), 1)
+        self.assertEqual(bus_factor({'a': 40, 'b': 30, 'c': 30}), 2)
+        self.assertEqual(bus_factor({'a': 40, 'b': 30, 'c': 30}, 0.9), 3)
+
+
+class TestOwnershipMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.log = get_sample_log()
+        self.m = OwnershipMatrix(self.log)
+        self.names = {a.name: a for a in self.log.authors}
+
+    def test_build(self):
+        m = self.m
+        self.assertEqual(len(m.paths), 5)
+        self.assertEqual(len(m.authors), 3)
+        # Non-zero entries
+        self.assertEqual(len(m), 7)
+        self.assertEqual(m.row('src/a.c'), {self.names['Alice']: 60, self.names['Bob']: 40})
+        self.assertEqual(m.row('doc/img.png'), {self.names['Carol']: 1})
+
+    def test_shares(self):
+        m = self.m
+        self.assertEqual(m.file_shares('src/a.c'), [
+            (self.names['Alice'], 0.6), (self.names['Bob'], 0.4)])
+        self.assertEqual(m.directory_shares('src'), [
+            (self.names['Alice'], 0.5), (self.names['Bob'], 50 / 120),
+            (self.names['Carol'], 10 / 120)])
+        self.assertEqual(m.directory_shares('missing'), [])
+
+    def test_bus_factor(self):
+        m = self.m
+        self.assertEqual(m.bus_factor(), 2)
+        self.assertEqual(m.file_bus_factor('src/a.c'), 1)
+        self.assertEqual(m.directory_bus_factors(), [
+            ('src', 1, 120), ('old', 1, 10), ('doc', 1, 1)])
+
+    def test_orphaned_files(self):
+        m = self.m
+        self.assertEqual(m.inactive_authors(), set([m.authors.id(self.names['Alice'])]))
+        self.assertEqual(m.orphaned_files(), [('old/x.c', 10)])
+        self.assertEqual(m.orphaned_files(10000), [])
+        # Removed files are not orphaned
+        self.assertEqual(m.orphaned_files(existing={'src/a.c', 'src/b.c'}), [])
+        self.assertEqual(m.orphaned_files(existing={'old/x.c'}), [('old/x.c', 10)])
+        self.assertEqual(OwnershipMatrix().orphaned_files(), [])
+
+    def test_owned_files(self):
+        m = self.m
+        self.assertEqual(m.owned_files(self.names['Alice']), [
+            ('old/x.c', 1.0), ('src/a.c', 0.6)])
+
+    def test_sample_log(self):
+        log = get_sample_git_log()
+        m = OwnershipMatrix(log)
+        self.assertEqual(len(m.authors), len(log.authors))
+        self.assertGreater(m.bus_factor(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
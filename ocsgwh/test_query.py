@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+from collections import Counter, defaultdict
+from datetime import datetime, date
+from .query import *
+from .git.model import GitLog, GitCommit, GitAuthor, GitDiff, GitDiffEntry, GitCommitType
+from .git.test_model import get_sample_git_log
+from .filetypes import file_type
+
+ALICE = GitAuthor('alice@example.com', 'Alice')
+BOB = GitAuthor('bob@example.com', 'Bob')
+
+
+def get_query_log():
+    return GitLog([
+        GitCommit('1', [], datetime(2021, 1, 4, 10), ALICE, GitDiff([
+            GitDiffEntry('README.md', 10, 0),
+            GitDiffEntry('src/main.c', 100, 0)])),
+        GitCommit('2', ['1'], datetime(2021, 1, 5, 10), BOB, GitDiff([
+            GitDiffEntry('src/main.c', 5, 2),
+            GitDiffEntry('src/util.c', 20, 0)])),
+        GitCommit('3', ['2'], datetime(2021, 1, 12, 10), ALICE, GitDiff([
+            GitDiffEntry('src/util.c', 1, 1)])),
+        GitCommit('4', ['3', '2'], datetime(2021, 2, 1, 10), BOB, GitDiff([]))])
+
+
+class TestLogColumns(unittest.TestCase):
+
+    def test_columns(self):
+        c = LogColumns(get_query_log())
+        # The merge without changes has a single row
+        self.assertEqual(len(c), 6)
+        self.assertEqual(c.commit_count, 4)
+        self.assertEqual(list(c.commit), [0, 0, 1, 1, 2, 3])
+        self.assertEqual(list(c.path), [0, 1, 1, 2, 2, NO_PATH])
+        self.assertEqual(list(c.column('changed')), [10, 100, 7, 20, 2, 0])
+        self.assertEqual([c.decode('directory', k) for k in c.column('directory')[:-1]],
+                         ['', 'src', 'src', 'src', 'src'])
+        self.assertEqual(c.column('directory')[-1], NO_PATH)
+        self.assertEqual(c.decode('file_type', c.column('file_type')[0]),
+                         file_type('README.md'))
+        self.assertEqual(c.decode('month', c.column('month')[-1]), date(2021, 2, 1))
+        self.assertEqual(c.decode('commit_type', c.column('commit_type')[-1]),
+                         GitCommitType.MERGE)
+        self.assertIs(c.column('week'), c.column('week'))
+        with self.assertRaises(ValueError):
+            c.column('unknown')
+
+
+class TestGroupBy(unittest.TestCase):
+
+    def test_group_by(self):
+        log = get_query_log()
+        q = log.group_by('author', 'month').sum('added', 'deleted').count()
+        self.assertEqual(q.fields, ('author', 'month', 'added', 'deleted', 'count'))
+        rows = [(r.author.name, r.month, r.added, r.deleted, r.count) for r in q]
+        self.assertEqual(rows, [
+            ('Alice', date(2021, 1, 1), 111, 1, 2),
+            ('Bob', date(2021, 1, 1), 25, 2, 1),
+            ('Bob', date(2021, 2, 1), 0, 0, 1)])
+        self.assertIs(log.columns, log.columns)
+        with self.assertRaises(ValueError):
+            q.count()
+
+    def test_path_dimensions(self):
+        log = get_query_log()
+        # The merge has no changes, thus it is not in any directory
+        self.assertEqual(log.group_by('directory').count().to_dict(),
+                         {'': 1, 'src': 3})
+        self.assertEqual(log.group_by('path').sum('changed').count_distinct('author').to_dict(),
+                         {'README.md': (10, 1), 'src/main.c': (107, 2), 'src/util.c': (22, 2)})
+        self.assertEqual(log.group_by('week').count_distinct('path').to_dict(),
+                         {date(2021, 1, 3): 3, date(2021, 1, 10): 1, date(2021, 1, 31): 0})
+
+    def test_no_dimensions(self):
+        log = get_query_log()
+        self.assertEqual(log.group_by().sum('added').count().to_dict(), {(): (136, 4)})
+        self.assertEqual(log.group_by('commit_type').count().to_dict(), {
+            GitCommitType.ROOT: 1, GitCommitType.NORMAL: 2, GitCommitType.MERGE: 1})
+
+    def test_invalid(self):
+        log = get_query_log()
+        with self.assertRaises(ValueError):
+            log.group_by('unknown')
+        with self.assertRaises(ValueError):
+            log.group_by('author').sum('author')
+        with self.assertRaises(ValueError):
+            log.group_by('author').count_distinct('added')
+
+    def test_sample_log(self):
+        log = get_sample_git_log()
+        expected = defaultdict(lambda: [0, 0, set()])
+        for c in log:
+            for d in c.diff:
+                e = expected[(c.timestamp.date(), file_type(d.file_name))]
+                e[0] += d.added
+                e[1] += d.deleted
+                e[2].add(c.id)
+        expected = {k: (v[0], v[1], len(v[2])) for k, v in expected.items()}
+        q = log.group_by('day', 'file_type').sum('added', 'deleted').count()
+        self.assertEqual(q.to_dict(), expected)
+        authors = Counter(c.author for c in log)
+        for r in log.group_by('author').count():
+            self.assertEqual(r.count, sum(authors[a] for a in r.author.authors))
+
+
+if __name__ == '__main__':
+    unittest.main()
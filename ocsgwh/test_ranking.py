@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+from .ranking import *
+from .git.model import GitDiffEntry
+from .test_dirtree import get_sample_diff
+
+
+class TestFunctions(unittest.TestCase):
+
+    def test_ranking_key(self):
+        e = GitDiffEntry('a', 3, 1, 2)
+        self.assertEqual(ranking_key('changed')(e), 4)
+        self.assertEqual(ranking_key('balance')(e), 2)
+        self.assertEqual(ranking_key('update_count')(e), 2)
+        self.assertEqual(ranking_key(len)('abc'), 3)
+        self.assertRaises(ValueError, ranking_key, 'unknown')
+
+    def test_top_k(self):
+        self.assertEqual(top_k(range(100), 3, lambda x: x), [99, 98, 97])
+        self.assertEqual(top_k(range(100), 3, lambda x: x, lowest=True), [0, 1, 2])
+        self.assertEqual(top_k([], 3), [])
+
+    def test_top_files(self):
+        diff = get_sample_diff()
+        self.assertEqual([d.file_name for d in top_files(diff, 3)][0], 'src/a.c')
+        self.assertEqual(set(d.file_name for d in top_files(diff, 3)[1:]),
+                         set(['src/lib/b.c', 'docs/index.md']))
+        self.assertEqual([d.file_name for d in top_files(diff, 2, 'update_count')],
+                         ['src/a.c', 'src/lib/b.c'])
+        self.assertEqual([d.file_name for d in top_files(diff, 1, 'balance', lowest=True)],
+                         ['src/lib/c.c'])
+        self.assertEqual(len(top_files(diff, 10)), 5)
+
+    def test_top_directories(self):
+        tree = DirectoryTree(get_sample_diff())
+        self.assertEqual([n.path for n in top_directories(tree, 2)],
+                         ['src', 'src/lib'])
+        self.assertEqual([n.path for n in top_directories(tree, 1, 'balance', 1)],
+                         ['src'])
+
+    def test_top_authors(self):
+        summaries = [('a', GitDiffEntry('a', 1, 1, 5)), ('b', GitDiffEntry('b', 5, 5, 1))]
+        self.assertEqual([a for a, v in top_authors(summaries, 1)], ['b'])
+        self.assertEqual([a for a, v in top_authors(summaries, 1, 'update_count')], ['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
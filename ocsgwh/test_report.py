@@ -74,3 +74,86 @@ class TestDiffSummaryValue(unittest.TestCase):
         self.assertEqual(v.update_count, 3)
         self.assertEqual(v.changed, 12)
         self.assertEqual(id(v), id(uv))
+
+    def test_merge(self):
+        v = DiffSummaryValue(1, 2)
+        v.update_count = 3
+        uv = v
+        v = v.merge(DiffSummaryValue(1, 2))
+        self.assertEqual(v.added, 2)
+        self.assertEqual(v.deleted, 4)
+        self.assertEqual(v.update_count, 3)
+        self.assertEqual(id(v), id(uv))
+
+
+class TestFunctions(unittest.TestCase):
+
+    def test_generate_activity_histogram(self):
+        log = get_sample_git_log()
+        h = generate_activity_histogram(log)
+        commits = [c for c in log if c.diff]
+        for l in HierarchicalHistogram.LEVELS:
+            entries = h.level(l)
+            self.assertEqual(sum(v.added for k, v in entries),
+                             sum(c.diff.added for c in commits))
+            self.assertEqual(sum(v.update_count for k, v in entries),
+                             len(commits))
+
+    def test_generate_histogram(self):
+        h = generate_activity_histogram(get_sample_git_log())
+        charts = generate_histogram(h)
+        self.assertEqual(len(charts), len(h.level('week')))
+        self.assertEqual(charts.weeks(), [start for start, v in h.level('week')])
+        self.assertEqual(len(list(charts)), len(charts))
+        self.assertEqual(list(generate_histogram(
+            generate_activity_histogram(GitLog([])))), [])
+        self.assertEqual(len(generate_histogram(generate_activity_histogram(GitLog([])))), 0)
+        # The week starts in a month without commits
+        author = GitAuthor('alice@example.com', 'Alice')
+        log = GitLog([GitCommit('1', [], datetime(2024, 2, 2, 10), author,
+                                GitDiff([GitDiffEntry('a.txt', 1, 0)]))])
+        charts = generate_histogram(generate_activity_histogram(log))
+        self.assertEqual(charts.weeks(), [date(2024, 1, 28)])
+        self.assertEqual(len(list(charts)), len(charts))
+
+    def test_create_author_summaries(self):
+        log = get_sample_git_log()
+        summaries = create_author_summaries(log)
+        self.assertEqual([a for a, v in summaries], log.authors)
+        self.assertEqual(sum(v.update_count for a, v in summaries), len(log))
+        for a, v in summaries:
+            exp = DiffSummaryValue()
+            for c in log.by_author_name(a):
+                exp += c.diff
+            self.assertEqual((v.added, v.deleted), (exp.added, exp.deleted))
+
+    def test_create_hotspots(self):
+        log = get_sample_git_log()
+        vars = create_global_git_report(log, True)
+        self.assertLessEqual(len(vars['hotspots']['most_changed_files']), HOTSPOT_COUNT)
+        self.assertTrue('most_active_authors' in vars['hotspots'])
+        vars = create_global_git_report(log, False)
+        self.assertFalse('most_active_authors' in vars['hotspots'])
+
+    def test_create_global_git_report_lazy(self):
+        log = get_sample_git_log()
+        vars = create_global_git_report(log, True)
+        self.assertFalse(vars['histogram'].evaluated)
+        self.assertFalse(vars['yearly_histo'].evaluated)
+        self.assertFalse(vars['files_by_count'].evaluated)
+        self.assertEqual(len(vars['histogram']), len(generate_histogram(
+            generate_activity_histogram(log))))
+        self.assertTrue(vars['histogram'].evaluated)
+        self.assertFalse(vars['yearly_histo'].evaluated)
+        self.assertTrue(str(vars['files_by_count']).startswith('data:image/svg+xml'))
+        self.assertIsNone(create_global_git_report(log, False)['activity_csv'])
+
+    def test_generate_level_histogram(self):
+        h = HierarchicalHistogram(DiffSummaryValue.new, DiffSummaryValue.merge)
+        h.update_entry(date(1985, 10, 26), DiffSummaryValue(1, 2))
+        h.update_entry(date(1986, 1, 1), DiffSummaryValue(1, 2))
+        h.build()
+        title, _ = generate_level_histogram(h, 'quarter')
+        self.assertEqual(title, 'Quarterly activity from 1985-Q4 to 1986-Q1')
+        title, _ = generate_level_histogram(h, 'month')
+        self.assertEqual(title, 'Monthly activity from 1985-10 to 1986-01')
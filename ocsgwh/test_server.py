@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+import tempfile
+import http.client
+import json
+from pathlib import Path
+from threading import Thread
+from unittest.mock import MagicMock, patch
+from .server import *
+from datetime import datetime
+from .git.model import GitLog, GitCommit, GitAuthor, GitDiff, GitDiffEntry
+from .git.test_model import get_sample_git_log
+from .git import blame
+from .test_utils import ROOT_DIR
+
+
+class TestPageCache(unittest.TestCase):
+
+    def test_get(self):
+        c = PageCache(2)
+        create = MagicMock(side_effect=lambda: Page(b'a', 'text/plain'))
+        p1 = c.get('a', create)
+        self.assertEqual(p1.content, b'a')
+        self.assertIs(c.get('a', create), p1)
+        self.assertEqual(create.call_count, 1)
+
+        c.get('b', create)
+        c.get('a', create)
+        c.get('c', create)
+        self.assertEqual(len(c), 2)
+        self.assertEqual(create.call_count, 3)
+        # 'b' was the least recently used entry
+        c.get('b', create)
+        self.assertEqual(create.call_count, 4)
+
+
+class TestReportServer(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = Path(tempfile.gettempdir())
+        self.report = ReportServer(Options(tmp_dir, tmp_dir, 'test'), 0)
+        self.log = get_sample_git_log()
+        self.report.load(self.log)
+        self.server = self.report.create_http_server()
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def request(self, path: str, headers: dict = {}):
+        conn = http.client.HTTPConnection(
+            'localhost', self.server.server_address[1])
+        conn.request('GET', path, headers=headers)
+        resp = conn.getresponse()
+        body = resp.read()
+        conn.close()
+        return resp, body
+
+    def test_get_page(self):
+        self.assertIsNone(self.report.get_page('unknown.html'))
+        self.assertIsNone(self.report.get_page('../engine.py'))
+        self.assertIsNotNone(self.report.get_page('ocsgwh.css'))
+
+        index = self.report.get_page('')
+        self.assertIs(self.report.get_page('index.html'), index)
+        for a in self.log.authors:
+            self.assertTrue(a.author_key.encode('ascii') in index.content)
+            page = self.report.get_page(a.author_key + '.html')
+            self.assertTrue(a.name.encode('utf-8') in page.content)
+
+    def test_get_shard(self):
+        page = self.report.get_page('global_diff.html')
+        self.assertTrue(b'global_diff.files' in page.content)
+        shard = self.report.get_page('global_diff.files.0.js')
+        self.assertIs(shard, page.attachments['global_diff.files.0.js'])
+        self.assertTrue(shard.content.startswith(b'ocsgwhFileShard('))
+        self.assertIsNone(self.report.get_page('global_diff.files.1.js'))
+        self.assertIsNone(self.report.get_page('unknown.files.0.js'))
+        self.assertIsNone(self.report.get_page('index.files.0.js'))
+
+    def test_get_collaboration(self):
+        page = self.report.get_page('collaboration.json')
+        self.assertEqual(page.content_type, 'application/json; charset=utf-8')
+        self.assertEqual(len(json.loads(page.content)['nodes']), len(self.log.authors))
+        page = self.report.get_page('collaboration.graphml')
+        self.assertEqual(page.content_type, 'application/xml')
+
+    def test_file_types(self):
+        alice = GitAuthor('alice@example.com', 'Alice')
+        bob = GitAuthor('bob@example.com', 'Bob')
+        log = GitLog([
+            GitCommit('1', [], datetime(2021, 1, 4), alice, GitDiff([
+                GitDiffEntry('src/a.h', 1, 0)])),
+            GitCommit('2', ['1'], datetime(2021, 1, 5), bob, GitDiff([
+                GitDiffEntry('src/b.cpp', 1, 0)]))])
+        classifier = self.report.get_file_type_classifier(log)
+        self.assertIs(self.report.get_file_type_classifier(log), classifier)
+        # The header is classified by the files of the whole log
+        self.assertEqual(classifier('src/a.h'), classifier('src/b.cpp'))
+        author = log.authors[0]
+        self.assertEqual(list(self.report.file_types_fingerprint(log, log.by_author_name(author))),
+                         ['src/a.h ' + classifier('src/b.cpp')])
+
+    @unittest.skipUnless((ROOT_DIR / '.git').is_dir(), 'The root of the project is not a git repository.')
+    def test_surviving_lines(self):
+        tmp_dir = Path(tempfile.gettempdir())
+        report = ReportServer(Options(ROOT_DIR, tmp_dir, 'test', blame_workers=1,
+                                      paths=['README.md']), 0)
+        # Only the files in the scope of the report are blamed
+        with patch.object(blame, 'run_git_blame', wraps=blame.run_git_blame) as run:
+            surviving = report.get_surviving_lines(self.log)
+            self.assertEqual(run.call_count, 1)
+        self.assertGreater(surviving.total, 0)
+        # The cache is kept in memory and reused by the next logs
+        with patch.object(blame, 'run_git_blame') as run:
+            self.assertIsNot(report.get_surviving_lines(get_sample_git_log()), surviving)
+            run.assert_not_called()
+
+    def test_http(self):
+        resp, body = self.request('/global_diff.html')
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp.getheader('Content-Type'),
+                         'text/html; charset=utf-8')
+        etag = resp.getheader('ETag')
+        self.assertTrue(etag)
+
+        resp, body = self.request('/global_diff.html', {'If-None-Match': etag})
+        self.assertEqual(resp.status, 304)
+        self.assertFalse(body)
+
+        resp, body = self.request('/missing.html')
+        self.assertEqual(resp.status, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
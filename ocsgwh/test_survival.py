@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+from .survival import *
+from .git.model import GitAuthor
+from .test_ownership import ALICE, BOB, get_sample_log
+
+
+class TestSurvivingLines(unittest.TestCase):
+
+    def setUp(self):
+        self.log = get_sample_log()
+        self.names = {a.name: a for a in self.log.authors}
+        self.s = SurvivingLines(self.log, {
+            'src/a.c': {ALICE: 30, BOB: 10},
+            'src/b.c': {BOB: 20, GitAuthor('BOB@email.com', 'Robert'): 5},
+            'README.md': {GitAuthor('dave@email.com', 'Dave'): 15}})
+
+    def test_totals(self):
+        s = self.s
+        self.assertTrue(s)
+        self.assertEqual(s.total, 80)
+        self.assertEqual(s.others, 15)
+        self.assertEqual(s.lines(self.names['Alice']), 30)
+        self.assertEqual(s.lines(self.names['Bob']), 35)
+        self.assertEqual(s.lines(self.names['Carol']), 0)
+        self.assertAlmostEqual(s.share(self.names['Alice']), 30 / 80)
+        self.assertEqual(s.authors(), [(self.names['Bob'], 35), (self.names['Alice'], 30)])
+        self.assertFalse(SurvivingLines(self.log, {}))
+
+    def test_author_name(self):
+        self.assertIs(self.s.author_name(ALICE), self.names['Alice'])
+        self.assertIs(self.s.author_name(GitAuthor('alice@other.com', 'Alice')), self.names['Alice'])
+        self.assertIsNone(self.s.author_name(GitAuthor('x@email.com', 'X')))
+
+    def test_top_files(self):
+        bob = self.names['Bob']
+        self.assertEqual(self.s.top_files(bob, 1), [('src/b.c', 25)])
+        self.assertEqual(self.s.top_files(bob, 5), [('src/b.c', 25), ('src/a.c', 10)])
+        self.assertEqual(self.s.top_files(self.names['Carol'], 5), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
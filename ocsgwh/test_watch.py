@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import unittest
+import tempfile
+import subprocess
+from .watch import *
+from .branches import BranchReport
+
+
+class TestWatchEngine(unittest.TestCase):
+
+    def git(self, *args):
+        subprocess.run(['git', '-c', 'user.name=Alan Turing', '-c', 'user.email=aturing@email.com',
+                        *args], cwd=self.repo_dir, check=True, capture_output=True)
+
+    def commit(self, file_name: str, content: str):
+        (self.repo_dir / file_name).write_text(content)
+        self.git('add', file_name)
+        self.git('commit', '-m', file_name)
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.repo_dir = Path(self.tmp_dir.name) / 'repo'
+        self.repo_dir.mkdir()
+        self.output_dir = Path(self.tmp_dir.name) / 'output'
+        self.git('init', '-q')
+        self.commit('a.txt', 'a\n')
+        self.engine = WatchEngine(
+            Options(self.repo_dir, self.output_dir, 'test'), 0)
+        self.engine.options.check_options()
+        self.engine.prepare_output_dir()
+        self.engine.refs = self.engine.get_refs()
+        self.engine.log = self.engine.parse_git_log()
+        self.engine.generate_report(self.engine.log)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_refs_watcher(self):
+        w = RefsWatcher(self.repo_dir)
+        self.assertFalse(w.poll())
+        self.git('branch', 'other')
+        self.assertTrue(w.poll())
+        self.assertFalse(w.poll())
+
+    def test_refs_watcher_worktree(self):
+        worktree = Path(self.tmp_dir.name) / 'worktree'
+        self.git('worktree', 'add', '-q', '-b', 'work', str(worktree))
+        w = RefsWatcher(worktree)
+        self.assertEqual(w.common_dir.resolve(), (self.repo_dir / '.git').resolve())
+        self.assertNotEqual(w.git_dir.resolve(), w.common_dir.resolve())
+        self.assertFalse(w.poll())
+        # Branches created from the main worktree are seen
+        self.git('branch', 'other')
+        self.assertTrue(w.poll())
+        self.assertFalse(w.poll())
+        self.git('pack-refs', '--all')
+        self.assertTrue(w.poll())
+
+    def test_update(self):
+        self.assertEqual(len(self.engine.log), 1)
+        self.engine.update()
+        self.assertEqual(len(self.engine.log), 1)
+
+        self.commit('b.txt', 'b\n')
+        self.commit('c.txt', 'c\n')
+        self.engine.update()
+        self.assertEqual(len(self.engine.log), 3)
+        self.assertFalse(self.engine.is_rewritten(self.engine.get_refs()))
+
+    def test_update_rewritten(self):
+        self.commit('b.txt', 'b\n')
+        self.engine.update()
+        self.assertEqual(len(self.engine.log), 2)
+
+        self.git('reset', '--hard', 'HEAD~1')
+        self.commit('c.txt', 'c\n')
+        self.assertTrue(self.engine.is_rewritten(self.engine.get_refs()))
+        self.engine.update()
+        self.assertEqual(len(self.engine.log), 2)
+        self.assertEqual(set(d.file_name for c in self.engine.log for d in c.diff),
+                         set(['a.txt', 'c.txt']))
+
+    def test_update_dedup(self):
+        self.engine.options.dedup = True
+        self.git('checkout', '-q', '-b', 'feature')
+        self.commit('b.txt', 'b\n')
+        self.git('checkout', '-q', '-')
+        self.commit('c.txt', 'c\n')
+        self.git('cherry-pick', 'feature')
+        self.engine.update()
+        self.assertEqual(len(self.engine.log), 3)
+        self.assertEqual(len(self.engine.raw_log), 4)
+        # The tip of one of the branches was removed
+        self.assertEqual(len(self.engine.replaced_commits), 1)
+        refs = self.engine.get_branch_refs()
+        self.assertEqual(len(refs), 2)
+        # Both branches now point to the kept copy
+        report = BranchReport(self.engine.log, refs)
+        self.assertEqual(len(report), 1)
+        self.assertEqual(len(next(iter(report)).names), 2)
+
+        self.commit('d.txt', 'd\n')
+        self.engine.update()
+        self.assertEqual(len(self.engine.log), 4)
+        # The parent of the new commit may be the removed copy
+        ids = set(c.id for c in self.engine.log)
+        for c in self.engine.log:
+            self.assertTrue(ids.issuperset(c.parents))
+
+    def test_update_scope(self):
+        self.engine.options.paths = ['b.txt']
+        self.commit('b.txt', 'b\n')
+        self.commit('c.txt', 'c\n')
+        self.engine.update()
+        self.assertEqual(len(self.engine.log), 2)
+        self.assertEqual(set(d.file_name for c in self.engine.log for d in c.diff),
+                         set(['a.txt', 'b.txt']))
+
+        self.engine.options.refs = ['HEAD~1']
+        self.commit('d.txt', 'd\n')
+        self.engine.update()
+        self.assertEqual([c.diff[0].file_name for c in self.engine.log], ['b.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# OpenCS Git Work History - A simple Git Report Generator
+# Copyright(C) 2021 Open Communications Security
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY
+# without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see < https: // www.gnu.org/licenses/>.
+import os
+import time
+from pathlib import Path
+from .engine import Engine, Options, EngineError
+from .git.parser import GitLogParser, GitExecutionError, run_git_is_ancestor, run_git_dirs
+from .git.model import GitLog
+
+from logging import getLogger
+LOGGER = getLogger(__name__)
+
+
+class RefsWatcher:
+    """
+    This class detects changes in the references of a repository by checking
+    the modification times of the files that store them. It is much cheaper
+    than calling git on each poll.
+
+    The directories are resolved by git, thus linked worktrees and
+    repositories with a custom git directory are supported. ``HEAD`` is
+    checked in the git directory of the worktree and the references in the
+    common directory.
+    """
+
+    def __init__(self, repo_dir: Path) -> None:
+        self.git_dir, self.common_dir = run_git_dirs(repo_dir)
+        self._signature = self.signature()
+
+    def signature(self) -> tuple:
+        """
+        Returns the signature of the current state of the references. It is
+        composed by the modification times of ``HEAD``, ``packed-refs`` and
+        all files and directories inside ``refs``.
+        """
+        ret = []
+        for name, dir in (('HEAD', self.git_dir), ('packed-refs', self.common_dir)):
+            try:
+                ret.append((name, os.stat(dir / name).st_mtime_ns))
+            except FileNotFoundError:
+                pass
+        for root, dirs, files in os.walk(self.common_dir / 'refs'):
+            for name in dirs + files:
+                path = os.path.join(root, name)
+                try:
+                    ret.append((path, os.stat(path).st_mtime_ns))
+                except FileNotFoundError:
+                    pass
+        ret.sort()
+        return tuple(ret)
+
+    def poll(self) -> bool:
+        """
+        Returns True if the references changed since the last call.
+        """
+        s = self.signature()
+        if s != self._signature:
+            self._signature = s
+            return True
+        else:
+            return False
+
+
+class WatchEngine(Engine):
+    """
+    This engine keeps the parsed log in memory and updates the report
+    whenever the references of the repository change. New commits are
+    ingested incrementally unless a reference was rewritten or removed,
+    in which case the whole log is loaded again.
+
+    This engine always runs in incremental mode, thus only the pages
+    affected by the new commits are regenerated.
+    """
+
+    def __init__(self, options: Options, interval: float = 60) -> None:
+        options.incremental = True
+        super().__init__(options)
+        self.interval = interval
+        self.log = None
+        # The log before the deduplication. New commits are added to it, as
+        # their parents may be commits removed from the deduplicated log.
+        self.raw_log = None
+        self.refs = None
+
+    def run_core(self):
+        try:
+            watcher = RefsWatcher(self.options.repo_dir)
+        except GitExecutionError as err:
+            raise EngineError(str(err))
+        self.refs = self.get_refs()
+        self.raw_log = self.parse_git_log()
+        self.log = self.deduplicate(self.raw_log)
+        self.save_git_log(self.log)
+        self.generate_report(self.log)
+        try:
+            while True:
+                time.sleep(self.interval)
+                if watcher.poll():
+                    self.update()
+        except KeyboardInterrupt:
+            LOGGER.info('Watch mode interrupted.')
+
+    def is_rewritten(self, refs: dict) -> bool:
+        """
+        Verifies if any of the known references was removed or moved to a
+        commit that does not descend from its previous value.
+        """
+        for name, old in self.refs.items():
+            new = refs.get(name, None)
+            if new is None:
+                return True
+            if new != old and not run_git_is_ancestor(self.options.repo_dir, old, new):
+                return True
+        return False
+
+    def get_new_commits(self, refs: dict) -> list:
+        """
+        Returns the commits reachable from the new references that are not
+        reachable from the previous ones.
+        """
+        tips = sorted(set(refs.values()) - set(self.refs.values()))
+        if not tips:
+            return []
+        parser = GitLogParser(self.create_commit_parser())
+        revisions = self.git_log_arguments(
+            tips + ['--not'] + sorted(set(self.refs.values())))
+        if parser.run_git(self.options.repo_dir, revisions):
+            return parser.result
+        else:
+            return []
+
+    def update(self):
+        """
+        Updates the log with the current state of the repository and
+        regenerates the affected pages.
+        """
+        try:
+            refs = self.get_refs()
+            if refs == self.refs:
+                return
+            raw_log = self.raw_log if self.raw_log is not None else self.log
+            if self.options.refs:
+                # The selected revisions may not be plain references.
+                raw_log = self.parse_git_log()
+            elif self.is_rewritten(refs):
+                LOGGER.info('References were rewritten, reloading the log.')
+                raw_log = self.parse_git_log()
+            else:
+                # Commits created while the log was being loaded may be
+                # reported twice.
+                known = set(c.id for c in raw_log)
+                commits = [c for c in self.get_new_commits(refs)
+                           if c.id not in known]
+                LOGGER.info(f'{len(commits)} new commits found.')
+                raw_log = GitLog(list(raw_log) + commits)
+            old_logs = (self.log, self.raw_log)
+            self.log = self.deduplicate(raw_log)
+            self.raw_log = raw_log
+            for old in old_logs:
+                if old is not None and old is not self.log and old is not self.raw_log:
+                    old.close()
+            self.refs = refs
+        except (GitExecutionError, EngineError) as err:
+            # The repository may be in the middle of an update.
+            LOGGER.warning(f'Unable to update the log: {err}')
+            return
+        self.save_git_log(self.log)
+        self.generate_report(self.log)